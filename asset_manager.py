@@ -1,6 +1,16 @@
 import pygame
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
+from neon_effects import NeonEffects
+
+class AssetRequest(NamedTuple):
+    """An asset a scene needs: kind is 'image', 'sound', 'font' or 'music'."""
+    kind: str
+    name: str
+    filepath: Optional[str]         # relative to assets/; None for pygame's default font
+    scale: Optional[tuple] = None   # images
+    volume: float = 1.0             # sounds
+    size: int = 24                  # fonts
 
 class AssetManager:
     """Manages loading and accessing of game assets"""
@@ -24,6 +34,17 @@ class AssetManager:
             'black': (0, 0, 0)
         }
         
+        # Cached outline/glow surfaces shared by text and sprites
+        self.effects = NeonEffects()
+        
+        # Track currently streaming, so replaying it does not reload from disk
+        self._music_path = None
+        
+        # Resource scopes: assets loaded for a scope are released with it, unless
+        # another scope still holds them. Unscoped assets live for the whole game.
+        self._scopes: Dict[str, Set[str]] = {}
+        self._scope_refs: Dict[str, int] = {}
+        
         self._load_default_assets()
     
     def _load_default_assets(self):
@@ -85,8 +106,10 @@ class AssetManager:
                          [(32, 0), (0, 32)], 1)
         self.assets['tile_wall'] = wall_surface
     
-    def load_image(self, name: str, filepath: str, scale: tuple = None) -> bool:
+    def load_image(self, name: str, filepath: str, scale: tuple = None, scope: Optional[str] = None) -> bool:
         """Load an image asset"""
+        if scope is not None and self._claim(name, scope):
+            return True
         try:
             full_path = os.path.join(self.assets_path, filepath)
             image = pygame.image.load(full_path).convert_alpha()
@@ -94,45 +117,168 @@ class AssetManager:
             if scale:
                 image = pygame.transform.scale(image, scale)
             
-            self.assets[name] = image
+            self._store(name, image, scope)
             return True
         except (pygame.error, FileNotFoundError) as e:
             print(f"Failed to load image {filepath}: {e}")
             return False
     
-    def load_sound(self, name: str, filepath: str, volume: float = 1.0) -> bool:
+    def load_sound(self, name: str, filepath: str, volume: float = 1.0, scope: Optional[str] = None) -> bool:
         """Load a sound asset"""
+        if scope is not None and self._claim(name, scope):
+            return True
         try:
             full_path = os.path.join(self.assets_path, filepath)
             sound = pygame.mixer.Sound(full_path)
             sound.set_volume(volume)
-            self.assets[name] = sound
+            self._store(name, sound, scope)
             return True
         except (pygame.error, FileNotFoundError) as e:
             print(f"Failed to load sound {filepath}: {e}")
             return False
     
-    def load_music(self, name: str, filepath: str) -> bool:
+    def load_music(self, name: str, filepath: str, scope: Optional[str] = None) -> bool:
         """Load background music"""
+        if scope is not None and self._claim(name, scope):
+            return True
         try:
             full_path = os.path.join(self.assets_path, filepath)
-            self.assets[name] = full_path  # Store path for pygame.mixer.music
+            self._store(name, full_path, scope)  # Store path for pygame.mixer.music
             return True
         except Exception as e:
             print(f"Failed to load music {filepath}: {e}")
             return False
     
-    def load_font(self, name: str, filepath: str, size: int) -> bool:
-        """Load a custom font"""
+    def load_font(self, name: str, filepath: Optional[str], size: int, scope: Optional[str] = None) -> bool:
+        """Load a custom font (filepath None for pygame's default font)"""
+        if scope is not None and self._claim(name, scope):
+            return True
         try:
-            full_path = os.path.join(self.assets_path, filepath)
+            full_path = os.path.join(self.assets_path, filepath) if filepath else None
             font = pygame.font.Font(full_path, size)
-            self.assets[name] = font
+            self._store(name, font, scope)
             return True
         except (pygame.error, FileNotFoundError) as e:
             print(f"Failed to load font {filepath}: {e}")
             return False
     
+    # Resource scopes
+    
+    def _claim(self, name: str, scope: Optional[str]) -> bool:
+        """Add a scope's hold on an already loaded asset; False if it still has to be loaded"""
+        if name not in self.assets:
+            return False
+        if scope is not None:
+            held = self._scopes.setdefault(scope, set())
+            if name not in held and name in self._scope_refs:
+                held.add(name)
+                self._scope_refs[name] += 1
+        return True
+    
+    def _store(self, name: str, asset: Any, scope: Optional[str]):
+        self.assets[name] = asset
+        if scope is not None:
+            self._scopes.setdefault(scope, set()).add(name)
+            self._scope_refs[name] = self._scope_refs.get(name, 0) + 1
+    
+    def add_asset(self, name: str, asset: Any, scope: Optional[str] = None):
+        """Register an asset built in code (e.g. a pre-rendered surface)"""
+        if scope is not None and self._claim(name, scope):
+            return
+        self._store(name, asset, scope)
+    
+    def decode_assets(self, requests: List[AssetRequest]) -> List[Tuple[AssetRequest, Any]]:
+        """Read and decode assets from disk without touching the display.
+        
+        Safe to call from a worker thread; install_assets() finishes the job
+        on the main thread. Already loaded assets are skipped.
+        """
+        decoded = []
+        for request in requests:
+            if request.name in self.assets:
+                decoded.append((request, None))
+                continue
+            full_path = os.path.join(self.assets_path, request.filepath) if request.filepath else None
+            try:
+                if request.kind == 'image':
+                    data = pygame.image.load(full_path)
+                elif request.kind == 'sound':
+                    data = pygame.mixer.Sound(full_path) if pygame.mixer.get_init() else None
+                else:
+                    # Fonts are opened on the main thread; music is streamed when played
+                    data = full_path
+                decoded.append((request, data))
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Failed to load {request.kind} {request.filepath}: {e}")
+        return decoded
+    
+    def install_assets(self, decoded: List[Tuple[AssetRequest, Any]], scope: Optional[str] = None) -> int:
+        """Finish decoded assets on the main thread and register them; returns how many are held"""
+        installed = 0
+        for request, data in decoded:
+            if self._claim(request.name, scope):
+                installed += 1
+                continue
+            if data is None and request.kind in ('image', 'sound'):
+                # Was loaded when decoding started but released since
+                redone = self.decode_assets([request])
+                if not redone:
+                    continue
+                data = redone[0][1]
+            try:
+                if request.kind == 'image':
+                    data = data.convert_alpha()
+                    if request.scale:
+                        data = pygame.transform.scale(data, request.scale)
+                elif request.kind == 'sound':
+                    if data is None:  # no mixer
+                        continue
+                    data.set_volume(request.volume)
+                elif request.kind == 'font':
+                    data = pygame.font.Font(data, request.size)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Failed to load {request.kind} {request.filepath}: {e}")
+                continue
+            self._store(request.name, data, scope)
+            installed += 1
+        return installed
+    
+    def load_scope(self, scope: str, requests: List[AssetRequest]) -> int:
+        """Load a scope's assets synchronously"""
+        return self.install_assets(self.decode_assets(requests), scope)
+    
+    def release_scope(self, scope: str) -> int:
+        """Drop a scope's hold on its assets and free those no other scope holds; returns how many were freed"""
+        freed = 0
+        for name in self._scopes.pop(scope, ()):
+            refs = self._scope_refs.get(name, 0) - 1
+            if refs > 0:
+                self._scope_refs[name] = refs
+                continue
+            self._scope_refs.pop(name, None)
+            asset = self.assets.pop(name, None)
+            if asset is not None and asset == self._music_path:
+                self.stop_music()
+            freed += 1
+        return freed
+    
+    def scope_names(self) -> List[str]:
+        return list(self._scopes)
+    
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held by surfaces and sounds, for watching memory across scenes"""
+        surfaces = 0
+        sounds = 0
+        mixer = pygame.mixer.get_init()
+        for asset in self.assets.values():
+            if isinstance(asset, pygame.Surface):
+                surfaces += asset.get_bytesize() * asset.get_width() * asset.get_height()
+            elif mixer and isinstance(asset, pygame.mixer.Sound):
+                frequency, size, channels = mixer
+                sounds += int(asset.get_length() * frequency) * (abs(size) // 8) * channels
+        return {"assets": len(self.assets), "surface_bytes": surfaces, "sound_bytes": sounds,
+                "scoped": len(self._scope_refs)}
+    
     def get_asset(self, name: str) -> Any:
         """Get an asset by name"""
         return self.assets.get(name)
@@ -159,56 +305,44 @@ class AssetManager:
         return None
     
     def play_music(self, name: str, loops: int = -1, volume: float = 0.7):
-        """Play background music"""
+        """Play background music (a track that is already playing is not reloaded)"""
         music_path = self.assets.get(name)
+        if music_path and music_path == self._music_path and pygame.mixer.music.get_busy():
+            pygame.mixer.music.set_volume(volume)
+            return
         if music_path and os.path.exists(music_path):
             try:
                 pygame.mixer.music.load(music_path)
                 pygame.mixer.music.set_volume(volume)
                 pygame.mixer.music.play(loops)
+                self._music_path = music_path
             except pygame.error as e:
                 print(f"Failed to play music {name}: {e}")
     
     def stop_music(self):
         """Stop background music"""
         pygame.mixer.music.stop()
+        self._music_path = None
     
     def get_color(self, color_name: str) -> tuple:
         """Get a neon color by name"""
         return self.NEON_COLORS.get(color_name, self.NEON_COLORS['white'])
     
     def create_text_surface(self, text: str, font_name: str, color_name: str, 
-                           outline_color: str = None, outline_width: int = 1) -> pygame.Surface:
-        """Create a text surface with optional neon outline effect"""
+                           outline_color: str = None, outline_width: int = 1,
+                           glow_color: str = None, glow_radius: int = 0) -> pygame.Surface:
+        """Create a text surface with optional neon outline and glow effects (cached)"""
         font = self.get_font(font_name)
         if not font:
             font = self.assets['font_medium']
         
-        color = self.get_color(color_name)
-        text_surface = font.render(text, True, color)
-        
-        if outline_color:
-            outline_col = self.get_color(outline_color)
-            # Create outline effect
-            outline_surface = pygame.Surface(
-                (text_surface.get_width() + outline_width * 2,
-                 text_surface.get_height() + outline_width * 2),
-                pygame.SRCALPHA
-            )
-            
-            # Draw outline in multiple directions
-            for dx in range(-outline_width, outline_width + 1):
-                for dy in range(-outline_width, outline_width + 1):
-                    if dx != 0 or dy != 0:
-                        outline_text = font.render(text, True, outline_col)
-                        outline_surface.blit(outline_text, 
-                                           (dx + outline_width, dy + outline_width))
-            
-            # Draw main text on top
-            outline_surface.blit(text_surface, (outline_width, outline_width))
-            return outline_surface
-        
-        return text_surface
+        return self.effects.text(
+            font, text, self.get_color(color_name),
+            outline_color=self.get_color(outline_color) if outline_color else None,
+            outline_width=outline_width,
+            glow_color=self.get_color(glow_color) if glow_color else None,
+            glow_radius=glow_radius
+        )
     
     def list_assets(self) -> list:
         """List all loaded assets"""
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Audio mixer manager: preloaded sound banks played through a fixed channel
+pool, with per-category voice limits, priority stealing and same-frame
+throttling, plus background music that is only reloaded when it changes.
+
+Runs under SDL's dummy audio driver, so it can be exercised headless:
+
+    SDL_AUDIODRIVER=dummy python audio_manager.py            # simulated big fight
+    SDL_AUDIODRIVER=dummy python audio_manager.py --frames 600 --triggers 40
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pygame
+
+# Simultaneous voices allowed per category; anything unlisted uses the "sfx" limit
+DEFAULT_CATEGORY_LIMITS: Dict[str, int] = {
+    "combat": 8,
+    "impact": 6,
+    "ui": 2,
+    "voice": 2,
+    "ambient": 3,
+    "sfx": 4,
+}
+
+class SoundSpec(NamedTuple):
+    """How a bank entry is loaded and played."""
+    path: str                 # relative to assets/sounds; "" for a generated placeholder
+    category: str = "sfx"
+    priority: int = 0         # higher steals from lower when a limit is reached
+    volume: float = 1.0
+
+# Placeholder tones (frequency Hz, duration s, decay) for the demo's combat sounds,
+# used when no sound files are shipped
+_PLACEHOLDER_TONES = {
+    "attack_short": (660.0, 0.12, 18.0),
+    "attack_long": (440.0, 0.25, 9.0),
+    "attack_special": (880.0, 0.35, 6.0),
+    "attack_super": (220.0, 0.6, 3.0),
+    "hurt": (160.0, 0.2, 12.0),
+    "enemy_hit": (330.0, 0.08, 25.0),
+    "ui_select": (1320.0, 0.05, 30.0),
+    "wave_spawn": (110.0, 0.8, 2.5),
+}
+
+DEFAULT_BANK: Dict[str, SoundSpec] = {
+    "attack_short": SoundSpec("", "combat", 1, 0.6),
+    "attack_long": SoundSpec("", "combat", 2, 0.6),
+    "attack_special": SoundSpec("", "combat", 3, 0.7),
+    "attack_super": SoundSpec("", "combat", 5, 0.8),
+    "hurt": SoundSpec("", "voice", 4, 0.7),
+    "enemy_hit": SoundSpec("", "impact", 0, 0.4),
+    "ui_select": SoundSpec("", "ui", 1, 0.5),
+    "wave_spawn": SoundSpec("", "ambient", 2, 0.6),
+}
+
+class _Voice:
+    """A sound playing on one pool channel."""
+
+    __slots__ = ("channel", "sound", "name", "category", "priority", "started")
+
+    def __init__(self, channel: pygame.mixer.Channel):
+        self.channel = channel
+        self.sound = None
+        self.name = ""
+        self.category = ""
+        self.priority = 0
+        self.started = 0
+
+class AudioManager:
+    """Sound banks, a fixed channel pool and music for the game.
+
+    Sounds are decoded once when their bank loads; play() only picks a
+    channel. The pool is reserved from pygame's own channel allocation and
+    never grows, each category has a voice limit, and when a category or
+    the pool is full the lowest-priority, oldest voice is stolen if the new
+    sound matters at least as much (otherwise the new sound is dropped).
+    The same sound triggered twice in one frame plays once.
+
+    Usage:
+        audio = AudioManager()
+        if audio.init():
+            audio.load_bank("combat", DEFAULT_BANK)
+        audio.play("attack_short")      # any number of times per frame
+        audio.update()                  # once per frame
+    """
+
+    def __init__(self, channels: int = 16, category_limits: Optional[Dict[str, int]] = None):
+        self.channel_count = channels
+        self.category_limits = dict(DEFAULT_CATEGORY_LIMITS if category_limits is None else category_limits)
+        self.sounds_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "sounds")
+        self.enabled = False
+
+        self.banks: Dict[str, List[str]] = {}            # bank -> sound names
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._specs: Dict[str, SoundSpec] = {}
+        self._voices: List[_Voice] = []
+        self._free: List[_Voice] = []
+        self._active: Dict[str, List[_Voice]] = {}
+        self._played_this_frame = set()
+        self._frame = 0
+        self.master_volume = 1.0
+        self.category_volumes: Dict[str, float] = {}
+        self._music_path: Optional[str] = None
+
+        self.played = 0
+        self.throttled = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.missing = 0
+
+    def init(self, frequency: int = 44100, size: int = -16, channels: int = 2, buffer: int = 512) -> bool:
+        """Open the mixer (if nobody has) and set up the channel pool. False if audio is unavailable."""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency, size, channels, buffer)
+        except pygame.error as e:
+            print(f"Audio disabled: {e}")
+            return False
+        # Two spare channels stay available for code that plays Sounds directly
+        pygame.mixer.set_num_channels(self.channel_count + 2)
+        pygame.mixer.set_reserved(self.channel_count)
+        self._voices = [_Voice(pygame.mixer.Channel(i)) for i in range(self.channel_count)]
+        self._free = list(reversed(self._voices))
+        self._active = {}
+        self.enabled = True
+        return True
+
+    # Banks
+
+    def load_bank(self, bank: str, specs: Dict[str, SoundSpec]) -> bool:
+        """Decode every sound of a bank now, so playing them never touches the disk."""
+        if not self.enabled:
+            return False
+        ok = True
+        loaded = []
+        for name, spec in specs.items():
+            sound = self._load(name, spec)
+            if sound is None:
+                ok = False
+                continue
+            self._sounds[name] = sound
+            self._specs[name] = spec
+            loaded.append(name)
+        names = self.banks.setdefault(bank, [])
+        names.extend(name for name in loaded if name not in names)
+        return ok
+
+    def load_bank_manifest(self, path: str) -> bool:
+        """Load banks from JSON: {"bank": {"sound": {"path": ..., "category": ..., "priority": ..., "volume": ...}}}."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            banks = {bank: {name: SoundSpec(**entry) for name, entry in sounds.items()}
+                     for bank, sounds in data.items()}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Failed to load sound banks from {path}: {e}")
+            return False
+        ok = True
+        for bank, specs in banks.items():
+            ok = self.load_bank(bank, specs) and ok
+        return ok
+
+    def unload_bank(self, bank: str):
+        """Release a bank's sounds, stopping any still playing."""
+        names = self.banks.pop(bank, [])
+        for voice in self._voices:
+            if voice.name in names:
+                voice.channel.stop()
+        self._reap()
+        for name in names:
+            self._sounds.pop(name, None)
+            self._specs.pop(name, None)
+
+    def _load(self, name: str, spec: SoundSpec) -> Optional[pygame.mixer.Sound]:
+        try:
+            if spec.path:
+                sound = pygame.mixer.Sound(os.path.join(self.sounds_path, spec.path))
+            else:
+                sound = self._placeholder(name)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Failed to load sound {spec.path}: {e}")
+            sound = self._placeholder(name)
+        if sound is not None:
+            sound.set_volume(spec.volume)
+        return sound
+
+    def _placeholder(self, name: str) -> Optional[pygame.mixer.Sound]:
+        """A short decaying tone so the game has audible feedback without sound files."""
+        frequency, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            return None
+        tone, duration, decay = _PLACEHOLDER_TONES.get(name, (520.0, 0.1, 20.0))
+        t = np.arange(int(frequency * duration)) / frequency
+        wave = np.sin(2 * math.pi * tone * t) * np.exp(-decay * t) * 12000
+        samples = np.repeat(wave.astype(np.int16)[:, None], channels, axis=1)
+        return pygame.mixer.Sound(buffer=samples.tobytes())
+
+    # Playback
+
+    def play(self, name: str, volume: float = 1.0, pan: float = 0.0) -> Optional[pygame.mixer.Channel]:
+        """Play a loaded sound; returns its channel, or None if it was throttled, limited or unknown.
+
+        pan is -1 (left) to 1 (right).
+        """
+        if not self.enabled:
+            return None
+        sound = self._sounds.get(name)
+        if sound is None:
+            self.missing += 1
+            return None
+        if name in self._played_this_frame:
+            self.throttled += 1
+            return None
+        spec = self._specs[name]
+        category = spec.category
+        active = self._active.setdefault(category, [])
+        limit = self.category_limits.get(category, self.category_limits.get("sfx", 4))
+
+        voice = None
+        if len(active) >= limit:
+            self._reap()
+        if len(active) >= limit:
+            voice = self._steal(active, spec.priority)
+            if voice is None:
+                self.dropped += 1
+                return None
+        elif not self._free:
+            self._reap()
+            if not self._free:
+                voice = self._steal(self._voices, spec.priority)
+                if voice is None:
+                    self.dropped += 1
+                    return None
+        if voice is None:
+            voice = self._free.pop()
+
+        voice.sound = sound
+        voice.name = name
+        voice.category = category
+        voice.priority = spec.priority
+        voice.started = self.played
+        active.append(voice)
+        channel = voice.channel
+        channel.play(sound)
+        gain = volume * self.master_volume * self.category_volumes.get(category, 1.0)
+        if pan:
+            pan = max(-1.0, min(1.0, pan))
+            channel.set_volume(gain * min(1.0, 1.0 - pan), gain * min(1.0, 1.0 + pan))
+        else:
+            channel.set_volume(gain)
+        self._played_this_frame.add(name)
+        self.played += 1
+        return channel
+
+    def _steal(self, voices: List[_Voice], priority: int) -> Optional[_Voice]:
+        """Stop and detach the least important, oldest voice if it matters no more than `priority`."""
+        victim = None
+        for voice in voices:
+            if voice.sound is not None and (victim is None or (voice.priority, voice.started)
+                                            < (victim.priority, victim.started)):
+                victim = voice
+        if victim is None or victim.priority > priority:
+            return None
+        victim.channel.stop()
+        self._active[victim.category].remove(victim)
+        victim.sound = None
+        self.stolen += 1
+        return victim
+
+    def _reap(self):
+        """Return voices whose sound has finished to the free list."""
+        for active in self._active.values():
+            if not active:
+                continue
+            still = []
+            for voice in active:
+                if voice.channel.get_sound() is voice.sound and voice.channel.get_busy():
+                    still.append(voice)
+                else:
+                    voice.sound = None
+                    self._free.append(voice)
+            if len(still) != len(active):
+                active[:] = still
+
+    def update(self):
+        """Once per frame: end the throttling window and reclaim finished channels."""
+        self._frame += 1
+        self._played_this_frame.clear()
+        self._reap()
+
+    def stop_all(self):
+        for voice in self._voices:
+            voice.channel.stop()
+        self._reap()
+
+    def set_category_volume(self, category: str, volume: float):
+        """Scale sounds of a category from their next play."""
+        self.category_volumes[category] = max(0.0, min(1.0, volume))
+
+    # Music
+
+    def play_music(self, path: str, loops: int = -1, volume: float = 0.7, fade_ms: int = 0) -> bool:
+        """Stream a music file; the same track already playing is left alone (only its volume changes)."""
+        if not self.enabled:
+            return False
+        if path == self._music_path and pygame.mixer.music.get_busy():
+            pygame.mixer.music.set_volume(volume)
+            return True
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(loops, fade_ms=fade_ms)
+        except pygame.error as e:
+            print(f"Failed to play music {path}: {e}")
+            self._music_path = None
+            return False
+        self._music_path = path
+        return True
+
+    def stop_music(self, fade_ms: int = 0):
+        if not self.enabled:
+            return
+        if fade_ms:
+            pygame.mixer.music.fadeout(fade_ms)
+        else:
+            pygame.mixer.music.stop()
+        self._music_path = None
+
+    # Reporting
+
+    def active_voices(self) -> Dict[str, int]:
+        return {category: len(active) for category, active in self._active.items() if active}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "played": self.played,
+            "throttled": self.throttled,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+            "missing": self.missing,
+            "busy_channels": sum(1 for voice in self._voices if voice.sound is not None),
+        }
+
+def simulate_fight(frames: int = 300, triggers: int = 30, seed: int = 1) -> Dict:
+    """Trigger `triggers` random combat sounds per frame for `frames` frames and report the mixer's work."""
+    import random
+    audio = AudioManager()
+    if not audio.init():
+        return {}
+    audio.load_bank("combat", DEFAULT_BANK)
+    rng = random.Random(seed)
+    names = list(DEFAULT_BANK)
+    weights = [8, 4, 2, 1, 2, 10, 1, 0.2]
+    play_seconds = 0.0
+    peak = 0
+    start = time.perf_counter()
+    for frame in range(frames):
+        for name in rng.choices(names, weights, k=triggers):
+            t = time.perf_counter()
+            audio.play(name, pan=rng.uniform(-1, 1))
+            play_seconds += time.perf_counter() - t
+        peak = max(peak, sum(audio.active_voices().values()))
+        audio.update()
+        # Let the (dummy) device consume audio at roughly frame rate
+        time.sleep(max(0.0, start + (frame + 1) / 60.0 - time.perf_counter()))
+    report = audio.stats()
+    report.update({
+        "frames": frames,
+        "requests": frames * triggers,
+        "peak_voices": peak,
+        "play_us_mean": play_seconds * 1e6 / (frames * triggers),
+    })
+    pygame.mixer.quit()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress the audio manager with a simulated big fight")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--triggers", type=int, default=30, help="sound requests per frame")
+    args = parser.parse_args()
+
+    report = simulate_fight(args.frames, args.triggers)
+    if not report:
+        return 1
+    print(f"{report['requests']} sound requests over {report['frames']} frames: "
+          f"{report['played']} played, {report['throttled']} throttled (same frame), "
+          f"{report['stolen']} stole a voice, {report['dropped']} dropped")
+    print(f"Peak {report['peak_voices']} voices on a {AudioManager().channel_count}-channel pool, "
+          f"{report['play_us_mean']:.1f} us per play() call")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
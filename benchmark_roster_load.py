@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark roster loading on synthetic 10k- and 100k-hero rosters.
+
+Compares the generic path (json.load + keyword-based construction, as the
+loader used to do) with the fast path in character_data.read_roster, using
+the stdlib backend and, when installed, orjson. Reports parse time, peak
+traced memory during the load, and memory retained by the loaded roster.
+
+Usage:
+    python benchmark_roster_load.py [--sizes 10000 100000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import character_data
+from character_data import HeroAttacks, HeroData, HeroStats
+
+GENDERS = ["male", "female"]
+
+def make_roster(count: int) -> Dict:
+    """Build a synthetic roster with realistic string repetition."""
+    heroes = []
+    for i in range(count):
+        gender = GENDERS[i % 2]
+        # Heroes share one of 50 art sets, as recoloured variants do
+        art = f"hero_{i % 50}"
+        heroes.append({
+            "name": f"Synthetic Hero {i}",
+            "backstory": f"Synthetic backstory number {i} for load benchmarking.",
+            "attacks": {
+                "short_attack": "Hammer swings & slams.",
+                "long_attack": "Lightning strikes.",
+                "special": f"Special move {i % 17}.",
+                "super_power": f"Super power {i % 11}."
+            },
+            "stats": {
+                "hp": 50 + i % 150,
+                "speed": 1 + i % 100,
+                "strength": 1 + (i * 7) % 100,
+                "energy": 50 + (i * 3) % 150
+            },
+            "gender": gender,
+            "sprite_path": f"assets/sprites/{art}_{gender}.png"
+        })
+    return {"heroes": heroes, "metadata": {"version": "1.0", "total_heroes": count}}
+
+def generic_load(path: str) -> Dict[str, HeroData]:
+    """Reference implementation of the original loader path."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    heroes = {}
+    for hero in data.get("heroes", []):
+        hero_data = HeroData(
+            name=hero["name"],
+            backstory=hero["backstory"],
+            attacks=HeroAttacks(
+                short_attack=hero["attacks"]["short_attack"],
+                long_attack=hero["attacks"]["long_attack"],
+                special=hero["attacks"]["special"],
+                super_power=hero["attacks"]["super_power"]
+            ),
+            stats=HeroStats(
+                hp=hero["stats"]["hp"],
+                speed=hero["stats"]["speed"],
+                strength=hero["stats"]["strength"],
+                energy=hero["stats"]["energy"]
+            ),
+            gender=hero.get("gender", "male"),
+            sprite_path=hero.get("sprite_path", "")
+        )
+        heroes[hero_data.name] = hero_data
+    return heroes
+
+def fast_load_stdlib(path: str) -> Dict[str, HeroData]:
+    """Fast decoding path forced onto the stdlib json backend."""
+    backend = character_data.orjson
+    character_data.orjson = None
+    try:
+        return character_data.read_roster(path)
+    finally:
+        character_data.orjson = backend
+
+def measure(loader: Callable[[str], Dict], path: str, repeat: int) -> Dict[str, float]:
+    """Return best wall time, peak traced memory and retained memory for a loader."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = loader(path)
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    tracemalloc.start()
+    result = loader(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": best, "peak_mb": peak / 2**20, "retained_mb": retained / 2**20}
+
+def main(argv: List[str] = None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    loaders = [("generic json.load", generic_load), ("fast path (json)", fast_load_stdlib)]
+    if character_data.orjson is not None:
+        loaders.append(("fast path (orjson)", character_data.read_roster))
+    else:
+        print("orjson not installed; skipping the orjson backend")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"roster_{size}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(make_roster(size), f)
+            print(f"\n{size:,} heroes ({os.path.getsize(path) / 2**20:.1f} MB on disk)")
+            print(f"  {'Loader':<22} {'Time (ms)':>10} {'Peak (MB)':>10} {'Retained (MB)':>14}")
+            for label, loader in loaders:
+                stats = measure(loader, path, args.repeat)
+                print(f"  {label:<22} {stats['seconds'] * 1000:>10.1f} "
+                      f"{stats['peak_mb']:>10.1f} {stats['retained_mb']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+import gc
 import json
 import re
+import sys
+
+try:
+    import orjson  # Optional faster JSON backend
+except ImportError:
+    orjson = None
 
 @dataclass
 class HeroStats:
@@ -53,28 +60,51 @@ class HeroData:
     @classmethod
     def from_dict(cls, data: Dict) -> 'HeroData':
         """Create HeroData from dictionary (for JSON deserialization)."""
-        attacks = HeroAttacks(
-            short_attack=data["attacks"]["short_attack"],
-            long_attack=data["attacks"]["long_attack"],
-            special=data["attacks"]["special"],
-            super_power=data["attacks"]["super_power"]
-        )
-        
-        stats = HeroStats(
-            hp=data["stats"]["hp"],
-            speed=data["stats"]["speed"],
-            strength=data["stats"]["strength"],
-            energy=data["stats"]["energy"]
-        )
-        
-        return cls(
-            name=data["name"],
-            backstory=data["backstory"],
-            attacks=attacks,
-            stats=stats,
-            gender=data.get("gender", "male"),
-            sprite_path=data.get("sprite_path", "")
-        )
+        return decode_hero(data, _hero=cls)
+
+def decode_hero(data: Dict, _intern=sys.intern, _hero=HeroData,
+                _attacks=HeroAttacks, _stats=HeroStats) -> HeroData:
+    """Build HeroData from a decoded roster entry with one lookup per key.
+
+    Constructors are called positionally through bound locals, which avoids
+    keyword matching in the generated dataclass __init__. Gender and sprite
+    path strings are interned: they repeat across large rosters (heroes
+    sharing art), so each distinct value is stored once.
+    """
+    attacks = data["attacks"]
+    stats = data["stats"]
+    get = data.get
+    return _hero(
+        data["name"],
+        data["backstory"],
+        _attacks(attacks["short_attack"], attacks["long_attack"],
+                 attacks["special"], attacks["super_power"]),
+        _stats(stats["hp"], stats["speed"], stats["strength"], stats["energy"]),
+        _intern(get("gender", "male")),
+        _intern(get("sprite_path", ""))
+    )
+
+def load_roster_json(path: str) -> Any:
+    """Decode a roster JSON file with the fastest available backend."""
+    if orjson is not None:
+        # orjson parses bytes directly, without an intermediate str copy
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.loads(f.read())
+
+def read_roster(path: str) -> Dict[str, HeroData]:
+    """Read a heroes.json file and return heroes keyed by name (fast path)."""
+    # Bulk decoding allocates only acyclic containers; pausing the cyclic GC
+    # stops it rescanning the growing roster on every generation-0 sweep.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        data = load_roster_json(path)
+        return {hero.name: hero for hero in map(decode_hero, data.get("heroes", []))}
+    finally:
+        if gc_was_enabled:
+            gc.enable()
 
 class CharacterDataParser:
     """Parses hero data from text files and converts to structured format."""
@@ -1,8 +1,20 @@
 import json
 import os
-from typing import Dict, List, Optional
-from character_data import HeroData, HeroStats, HeroAttacks
-from hero_entity import Hero
+from typing import TYPE_CHECKING, Dict, List, Optional
+from character_data import HeroData, HeroStats, HeroAttacks, read_roster
+
+if TYPE_CHECKING:
+    from hero_entity import Hero
+    from hero_simulation import HeroSimulation
+
+def _hero_class():
+    """Import the pygame-backed Hero entity on first spawn.
+
+    Keeps the data layer (roster loading, stats summaries, tooling)
+    importable without pulling in pygame.
+    """
+    from hero_entity import Hero
+    return Hero
 
 class CharacterDataLoader:
     """Loads character data from JSON files and manages hero creation."""
@@ -19,21 +31,17 @@ class CharacterDataLoader:
                 print(f"Warning: Heroes data file not found at {self.heroes_json_path}")
                 return False
             
-            with open(self.heroes_json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Fast path: optional orjson backend and specialised decoding
+            heroes = read_roster(self.heroes_json_path)
             
-            # Clear existing data
+            # Replace existing data
             self.heroes_data.clear()
-            
-            # Load each hero
-            for hero_dict in data.get("heroes", []):
-                hero_data = HeroData.from_dict(hero_dict)
-                self.heroes_data[hero_data.name] = hero_data
+            self.heroes_data.update(heroes)
             
             print(f"Loaded {len(self.heroes_data)} heroes from {self.heroes_json_path}")
             return True
             
-        except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+        except (ValueError, KeyError, TypeError, FileNotFoundError) as e:
             print(f"Error loading heroes data: {e}")
             return False
     
@@ -49,16 +57,26 @@ class CharacterDataLoader:
         """Get all heroes of a specific gender."""
         return [hero for hero in self.heroes_data.values() if hero.gender == gender]
     
-    def spawn_hero(self, hero_name: str, x: int = 0, y: int = 0) -> Optional[Hero]:
+    def spawn_hero(self, hero_name: str, x: int = 0, y: int = 0) -> Optional['Hero']:
         """Spawn a hero entity from the loaded data."""
         hero_data = self.get_hero_data(hero_name)
         if hero_data:
-            return Hero(hero_data, x, y)
+            return _hero_class()(hero_data, x, y)
+        else:
+            print(f"Hero '{hero_name}' not found in loaded data")
+            return None
+    
+    def spawn_simulated_hero(self, hero_name: str, x: float = 0, y: float = 0) -> Optional['HeroSimulation']:
+        """Spawn a hero with game state only (no sprites), for headless servers."""
+        hero_data = self.get_hero_data(hero_name)
+        if hero_data:
+            from hero_simulation import HeroSimulation
+            return HeroSimulation(hero_data, x, y)
         else:
             print(f"Hero '{hero_name}' not found in loaded data")
             return None
     
-    def spawn_random_hero(self, x: int = 0, y: int = 0, gender: Optional[str] = None) -> Optional[Hero]:
+    def spawn_random_hero(self, x: int = 0, y: int = 0, gender: Optional[str] = None) -> Optional['Hero']:
         """Spawn a random hero, optionally filtered by gender."""
         import random
         
@@ -69,7 +87,7 @@ class CharacterDataLoader:
         
         if available_heroes:
             hero_data = random.choice(available_heroes)
-            return Hero(hero_data, x, y)
+            return _hero_class()(hero_data, x, y)
         else:
             print(f"No heroes available{' for gender ' + gender if gender else ''}")
             return None
@@ -156,7 +174,7 @@ class CharacterDataLoader:
 
 # Convenience function for easy hero spawning
 def load_and_spawn_hero(hero_name: str, x: int = 0, y: int = 0, 
-                       heroes_json_path: str = "assets/heroes.json") -> Optional[Hero]:
+                       heroes_json_path: str = "assets/heroes.json") -> Optional['Hero']:
     """Convenience function to load data and spawn a hero in one call."""
     loader = CharacterDataLoader(heroes_json_path)
     return loader.spawn_hero(hero_name, x, y)
\ No newline at end of file
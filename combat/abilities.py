@@ -0,0 +1,192 @@
+"""
+Hero abilities compiled from assets/abilities.json.
+
+The file gives every attack slot (short, long, special, super) its power,
+energy cost, cooldown, range and area shape, as defaults plus per-hero
+overrides. load_abilities() validates it against "abilityTable" in
+hero_schema.json (with roster_compiler's SchemaCompiler, like the roster)
+and compiles it once into immutable AbilitySpec records with the hit
+shape's bounds precomputed for both facings; heroes share those records,
+so casting is a table lookup with no parsing.
+
+Pure Python (no pygame), so headless servers use the same specs.
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from combat.status_effects import EFFECTS
+from roster_compiler import DEFAULT_SCHEMA, SchemaCompiler, Validator
+
+ABILITIES_PATH = "assets/abilities.json"
+# Attack types HeroSimulation.attack() accepts
+SLOTS = ("short", "long", "special", "super")
+SHAPES = ("none", "circle", "arc", "box")
+
+Bounds = Tuple[float, float, float, float]  # left, top, right, bottom offsets from the caster's centre
+
+class HitShape(NamedTuple):
+    """Area an ability strikes, relative to the caster's centre."""
+    kind: str
+    radius: float            # circle and arc radius; box length
+    radius_sq: float
+    cos_half_angle: float    # arcs: cosine of half the arc's angle
+    offset: float            # how far ahead of the caster the shape is centred (the ability's range)
+    bounds_right: Bounds     # bounding box when facing right
+    bounds_left: Bounds      # ... and mirrored, facing left
+
+    def contains(self, dx: float, dy: float, facing_right: bool) -> bool:
+        """Whether a point (dx, dy) from the caster's centre is inside the shape."""
+        left, top, right, bottom = self.bounds_right if facing_right else self.bounds_left
+        if not (left <= dx <= right and top <= dy <= bottom):
+            return False
+        kind = self.kind
+        if kind == "box":
+            return True
+        forward = dx - self.offset if facing_right else -dx - self.offset
+        distance_sq = forward * forward + dy * dy
+        if distance_sq > self.radius_sq:
+            return False
+        if kind == "circle" or distance_sq == 0:
+            return True
+        return forward >= self.cos_half_angle * math.sqrt(distance_sq)
+
+class AbilitySpec(NamedTuple):
+    """One compiled ability. Shared between heroes; never mutated."""
+    slot: str
+    power: float                  # multiplier on the hero's attack damage
+    cost: float                   # energy
+    cooldown: float               # seconds before the hero can attack again
+    shape: HitShape
+    animation: str
+    volley: Optional[str]         # projectile volley preset; the volley deals the damage
+    burst: Optional[str]          # particle burst preset
+    self_effect: Optional[str]    # status effect on the caster
+    target_effect: Optional[str]  # status effect on everything struck
+
+NO_SHAPE = HitShape("none", 0.0, 0.0, 1.0, 0.0, (0.0, 0.0, -1.0, -1.0), (0.0, 0.0, -1.0, -1.0))
+
+# Used for any slot the file does not define, and when it is missing
+DEFAULT_ABILITIES = {
+    "short": {"power": 1.0, "cost": 10, "cooldown": 1.0, "shape": {"type": "arc", "radius": 90, "angle": 120}},
+    "long": {"power": 1.0, "cost": 10, "cooldown": 1.0, "volley": "long"},
+    "special": {"power": 1.0, "cost": 10, "cooldown": 1.0, "animation": "special", "burst": "special",
+                "shape": {"type": "circle", "radius": 120}, "self_effect": "shield"},
+    "super": {"power": 1.0, "cost": 10, "cooldown": 1.0, "animation": "special", "burst": "super",
+              "shape": {"type": "circle", "radius": 240}, "self_effect": "rage"},
+}
+
+def compile_shape(data: Optional[Dict], offset: float) -> HitShape:
+    if not data or data.get("type", "none") == "none":
+        return NO_SHAPE
+    kind = data["type"]
+    if kind not in SHAPES:
+        raise ValueError(f"unknown shape type {kind!r}")
+    if kind == "box":
+        length = float(data["length"])
+        half_width = float(data["width"]) / 2
+        right = (offset, -half_width, offset + length, half_width)
+        return HitShape(kind, length, length * length, 1.0, offset, right,
+                        (-right[2], right[1], -right[0], right[3]))
+    radius = float(data["radius"])
+    if kind == "circle":
+        cos_half, reach_back, reach_side = -1.0, radius, radius
+    else:
+        half = math.radians(float(data["angle"])) / 2
+        cos_half = math.cos(half)
+        reach_back = radius * max(0.0, -cos_half)
+        reach_side = radius if half >= math.pi / 2 else radius * math.sin(half)
+    right = (offset - reach_back, -reach_side, offset + radius, reach_side)
+    return HitShape(kind, radius, radius * radius, cos_half, offset, right,
+                    (-right[2], right[1], -right[0], right[3]))
+
+def compile_ability(slot: str, data: Dict) -> AbilitySpec:
+    """Compile one schema-valid ability definition.
+
+    Raises ValueError for what the schema cannot check: fields a shape type
+    needs and status effect names.
+    """
+    try:
+        power = float(data.get("power", 1.0))
+        cost = float(data.get("cost", 0))
+        cooldown = float(data.get("cooldown", 1.0))
+        offset = float(data.get("range", 0))
+        shape = compile_shape(data.get("shape"), offset)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"bad value ({e})")
+    for key in ("self_effect", "target_effect"):
+        if data.get(key) is not None and data[key] not in EFFECTS:
+            raise ValueError(f"unknown status effect {data[key]!r}")
+    return AbilitySpec(slot, power, cost, cooldown, shape, data.get("animation", "attack"),
+                       data.get("volley"), data.get("burst"), data.get("self_effect"), data.get("target_effect"))
+
+class AbilityTable:
+    """Compiled abilities: shared defaults plus the heroes that override them."""
+
+    def __init__(self, defaults: Dict[str, AbilitySpec], heroes: Dict[str, Dict[str, AbilitySpec]]):
+        self.defaults = defaults
+        self.heroes = heroes
+
+    def for_hero(self, name: str) -> Dict[str, AbilitySpec]:
+        """The slot -> spec table for a hero; heroes without overrides share the defaults."""
+        return self.heroes.get(name, self.defaults)
+
+def _compile_slots(where: str, definitions: Dict, base: Dict[str, Dict]) -> Tuple[Dict[str, AbilitySpec], Dict]:
+    merged = {}
+    specs = {}
+    for slot in SLOTS:
+        data = dict(base[slot])
+        data.update(definitions.get(slot) or {})
+        try:
+            specs[slot] = compile_ability(slot, data)
+            merged[slot] = data
+        except ValueError as e:
+            print(f"Invalid ability {where}.{slot}: {e}; using the default")
+            merged[slot] = base[slot]
+            specs[slot] = compile_ability(slot, base[slot])
+    return specs, merged
+
+_table_validator: Optional[Validator] = None
+
+def validate_table(data) -> List[str]:
+    """Schema errors in a decoded abilities file; the schema is compiled on first use."""
+    global _table_validator
+    if _table_validator is None:
+        with open(DEFAULT_SCHEMA, 'r', encoding='utf-8') as f:
+            _table_validator = SchemaCompiler(json.load(f)).compile_ref("#/definitions/abilityTable")
+    errors: List[str] = []
+    _table_validator(data, "abilities", errors)
+    return errors
+
+def compile_table(data: Dict) -> AbilityTable:
+    """Compile a decoded, schema-valid abilities file."""
+    defaults, base = _compile_slots("defaults", data.get("defaults") or {}, DEFAULT_ABILITIES)
+    heroes = {}
+    for name, overrides in (data.get("heroes") or {}).items():
+        heroes[name], _ = _compile_slots(name, overrides, base)
+    return AbilityTable(defaults, heroes)
+
+_tables: Dict[str, AbilityTable] = {}
+
+def load_abilities(path: str = ABILITIES_PATH) -> AbilityTable:
+    """Compile an abilities file, once per path; later calls return the same table."""
+    table = _tables.get(path)
+    if table is None:
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                errors = validate_table(data)
+            except (OSError, ValueError) as e:
+                print(f"Error loading abilities from {path}: {e}; using defaults")
+                data, errors = {}, []
+            if errors:
+                print(f"Invalid abilities in {path}; using defaults:")
+                for error in errors:
+                    print(f"  {error}")
+                data = {}
+        table = _tables[path] = compile_table(data)
+    return table
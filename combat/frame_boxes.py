@@ -0,0 +1,85 @@
+"""
+Per-frame hitbox and hurtbox data, shared by rendered and headless heroes.
+
+Boxes are per animation frame, in frame pixels for a right-facing frame:
+`hit` rects are where the frame strikes (they may reach outside the
+image), `hurt` rects are where it can be struck. assets/hitboxes.json holds
+the defaults per animation; a `<sheet>.boxes.json` next to a sprite sheet
+overrides them for that sheet, one entry per frame.
+
+Which frames have hitboxes also times a swing: an attack strikes on every
+frame of its animation that has them (see strikes_on()).
+
+Pure Python (no pygame); combat/hitboxes.py turns the boxes into masks.
+"""
+
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+HITBOXES_PATH = "assets/hitboxes.json"
+
+Box = Tuple[int, int, int, int]
+
+class FrameBoxes(NamedTuple):
+    hurt: Tuple[Box, ...]   # empty: the whole sprite can be struck
+    hit: Tuple[Box, ...]    # empty: the frame does not strike
+
+NO_BOXES = FrameBoxes((), ())
+
+def _parse_frames(frames: Sequence[Dict]) -> List[FrameBoxes]:
+    parsed = []
+    for frame in frames:
+        hurt = tuple(tuple(int(v) for v in box) for box in frame.get("hurt", ()))
+        hit = tuple(tuple(int(v) for v in box) for box in frame.get("hit", ()))
+        if any(len(box) != 4 or box[2] <= 0 or box[3] <= 0 for box in hurt + hit):
+            raise ValueError("boxes must be [x, y, width, height] with a positive size")
+        parsed.append(FrameBoxes(hurt, hit))
+    return parsed
+
+_defaults: Dict[str, Dict[str, List[FrameBoxes]]] = {}
+
+def load_default_boxes(path: str = HITBOXES_PATH) -> Dict[str, List[FrameBoxes]]:
+    """Animation -> per-frame boxes from the defaults file, read once per path."""
+    boxes = _defaults.get(path)
+    if boxes is None:
+        boxes = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                boxes = {animation: _parse_frames(frames) for animation, frames in data.get("animations", {}).items()}
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                print(f"Error loading hitboxes from {path}: {e}")
+                boxes = {}
+        _defaults[path] = boxes
+    return boxes
+
+def load_sheet_boxes(sheet_path: str) -> Optional[List[FrameBoxes]]:
+    """Per-frame boxes stored next to a sprite sheet (`<sheet>.boxes.json`), if there are any."""
+    path = os.path.splitext(sheet_path)[0] + ".boxes.json"
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return _parse_frames(json.load(f)["frames"])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error loading hitboxes from {path}: {e}")
+        return None
+
+def boxes_for_frame(frames: Sequence[FrameBoxes], index: int) -> FrameBoxes:
+    """Boxes for frame `index`; animations with fewer entries than frames reuse the last one."""
+    if not frames:
+        return NO_BOXES
+    return frames[min(index, len(frames) - 1)]
+
+def strikes_on(frames: Sequence[FrameBoxes], index: int) -> bool:
+    """Whether a swing strikes on frame `index`: the frame has hitboxes, or the animation
+    has none at all and this is its first frame (bursts go off at once)."""
+    if boxes_for_frame(frames, index).hit:
+        return True
+    return index == 0 and not any(frame.hit for frame in frames)
+
+def mirror_boxes(boxes: Sequence[Box], frame_width: int) -> Tuple[Box, ...]:
+    """The same boxes on a frame flipped to face left."""
+    return tuple((frame_width - x - width, y, width, height) for x, y, width, height in boxes)
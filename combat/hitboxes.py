@@ -0,0 +1,122 @@
+"""
+Precomputed collision masks for precise hits.
+
+The box data itself (combat/frame_boxes.py) is per animation frame:
+hitboxes where a frame strikes, hurtboxes where it can be struck.
+Everything pixel-level is built from it once per frame image and facing,
+when the sprites load: a CollisionFrame keeps the hurt mask (the sprite's
+opaque pixels inside its hurtboxes), the hit mask and their bounding
+rects. Collision checks are then a rect broad phase followed, for the few
+pairs that pass, by one Mask.overlap() between cached masks.
+"""
+
+import math
+import weakref
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import pygame
+
+from combat.frame_boxes import Box, FrameBoxes, mirror_boxes
+
+class CollisionFrame(NamedTuple):
+    """Collision data for one frame image and facing, relative to the frame's top-left."""
+    hurt_bounds: pygame.Rect
+    hurt_mask: pygame.mask.Mask           # origin at hurt_bounds.topleft
+    hit_bounds: Optional[pygame.Rect]
+    hit_mask: Optional[pygame.mask.Mask]  # origin at hit_bounds.topleft; None when not striking
+
+# Masks (built at load time, never at runtime)
+
+# Keyed weakly, so a mask lives only as long as its surface (e.g. a scene's enemy images)
+_sprite_masks: "weakref.WeakKeyDictionary[pygame.Surface, pygame.mask.Mask]" = weakref.WeakKeyDictionary()
+
+def sprite_mask(surface: pygame.Surface) -> pygame.mask.Mask:
+    """Opaque-pixel mask of a target's image, made once per surface while it is alive."""
+    mask = _sprite_masks.get(surface)
+    if mask is None:
+        mask = _sprite_masks[surface] = pygame.mask.from_surface(surface)
+    return mask
+
+def _rects_mask(boxes: Sequence[Box], bounds: pygame.Rect) -> pygame.mask.Mask:
+    mask = pygame.mask.Mask(bounds.size)
+    for x, y, width, height in boxes:
+        mask.draw(pygame.mask.Mask((width, height), fill=True), (x - bounds.x, y - bounds.y))
+    return mask
+
+def build_collision_frame(image: pygame.Surface, boxes: FrameBoxes, facing_right: bool = True) -> CollisionFrame:
+    """Precompute one frame's collision data. `image` is the frame as drawn (already flipped if facing left)."""
+    width, height = image.get_size()
+    hurt_boxes, hit_boxes = boxes.hurt, boxes.hit
+    if not facing_right:
+        hurt_boxes, hit_boxes = mirror_boxes(hurt_boxes, width), mirror_boxes(hit_boxes, width)
+
+    # Hurt: the sprite's own pixels, clipped to its hurtboxes (the frame owns the mask, not a cache)
+    hurt = pygame.mask.from_surface(image)
+    if hurt_boxes:
+        hurt = hurt.overlap_mask(_rects_mask(hurt_boxes, pygame.Rect(0, 0, width, height)), (0, 0))
+    bounds = hurt.get_bounding_rects()
+    if bounds:
+        hurt_bounds = bounds[0].unionall(bounds[1:])
+        hurt_mask = pygame.mask.Mask(hurt_bounds.size)
+        hurt_mask.draw(hurt, (-hurt_bounds.x, -hurt_bounds.y))
+    else:
+        hurt_bounds, hurt_mask = pygame.Rect(0, 0, 0, 0), pygame.mask.Mask((0, 0))
+
+    # Hit: the hitbox rects themselves, which may reach past the image
+    hit_bounds = hit_mask = None
+    if hit_boxes:
+        rects = [pygame.Rect(box) for box in hit_boxes]
+        hit_bounds = rects[0].unionall(rects[1:])
+        hit_mask = _rects_mask(hit_boxes, hit_bounds)
+    return CollisionFrame(hurt_bounds, hurt_mask, hit_bounds, hit_mask)
+
+_shape_masks: Dict[Tuple, Tuple[pygame.mask.Mask, pygame.Rect]] = {}
+
+def shape_mask(shape, facing_right: bool) -> Tuple[pygame.mask.Mask, pygame.Rect]:
+    """Mask of an ability's HitShape and its rect relative to the caster's centre, made once per shape."""
+    key = (shape, facing_right)
+    cached = _shape_masks.get(key)
+    if cached is None:
+        left, top, right, bottom = shape.bounds_right if facing_right else shape.bounds_left
+        rect = pygame.Rect(math.floor(left), math.floor(top),
+                           max(1, math.ceil(right) - math.floor(left)), max(1, math.ceil(bottom) - math.floor(top)))
+        if shape.kind == "box":
+            mask = pygame.mask.Mask(rect.size, fill=True)
+        else:
+            # Rasterise once; the per-pixel work happens here and never again
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            direction = 1 if facing_right else -1
+            cx, cy = direction * shape.offset - rect.x, -rect.y
+            radius = shape.radius
+            if shape.kind == "circle" or shape.cos_half_angle <= -1.0:
+                pygame.draw.circle(surface, (255, 255, 255), (cx, cy), radius)
+            else:
+                half = math.acos(shape.cos_half_angle)
+                steps = max(4, int(math.degrees(2 * half) / 5))
+                points = [(cx, cy)] + [
+                    (cx + direction * radius * math.cos(-half + 2 * half * i / steps),
+                     cy + radius * math.sin(-half + 2 * half * i / steps)) for i in range(steps + 1)]
+                pygame.draw.polygon(surface, (255, 255, 255), points)
+            mask = pygame.mask.from_surface(surface)
+        cached = _shape_masks[key] = (mask, rect)
+    return cached
+
+def hurt_region(target) -> Tuple[pygame.mask.Mask, pygame.Rect]:
+    """A target's hurt mask and its rect in world space.
+
+    Targets with a `collision_frame` (heroes) use their hurtboxes; anything
+    else with an image and rect (enemies) is struck on its opaque pixels.
+    """
+    frame = getattr(target, "collision_frame", None)
+    if frame is not None:
+        return frame.hurt_mask, frame.hurt_bounds.move(target.rect.topleft)
+    return sprite_mask(target.image), target.rect
+
+def overlaps(area_mask: pygame.mask.Mask, area_rect: pygame.Rect, target) -> bool:
+    """Rect broad phase against the target's sprite box and hurt bounds, then one mask overlap."""
+    if not area_rect.colliderect(target.rect):
+        return False
+    hurt_mask, hurt_rect = hurt_region(target)
+    if not area_rect.colliderect(hurt_rect):
+        return False
+    return area_mask.overlap(hurt_mask, (hurt_rect.x - area_rect.x, hurt_rect.y - area_rect.y)) is not None
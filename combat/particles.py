@@ -0,0 +1,164 @@
+import math
+from itertools import repeat
+import numpy as np
+import pygame
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Fade steps per colour: particles pick a pre-rendered sprite by remaining life
+FADE_LEVELS = 8
+
+# Emission presets per attack type: count, speed range (px/s), life range (s), sprite radius
+BURSTS = {
+    "special": {"count": 400, "speed": (60.0, 260.0), "life": (0.4, 1.0), "radius": 2},
+    "super": {"count": 4000, "speed": (120.0, 720.0), "life": (0.8, 2.2), "radius": 3},
+}
+
+def _particle_sprites(color: Tuple[int, int, int], radius: int) -> List[pygame.Surface]:
+    """One small glowing dot per fade level, dimmest first (drawn additively)."""
+    size = radius * 2 + 1
+    sprites = []
+    for level in range(1, FADE_LEVELS + 1):
+        scale = level / FADE_LEVELS
+        dot = pygame.Surface((size, size))
+        dot.fill((0, 0, 0))
+        dim = tuple(int(c * scale) for c in color)
+        pygame.draw.circle(dot, tuple(c // 3 for c in dim), (radius, radius), radius)
+        pygame.draw.circle(dot, dim, (radius, radius), max(1, radius // 2))
+        sprites.append(dot.convert() if pygame.display.get_surface() else dot)
+    return sprites
+
+class ParticleSystem:
+    """Array-backed particle pool.
+
+    Positions, velocities, life and sprite indices live in preallocated NumPy
+    arrays; live particles are always packed at the front, so update and cull
+    are a handful of vectorised operations regardless of particle count, and
+    drawing is a single batched blits() call.
+    """
+
+    def __init__(self, capacity: int = 20000, gravity: float = 0.0, drag: float = 0.8):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.drag = drag
+        self.count = 0
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.style = np.zeros(capacity, dtype=np.int32)  # first sprite of the particle's fade ramp
+
+        # Flat sprite table: style + fade level -> surface
+        self._sprites: List[pygame.Surface] = []
+        self._sprite_table = np.empty(0, dtype=object)
+        self._sprite_radius = np.empty(0, dtype=np.int32)
+        self._styles: Dict[Tuple[Tuple[int, int, int], int], int] = {}
+        self._rng = np.random.default_rng()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def seed(self, seed: int):
+        """Reseed emission randomness (replays and tests)."""
+        self._rng = np.random.default_rng(seed)
+
+    def _style(self, color: Tuple[int, int, int], radius: int) -> int:
+        key = (tuple(color), radius)
+        style = self._styles.get(key)
+        if style is None:
+            style = len(self._sprites)
+            self._sprites.extend(_particle_sprites(key[0], radius))
+            self._sprite_table = np.empty(len(self._sprites), dtype=object)
+            self._sprite_table[:] = self._sprites
+            self._sprite_radius = np.append(self._sprite_radius, np.full(FADE_LEVELS, radius, dtype=np.int32))
+            self._styles[key] = style
+        return style
+
+    def emit(self, x: float, y: float, count: int, color: Tuple[int, int, int],
+             speed: Tuple[float, float] = (50.0, 200.0), life: Tuple[float, float] = (0.5, 1.5),
+             radius: int = 2, angle: float = 0.0, spread: float = math.tau) -> int:
+        """Emit particles from a point in a cone (full circle by default).
+
+        Returns the number emitted; emission is clipped when the pool is full.
+        """
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return 0
+        start, end = self.count, self.count + count
+        rng = self._rng
+
+        angles = angle + (rng.random(count, dtype=np.float32) - 0.5) * spread
+        speeds = rng.uniform(speed[0], speed[1], count).astype(np.float32)
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        self.vel[start:end, 0] = np.cos(angles) * speeds
+        self.vel[start:end, 1] = np.sin(angles) * speeds
+        lifetimes = rng.uniform(life[0], life[1], count).astype(np.float32)
+        self.life[start:end] = lifetimes
+        self.max_life[start:end] = lifetimes
+        self.style[start:end] = self._style(color, radius)
+        self.count = end
+        return count
+
+    def emit_burst(self, attack_type: str, x: float, y: float, color: Tuple[int, int, int]) -> int:
+        """Emit the preset burst for an attack type; unknown types emit nothing."""
+        preset = BURSTS.get(attack_type)
+        if preset is None:
+            return 0
+        return self.emit(x, y, preset["count"], color, preset["speed"], preset["life"], preset["radius"])
+
+    def update(self, dt: float):
+        """Integrate motion, age particles and compact out the dead ones."""
+        n = self.count
+        if n == 0:
+            return
+        vel = self.vel[:n]
+        if self.gravity:
+            vel[:, 1] += self.gravity * dt
+        if self.drag:
+            vel *= max(0.0, 1.0 - self.drag * dt)
+        self.pos[:n] += vel * dt
+        life = self.life[:n]
+        life -= dt
+
+        alive = life > 0.0
+        live = int(np.count_nonzero(alive))
+        if live != n:
+            # Stable compaction keeps live particles packed at the front
+            for array in (self.pos, self.vel, self.life, self.max_life, self.style):
+                array[:live] = array[:n][alive]
+            self.count = live
+
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+
+    def blit_sequence(self, offset: Tuple[int, int] = (0, 0),
+                      view: Optional[pygame.Rect] = None) -> Iterable[Tuple]:
+        """Lazy blits() sequence for live particles, optionally culled to a view rect.
+
+        Only the per-particle sprite lookup and integer positions are computed
+        in NumPy; the tuples are produced on the fly while blits() consumes them.
+        """
+        n = self.count
+        if n == 0:
+            return []
+        pos = self.pos[:n]
+        style = self.style[:n]
+        fade = np.minimum((self.life[:n] / self.max_life[:n] * FADE_LEVELS).astype(np.int32), FADE_LEVELS - 1)
+        if view is not None:
+            visible = ((pos[:, 0] >= view.left) & (pos[:, 0] < view.right) &
+                       (pos[:, 1] >= view.top) & (pos[:, 1] < view.bottom))
+            pos, style, fade = pos[visible], style[visible], fade[visible]
+
+        index = style + fade
+        # Sprites are centred on the particle
+        points = (pos + offset).astype(np.int32) - self._sprite_radius[index][:, None]
+        return zip(self._sprite_table[index].tolist(),
+                   zip(points[:, 0].tolist(), points[:, 1].tolist()),
+                   repeat(None), repeat(pygame.BLEND_ADD))
+
+    def draw(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0),
+             view: Optional[pygame.Rect] = None):
+        """Draw all live particles with one blits() call."""
+        surface.blits(self.blit_sequence(offset, view), doreturn=False)
@@ -0,0 +1,200 @@
+import math
+import numpy as np
+import pygame
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Long-attack volley presets: projectile count, spread (radians), speed (px/s), life (s), radius
+VOLLEYS = {
+    "long": {"count": 5, "spread": 0.35, "speed": 520.0, "life": 1.6, "radius": 4},
+    "barrage": {"count": 60, "spread": math.tau, "speed": 300.0, "life": 2.5, "radius": 4},
+}
+
+def _default_sprite(radius: int) -> pygame.Surface:
+    """Yellow core with a white centre, matching AssetManager's projectile_basic."""
+    size = radius * 2
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (255, 255, 0), (radius, radius), radius)
+    pygame.draw.circle(sprite, (255, 255, 255), (radius, radius), max(1, radius // 2))
+    return sprite
+
+class ProjectileManager:
+    """Pooled projectiles with array-backed motion and a batched broad phase.
+
+    Live projectiles are packed at the front of preallocated NumPy arrays.
+    Each update moves them all at once, drops expired or out-of-bounds shots,
+    and tests the rest against target rects with sweep-and-prune: projectiles
+    are sorted by x once, each target finds its candidates with two binary
+    searches, and only those candidates get the exact circle/rect test.
+    Damage is summed per target and applied with one take_damage() call.
+    """
+
+    def __init__(self, capacity: int = 8192, bounds: Optional[pygame.Rect] = None):
+        self.capacity = capacity
+        self.bounds = pygame.Rect(bounds) if bounds is not None else pygame.Rect(0, 0, 1200, 800)
+        self.count = 0
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.owner = np.zeros(capacity, dtype=np.int64)    # id() of the firing entity
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+
+        self._sprites: List[pygame.Surface] = []
+        self._sprite_table = np.empty(0, dtype=object)
+        self._sprite_half = np.empty((0, 2), dtype=np.int32)
+        self._sprite_ids: Dict[int, int] = {}
+
+        self.hits_last_update = 0
+        self.candidates_last_update = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add_sprite(self, surface: pygame.Surface) -> int:
+        """Register a projectile image; returns its sprite index."""
+        index = self._sprite_ids.get(id(surface))
+        if index is None:
+            index = len(self._sprites)
+            self._sprites.append(surface)
+            self._sprite_table = np.empty(len(self._sprites), dtype=object)
+            self._sprite_table[:] = self._sprites
+            half = np.array([[surface.get_width() // 2, surface.get_height() // 2]], dtype=np.int32)
+            self._sprite_half = np.concatenate([self._sprite_half, half])
+            self._sprite_ids[id(surface)] = index
+        return index
+
+    def _default_sprite_index(self, radius: int) -> int:
+        key = -radius  # negative keys never collide with id() values
+        index = self._sprite_ids.get(key)
+        if index is None:
+            index = self.add_sprite(_default_sprite(radius))
+            self._sprite_ids[key] = index
+        return index
+
+    def fire(self, x: float, y: float, vx: np.ndarray, vy: np.ndarray, damage: float, owner=None,
+             radius: int = 4, life: float = 2.0, sprite: Optional[int] = None) -> int:
+        """Spawn len(vx) projectiles at (x, y) with the given velocities.
+
+        Returns the number spawned; shots are dropped when the pool is full.
+        """
+        vx = np.atleast_1d(np.asarray(vx, dtype=np.float32))
+        vy = np.atleast_1d(np.asarray(vy, dtype=np.float32))
+        count = min(len(vx), self.capacity - self.count)
+        if count <= 0:
+            return 0
+        start, end = self.count, self.count + count
+
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = vx[:count]
+        self.vel[start:end, 1] = vy[:count]
+        self.life[start:end] = life
+        self.radius[start:end] = radius
+        self.damage[start:end] = damage
+        self.owner[start:end] = id(owner) if owner is not None else 0
+        self.sprite[start:end] = sprite if sprite is not None else self._default_sprite_index(radius)
+        self.count = end
+        return count
+
+    def fire_volley(self, volley: str, x: float, y: float, angle: float, damage: float,
+                    owner=None, sprite: Optional[int] = None) -> int:
+        """Fire a preset fan of projectiles centred on angle (radians).
+
+        The volley's damage is split evenly across its projectiles.
+        """
+        preset = VOLLEYS.get(volley)
+        if preset is None:
+            return 0
+        count = preset["count"]
+        if count == 1:
+            angles = np.array([angle], dtype=np.float32)
+        elif preset["spread"] >= math.tau:
+            angles = angle + np.arange(count, dtype=np.float32) * (math.tau / count)
+        else:
+            angles = angle + np.linspace(-preset["spread"] / 2, preset["spread"] / 2, count, dtype=np.float32)
+        speed = preset["speed"]
+        return self.fire(x, y, np.cos(angles) * speed, np.sin(angles) * speed, damage / count, owner,
+                         preset["radius"], preset["life"], sprite)
+
+    def _compact(self, keep: np.ndarray):
+        live = int(np.count_nonzero(keep))
+        n = self.count
+        if live != n:
+            for array in (self.pos, self.vel, self.life, self.radius, self.damage, self.owner, self.sprite):
+                array[:live] = array[:n][keep]
+            self.count = live
+
+    def update(self, dt: float, targets: Sequence = ()) -> List[Tuple[object, float]]:
+        """Move projectiles, resolve hits against targets' rects and apply damage.
+
+        Targets need a `rect` and `take_damage(amount)`; dead targets (is_alive()
+        False) are skipped. Returns (target, damage) for every target hit.
+        """
+        self.hits_last_update = 0
+        self.candidates_last_update = 0
+        n = self.count
+        if n == 0:
+            return []
+
+        pos = self.pos[:n]
+        pos += self.vel[:n] * dt
+        life = self.life[:n]
+        life -= dt
+        bounds = self.bounds
+        keep = ((life > 0.0) & (pos[:, 0] >= bounds.left) & (pos[:, 0] < bounds.right) &
+                (pos[:, 1] >= bounds.top) & (pos[:, 1] < bounds.bottom))
+
+        hits = []
+        live_targets = [t for t in targets if not hasattr(t, "is_alive") or t.is_alive()]
+        if live_targets:
+            # Sweep-and-prune on x: sort once, binary-search each target's interval
+            order = np.argsort(pos[:, 0], kind="stable")
+            xs = pos[order, 0]
+            max_radius = float(self.radius[:n].max())
+            for target in live_targets:
+                rect = target.rect
+                lo = np.searchsorted(xs, rect.left - max_radius, side="left")
+                hi = np.searchsorted(xs, rect.right + max_radius, side="right")
+                if lo >= hi:
+                    continue
+                candidates = order[lo:hi]
+                candidates = candidates[keep[candidates] & (self.owner[candidates] != id(target))]
+                if not len(candidates):
+                    continue
+                self.candidates_last_update += len(candidates)
+
+                # Exact circle/rect test: distance from centre to the closest point of the rect
+                cx = pos[candidates, 0]
+                cy = pos[candidates, 1]
+                dx = cx - np.clip(cx, rect.left, rect.right)
+                dy = cy - np.clip(cy, rect.top, rect.bottom)
+                r = self.radius[candidates]
+                hit = candidates[dx * dx + dy * dy <= r * r]
+                if len(hit):
+                    keep[hit] = False
+                    total = float(self.damage[hit].sum())
+                    self.hits_last_update += len(hit)
+                    target.take_damage(total)
+                    hits.append((target, total))
+
+        self._compact(keep)
+        return hits
+
+    def clear(self):
+        """Remove every projectile."""
+        self.count = 0
+
+    def blit_sequence(self, offset: Tuple[int, int] = (0, 0)) -> Iterable[Tuple]:
+        """Lazy blits() sequence for live projectiles, centred on their positions."""
+        n = self.count
+        if n == 0:
+            return []
+        index = self.sprite[:n]
+        points = (self.pos[:n] + offset).astype(np.int32) - self._sprite_half[index]
+        return zip(self._sprite_table[index].tolist(),
+                   zip(points[:, 0].tolist(), points[:, 1].tolist()))
+
+    def draw(self, surface: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
+        """Draw all live projectiles with one blits() call."""
+        surface.blits(self.blit_sequence(offset), doreturn=False)
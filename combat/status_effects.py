@@ -0,0 +1,283 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Status effect presets: duration (s), plus any of: stun, damage over time (dot per
+# `interval` s), shield (damage absorbed) and stat multipliers
+EFFECTS = {
+    "stun": {"duration": 1.0, "stun": True},
+    "burn": {"duration": 3.0, "dot": 5.0, "interval": 0.5},
+    "shield": {"duration": 4.0, "shield": 40.0},
+    "haste": {"duration": 3.0, "modifiers": {"speed": 1.5}},
+    "rage": {"duration": 5.0, "modifiers": {"strength": 1.25}},
+    "weakness": {"duration": 4.0, "modifiers": {"strength": 0.75, "damage_taken": 1.2}},
+}
+
+class TimerWheel:
+    """Hashed timing wheel: O(1) schedule and cancel, one slot visited per tick.
+
+    Time advances in fixed ticks of `resolution` seconds (fractions carry
+    over between calls). A timer lands in slot deadline % slots; timers
+    more than a lap away simply stay in their slot until their deadline
+    comes round. Cancelled timers are dropped lazily when their slot is
+    visited. Timers due in the same advance() fire in deadline order, then
+    in scheduling order, so the outcome does not depend on slot layout.
+    """
+
+    def __init__(self, resolution: float = 1 / 60, slots: int = 256):
+        self.resolution = resolution
+        self.slot_count = slots
+        self.tick = 0
+        self.carry = 0.0
+        self.seq = 0
+        self._slots: List[List[list]] = [[] for _ in range(slots)]
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def ticks(self, seconds: float) -> int:
+        return max(1, int(round(seconds / self.resolution)))
+
+    def schedule(self, ticks: int, item, seq: Optional[int] = None) -> list:
+        """Fire `item` after `ticks` ticks; returns a handle for cancel()."""
+        if seq is None:
+            seq = self.seq
+            self.seq += 1
+        deadline = self.tick + max(1, ticks)
+        entry = [deadline, seq, item]
+        self._slots[deadline % self.slot_count].append(entry)
+        self._live += 1
+        return entry
+
+    def cancel(self, entry: Optional[list]):
+        if entry is not None and entry[2] is not None:
+            entry[2] = None
+            self._live -= 1
+            if not self._live:
+                for slot in self._slots:
+                    slot.clear()
+
+    def remaining(self, entry: list) -> int:
+        """Ticks until a scheduled entry fires."""
+        return entry[0] - self.tick
+
+    def advance(self, dt: float) -> List:
+        """Move time forward; returns the items that came due, in firing order."""
+        self.carry += dt
+        steps = int(self.carry / self.resolution + 1e-9)
+        if not steps:
+            return []
+        self.carry = max(0.0, self.carry - steps * self.resolution)
+        end = self.tick + steps
+        if not self._live:
+            self.tick = end
+            return []
+        due = []
+        slots, slot_count = self._slots, self.slot_count
+        # A stall longer than a lap visits every slot once
+        for tick in range(self.tick + 1, self.tick + 1 + min(steps, slot_count)):
+            slot = slots[tick % slot_count]
+            if slot:
+                self._collect(slot, end, due)
+        self.tick = end
+        if not due:
+            return []
+        self._live -= len(due)
+        due.sort(key=lambda entry: (entry[0], entry[1]))
+        items = [entry[2] for entry in due]
+        for entry in due:
+            entry[2] = None
+        return items
+
+    def _collect(self, slot: List[list], now: int, due: List[list]):
+        # Entries due by `now`, the tick this advance ends on, fire; later laps stay
+        keep = []
+        for entry in slot:
+            if entry[2] is None:
+                continue
+            (due if entry[0] <= now else keep).append(entry)
+        slot[:] = keep
+
+    def clear(self):
+        for slot in self._slots:
+            slot.clear()
+        self._live = 0
+
+class ActiveEffect:
+    """One status effect on one target. `shield` is what is left to absorb."""
+
+    __slots__ = ("name", "target", "spec", "shield", "expiry", "pulse")
+
+    def __init__(self, name: str, target, spec: Dict):
+        self.name = name
+        self.target = target
+        self.spec = spec
+        self.shield = float(spec.get("shield", 0.0))
+        self.expiry: Optional[list] = None
+        self.pulse: Optional[list] = None   # next damage-over-time tick
+
+class _Modifiers(NamedTuple):
+    multipliers: Dict[str, float]
+    stunned: bool
+
+_NO_MODIFIERS = _Modifiers({}, False)
+
+class StatusEffects:
+    """Stuns, damage over time, shields and stat buffs for any number of targets.
+
+    Expiry and damage-over-time pulses are timers on one shared TimerWheel,
+    so update() costs the effects that come due rather than every active
+    effect every frame. Each target's combined stat multipliers and stun
+    state are cached and rebuilt only when its set of effects changes.
+    Targets need take_damage(amount) for damage over time.
+
+    Usage:
+        status = StatusEffects()
+        hero.status = status
+        status.apply(hero, "shield")
+        status.update(dt)                      # once per frame
+        speed = status.stat(hero, "speed", hero.speed)
+    """
+
+    def __init__(self, resolution: float = 1 / 60):
+        self.wheel = TimerWheel(resolution)
+        self._targets: Dict[int, Dict[str, ActiveEffect]] = {}
+        self._modifiers: Dict[int, _Modifiers] = {}
+
+    def __len__(self) -> int:
+        return sum(len(effects) for effects in self._targets.values())
+
+    def apply(self, target, name: str, duration: Optional[float] = None) -> Optional[ActiveEffect]:
+        """Start an effect on a target; re-applying one it already has refreshes it."""
+        spec = EFFECTS.get(name)
+        if spec is None:
+            print(f"Unknown status effect: {name}")
+            return None
+        wheel = self.wheel
+        ticks = wheel.ticks(duration if duration is not None else spec["duration"])
+        effects = self._targets.setdefault(id(target), {})
+        effect = effects.get(name)
+        if effect is not None:
+            wheel.cancel(effect.expiry)
+            effect.expiry = wheel.schedule(ticks, ("expire", effect))
+            effect.shield = float(spec.get("shield", 0.0))
+            return effect
+        effect = ActiveEffect(name, target, spec)
+        effect.expiry = wheel.schedule(ticks, ("expire", effect))
+        if "dot" in spec:
+            effect.pulse = wheel.schedule(wheel.ticks(spec["interval"]), ("pulse", effect))
+        effects[name] = effect
+        self._modifiers.pop(id(target), None)
+        return effect
+
+    def remove(self, effect: ActiveEffect):
+        effects = self._targets.get(id(effect.target))
+        if effects is None or effects.get(effect.name) is not effect:
+            return
+        self.wheel.cancel(effect.expiry)
+        self.wheel.cancel(effect.pulse)
+        del effects[effect.name]
+        if not effects:
+            del self._targets[id(effect.target)]
+        self._modifiers.pop(id(effect.target), None)
+
+    def clear(self, target=None):
+        """Remove every effect from `target`, or from everything if None."""
+        if target is None:
+            self.wheel.clear()
+            self._targets.clear()
+            self._modifiers.clear()
+            return
+        for effect in list(self._targets.get(id(target), {}).values()):
+            self.remove(effect)
+
+    def effects_of(self, target) -> List[ActiveEffect]:
+        return list(self._targets.get(id(target), {}).values())
+
+    def update(self, dt: float):
+        """Advance the clock; expire effects and apply damage-over-time pulses that came due."""
+        wheel = self.wheel
+        for kind, effect in wheel.advance(dt):
+            if self._targets.get(id(effect.target), {}).get(effect.name) is not effect:
+                continue   # removed earlier in this batch
+            if kind == "expire":
+                effect.expiry = None
+                self.remove(effect)
+            else:
+                spec = effect.spec
+                effect.pulse = wheel.schedule(wheel.ticks(spec["interval"]), ("pulse", effect))
+                effect.target.take_damage(spec["dot"])
+
+    # Cached queries
+
+    def _lookup(self, target) -> _Modifiers:
+        modifiers = self._modifiers.get(id(target))
+        if modifiers is None:
+            effects = self._targets.get(id(target))
+            if not effects:
+                return _NO_MODIFIERS
+            multipliers: Dict[str, float] = {}
+            stunned = False
+            for effect in effects.values():
+                stunned = stunned or effect.spec.get("stun", False)
+                for stat, factor in effect.spec.get("modifiers", {}).items():
+                    multipliers[stat] = multipliers.get(stat, 1.0) * factor
+            modifiers = self._modifiers[id(target)] = _Modifiers(multipliers, stunned)
+        return modifiers
+
+    def stat(self, target, name: str, base: float) -> float:
+        """`base` with the target's multipliers for stat `name` applied."""
+        factor = self._lookup(target).multipliers.get(name)
+        return base if factor is None else base * factor
+
+    def is_stunned(self, target) -> bool:
+        return self._lookup(target).stunned
+
+    def absorb(self, target, damage: float) -> float:
+        """Let the target's shields soak up damage, oldest first; returns what gets through."""
+        effects = self._targets.get(id(target))
+        if not effects:
+            return damage
+        for effect in list(effects.values()):
+            if effect.shield > 0 and damage > 0:
+                soaked = min(effect.shield, damage)
+                effect.shield -= soaked
+                damage -= soaked
+                if effect.shield <= 0:
+                    self.remove(effect)
+        return damage
+
+    # Snapshots
+
+    def capture(self, targets: List) -> Tuple:
+        """Effects on `targets` as (clock carry, seq, rows), rows keyed by target index."""
+        index = {id(target): i for i, target in enumerate(targets)}
+        wheel = self.wheel
+        rows = []
+        for key, effects in self._targets.items():
+            if key not in index:
+                continue
+            for effect in effects.values():
+                expiry, pulse = effect.expiry, effect.pulse
+                rows.append((index[key], effect.name, wheel.remaining(expiry), expiry[1],
+                             wheel.remaining(pulse) if pulse is not None else -1,
+                             pulse[1] if pulse is not None else 0, float(effect.shield)))
+        return wheel.carry, wheel.seq, tuple(rows)
+
+    def restore(self, state: Tuple, targets: List):
+        """Replace all effects with captured ones; the inverse of capture()."""
+        carry, seq, rows = state
+        self.clear()
+        wheel = self.wheel
+        wheel.carry = carry
+        for target_index, name, expiry, expiry_seq, pulse, pulse_seq, shield in rows:
+            spec = EFFECTS.get(name)
+            if spec is None or not 0 <= target_index < len(targets):
+                continue
+            target = targets[target_index]
+            effect = ActiveEffect(name, target, spec)
+            effect.shield = shield
+            effect.expiry = wheel.schedule(expiry, ("expire", effect), expiry_seq)
+            if pulse >= 0:
+                effect.pulse = wheel.schedule(pulse, ("pulse", effect), pulse_seq)
+            self._targets.setdefault(id(target), {})[name] = effect
+        wheel.seq = seq
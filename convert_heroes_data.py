@@ -2,56 +2,48 @@
 """
 Script to convert metahumans.txt to heroes.json format.
 Run this script to generate the JSON data file from the text file.
+
+This is a thin wrapper around roster_compiler.py, which validates the output
+against hero_schema.json and only rewrites heroes.json when it changes.
 """
 
-import json
 import os
-from character_data import CharacterDataParser
+from roster_compiler import RosterCompiler
 
-def convert_heroes_to_json():
+def convert_heroes_to_json(force: bool = False):
     """Convert metahumans.txt to heroes.json format."""
-    
-    # Initialize parser
-    parser = CharacterDataParser()
-    
-    # Parse the metahumans.txt file
+
     metahumans_path = os.path.join("assets", "metahumans.txt")
-    
+
     if not os.path.exists(metahumans_path):
         print(f"Error: {metahumans_path} not found!")
         return
-    
+
     print(f"Parsing {metahumans_path}...")
-    heroes = parser.parse_metahumans_file(metahumans_path)
-    
-    if not heroes:
+    compiler = RosterCompiler([metahumans_path])
+    result = compiler.compile(force=force)
+
+    if not result.ok:
+        for error in result.errors:
+            print(f"Error: {error}")
+        return
+
+    if not result.heroes:
         print("No heroes found in the file!")
         return
-    
-    # Convert to dictionary format
-    heroes_data = {
-        "heroes": [hero.to_dict() for hero in heroes],
-        "metadata": {
-            "version": "1.0",
-            "total_heroes": len(heroes),
-            "description": "Neon Knights Hero Data - Generated from metahumans.txt"
-        }
-    }
-    
-    # Save to JSON file
-    output_path = os.path.join("assets", "heroes.json")
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(heroes_data, f, indent=2, ensure_ascii=False)
-    
-    print(f"Successfully converted {len(heroes)} heroes to {output_path}")
-    
+
+    output_path = compiler.output_path
+    if result.output_written:
+        print(f"Successfully converted {len(result.heroes)} heroes to {output_path}")
+    else:
+        print(f"{output_path} is already up to date ({len(result.heroes)} heroes)")
+
     # Print summary
     print("\nHeroes converted:")
-    for hero in heroes:
-        print(f"  - {hero.name} ({hero.gender})")
-    
-    return heroes_data
+    for hero in result.heroes:
+        print(f"  - {hero['name']} ({hero['gender']})")
+
+    return compiler.build_document(result.heroes)
 
 if __name__ == "__main__":
-    convert_heroes_to_json()
\ No newline at end of file
+    convert_heroes_to_json()
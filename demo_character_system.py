@@ -8,7 +8,6 @@ This script shows how to:
 4. Add new heroes programmatically
 """
 
-import pygame
 import sys
 from character_loader import CharacterDataLoader, load_and_spawn_hero
 from character_data import HeroData
@@ -90,8 +89,11 @@ def demo_pygame_integration():
     
     print("\n=== Pygame Integration Demo ===")
     
-    # Initialize pygame (minimal setup for demo)
-    pygame.init()
+    import pygame
+    
+    # Initialize pygame (minimal setup for demo: display and fonts only)
+    pygame.display.init()
+    pygame.font.init()
     
     try:
         # Create a small display for demo
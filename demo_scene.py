@@ -0,0 +1,444 @@
+import zlib
+from typing import Optional
+
+import pygame
+
+from asset_manager import AssetRequest
+from audio_manager import DEFAULT_BANK
+from character_loader import CharacterDataLoader
+from demo_session import DemoSession, load_demo_level
+from levels.camera import Camera
+from levels.renderer import TileMapRenderer, build_tileset
+from levels.tilemap import TileMap
+from neon_effects import NeonEffects
+from player.input_map import (SIM_ACTIONS, TOGGLE_STATS, QUICK_SAVE, QUICK_LOAD, REWIND, ATTACK, LONG_ATTACK,
+                              SPECIAL, SUPER, HURT, SPAWN_WAVE, SELECT_PREV, SELECT_NEXT)
+from render_queue import (LAYER_BACKGROUND, LAYER_TILES, LAYER_SPRITE_GLOW, LAYER_SPRITES, LAYER_SPRITE_MARKERS,
+                          LAYER_EFFECTS, LAYER_HUD)
+from replay import ReplayReader, ReplayWriter
+from scene_manager import Scene
+from snapshot import RollbackBuffer, SnapshotManager
+from ui.widgets import Bar, Label, Panel, TextList, UIRoot
+
+FPS = 60
+QUICKSAVE_PATH = "quicksave.nksnap"
+REWIND_FRAMES = 2 * FPS
+# Fraction of the way the camera moves toward the selected hero each frame
+CAMERA_SMOOTHING = 0.15
+
+# Sound played for each simulation action, panned by the selected hero's position
+ACTION_SOUNDS = [
+    (ATTACK, "attack_short"), (LONG_ATTACK, "attack_long"), (SPECIAL, "attack_special"),
+    (SUPER, "attack_super"), (HURT, "hurt"), (SPAWN_WAVE, "wave_spawn"),
+    (SELECT_PREV, "ui_select"), (SELECT_NEXT, "ui_select"),
+]
+
+CONTROLS = [
+    "Enhanced Controls:",
+    "← → : Select Hero",
+    "SPACE: Attack Animation",
+    "F: Long Attack, Q: Special, E: Super Power",
+    "H: Hurt Animation (Take Damage)",
+    "W/A/D: Walk (hold)",
+    "N: Spawn Enemy Wave",
+    "S: Toggle Stats Display",
+    "F3: Profiler Overlay, F4: Dump Trace",
+    "F6: Toggle Metrics, F7: Export Metrics",
+    "F9: Quick Save, F10: Quick Load",
+    "BACKSPACE: Rewind 2 Seconds",
+    "ESC: Exit",
+    "",
+    "Features Demonstrated:",
+    "• Gender-specific body shapes",
+    "• Distinguishable female features",
+    "• Body type variations (athletic, fit, etc.)",
+    "• Character-specific color schemes",
+    "• Advanced animation system",
+    "• Realistic character proportions"
+]
+
+def _control_color(line: str):
+    if line.startswith("•"):
+        return (150, 255, 150)
+    return (255, 255, 100) if line.endswith(":") else (200, 200, 200)
+
+class TitleScene(Scene):
+    """Splash screen shown while the next scene loads in the background.
+
+    Moves on after `duration` seconds or on any key, as soon as the next
+    scene is ready.
+    """
+
+    name = "title"
+
+    def __init__(self, next_scene: Scene, duration: float = 2.0):
+        super().__init__()
+        self.next_scene = next_scene
+        self.duration = duration
+        self.timer = 0.0
+        self.leaving = False
+        self.effects = NeonEffects()
+
+    def assets(self):
+        return [AssetRequest('font', "title_font", None, size=72),
+                AssetRequest('font', "title_small_font", None, size=28)]
+
+    def enter(self):
+        self.manager.prepare(self.next_scene)
+
+    def update(self, dt: float, actions):
+        self.timer += dt
+        if not self.leaving and (actions.pressed or self.timer >= self.duration):
+            self.leaving = True
+            self.manager.switch(self.next_scene)
+
+    def draw(self, screen: pygame.Surface):
+        assets = self.manager.assets
+        screen.fill((10, 0, 20))
+        width, height = screen.get_size()
+        title = self.effects.text(assets.get_font("title_font"), "NEON KNIGHTS", (255, 255, 255),
+                                  glow_color=(255, 0, 255), glow_radius=14)
+        screen.blit(title, (width // 2 - title.get_width() // 2, height // 2 - 80))
+        ready = self.manager.prepare(self.next_scene).done()
+        prompt = "Press any key" if ready else "Loading..."
+        text = self.effects.text(assets.get_font("title_small_font"), prompt, (0, 255, 255),
+                                 glow_color=(0, 128, 255), glow_radius=6)
+        screen.blit(text, (width // 2 - text.get_width() // 2, height // 2 + 20))
+
+class DemoScene(Scene):
+    """The character design demo: heroes, enemies, effects, HUD, replays and quick saves."""
+
+    name = "demo"
+
+    def __init__(self, profiler, render_queue, clock: pygame.time.Clock, audio=None,
+                 record_path: Optional[str] = None, replay_path: Optional[str] = None, seed: Optional[int] = None):
+        super().__init__()
+        self.profiler = profiler
+        self.render_queue = render_queue
+        self.clock = clock
+        self.audio = audio
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.seed = seed
+
+        self.loader: Optional[CharacterDataLoader] = None
+        self.tilemap: Optional[TileMap] = None
+        self.level_renderer: Optional[TileMapRenderer] = None
+        self.replay_frames = None
+        self.session: Optional[DemoSession] = None
+        self.recorder: Optional[ReplayWriter] = None
+        self.desync_reported = False
+        self.show_stats = True
+        self.effects: Optional[NeonEffects] = None
+        self.ui: Optional[UIRoot] = None
+
+    def assets(self):
+        return [AssetRequest('font', "demo_font", None, size=36),
+                AssetRequest('font', "demo_small_font", None, size=24),
+                AssetRequest('font', "demo_tiny_font", None, size=16)]
+
+    def preload(self):
+        """Loader thread: parse the roster, map the level and read the replay file, if any."""
+        print("Loading character data...")
+        self.loader = CharacterDataLoader()
+        self.tilemap = load_demo_level()
+        if self.replay_path:
+            try:
+                reader = ReplayReader(self.replay_path)
+            except (OSError, ValueError, zlib.error) as e:
+                print(f"Failed to load replay {self.replay_path}: {e}")
+                self.loader = None
+                return
+            self.seed = reader.seed
+            # Indexed by session frame, so a rewind during playback resumes from there
+            self.replay_frames = list(reader.frames())
+
+    def enter(self):
+        loader = self.loader
+        if loader is None or not loader.heroes_data:
+            if loader is not None:
+                print("Error: No hero data loaded!")
+            self.manager.quit()
+            return
+        print(f"Loaded {len(loader.heroes_data)} heroes")
+        if self.replay_frames is not None:
+            print(f"Replaying {self.replay_path} (seed {self.seed})")
+
+        # Simulation state: heroes, enemies, effects (advanced only by its inputs)
+        self.session = DemoSession(loader, self.seed, tilemap=self.tilemap)
+        if self.record_path:
+            try:
+                self.recorder = ReplayWriter(self.record_path, self.session.seed)
+                print(f"Recording replay to {self.record_path} (seed {self.session.seed})")
+            except OSError as e:
+                print(f"Failed to record replay {self.record_path}: {e}")
+
+        # Quick save/load (F9/F10) and a rolling rewind buffer (BACKSPACE)
+        self.snapshots = SnapshotManager()
+        self.rollback = RollbackBuffer(capacity=10, interval=30)
+
+        # Scene-owned caches, released with the scene
+        assets = self.manager.assets
+        screen_size = pygame.display.get_surface().get_size()
+        self.effects = NeonEffects()
+        self.font = assets.get_font("demo_font")
+        self.small_font = assets.get_font("demo_small_font")
+        self.tiny_font = assets.get_font("demo_tiny_font")
+
+        # Pre-render the gradient background once: one column, stretched to the screen width
+        column = pygame.Surface((1, 800))
+        for y in range(800):
+            color_intensity = int(20 + (y / 800) * 40)
+            column.set_at((0, y), (color_intensity, color_intensity // 2, color_intensity))
+        background = pygame.transform.scale(column, (1200, 800)).convert()
+        assets.add_asset("demo_background", background, self.scope)
+        self.background = background
+
+        # The level, in cached chunks, seen through a camera that follows the selected hero
+        tilemap = self.tilemap
+        self.level_renderer = TileMapRenderer(tilemap, build_tileset(assets, tilemap.tile_size))
+        self.camera = Camera(*screen_size, tilemap.pixel_width, tilemap.pixel_height)
+        if self.session.selected_hero is not None:
+            self.camera.center_on(*self.session.selected_hero.rect.center)
+
+        self._build_hud(screen_size)
+
+        if self.audio is not None and self.audio.enabled:
+            self.audio.load_bank("demo", DEFAULT_BANK)
+
+    def _build_hud(self, size):
+        """Retained HUD widgets: each re-renders only when the data it shows changes."""
+        small_font, tiny_font = self.small_font, self.tiny_font
+        gray = (200, 200, 200)
+        self.ui = UIRoot(size)
+        self.stats_panel = self.ui.add(Panel([
+            Label(small_font, field="name", fmt="Selected: {}"),
+            Label(small_font, color=gray, field="gender", fmt="Gender: {}"),
+            Label(small_font, color=gray, field="body_type", fmt="Body Type: {}"),
+            Label(small_font, color=gray, field="hp", fmt="HP: {}"),
+            Bar(280, 6, (255, 60, 90), field="hp_value", max_field="max_hp"),
+            Label(small_font, color=gray, field="energy", fmt="Energy: {}"),
+            Bar(280, 6, (0, 200, 255), field="energy_value", max_field="max_energy"),
+            Label(small_font, color=gray, field="strength", fmt="Strength: {}"),
+            Label(small_font, color=gray, field="speed", fmt="Speed: {}"),
+            Label(small_font, color=gray, field="animation", fmt="Animation: {} (Frame {})"),
+        ], source=self._selected_info, width=300, spacing=8, offset=(50, 110)))
+        self.ui.add(Panel([TextList(tiny_font, CONTROLS, 20, style=_control_color)],
+                          width=400, spacing=0, alpha=160, anchor="bottomright", offset=(-20, -20)))
+        self.ui.add(Label(tiny_font, color=(100, 255, 100), bind=self._performance_info,
+                          fmt="FPS: {}  Draw calls: {} ({} commands)  Particles: {}  Projectiles: {}",
+                          offset=(10, 10)))
+        self.ai_label = self.ui.add(Label(tiny_font, color=(255, 100, 255),
+                                          bind=self.session.ai_scheduler.format_report,
+                                          anchor="bottomleft", offset=(10, -8)))
+        # Per-hero captions move with the heroes, so they are cached widgets outside the layout
+        self.hero_labels = []
+
+        # The stats panel's data is rebuilt only when the selected hero reports a change
+        self._stats_hero = None
+        self._stats_info = None
+        self.session.changes.subscribe(self._on_hero_changed)
+
+    def _on_hero_changed(self, event):
+        if event.source is self._stats_hero:
+            self._stats_info = None
+
+    def _selected_info(self):
+        hero = self.session.selected_hero
+        if hero is not self._stats_hero or self._stats_info is None:
+            info = dict(hero.get_info())
+            info.update(body_type=hero.body_type, strength=hero.strength, speed=hero.speed,
+                        animation=(hero.current_animation, hero.animation_frame),
+                        hp_value=hero.current_hp, max_hp=hero.max_hp,
+                        energy_value=hero.current_energy, max_energy=hero.max_energy)
+            self._stats_hero = hero
+            self._stats_info = info
+        return self._stats_info
+
+    def _performance_info(self):
+        render_queue, session = self.render_queue, self.session
+        return (int(self.clock.get_fps()), render_queue.draw_calls_last_frame, render_queue.commands_last_frame,
+                len(session.particles), len(session.projectiles))
+
+    def exit(self):
+        if self.session is None:
+            return
+        self.snapshots.shutdown()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Saved replay ({self.recorder.frames} frames) to {self.record_path}")
+        ai_scheduler = self.session.ai_scheduler
+        if ai_scheduler.frame and len(ai_scheduler):
+            print(ai_scheduler.format_report())
+        if self.audio is not None and self.audio.enabled:
+            self.audio.unload_bank("demo")
+        self.session = None
+        self.effects = None
+        self.background = None
+        self.level_renderer = None
+        if self.tilemap is not None:
+            self.tilemap.close()
+            self.tilemap = None
+        self.ui = None
+        self.hero_labels = []
+
+    def update(self, dt: float, actions):
+        session = self.session
+        if session is None:
+            return
+        profiler = self.profiler
+        replay_frames = self.replay_frames
+        recorder = self.recorder
+        if replay_frames is not None and session.frame >= len(replay_frames):
+            print(f"Replay finished after {session.frame} frames")
+            self.manager.quit()
+            return
+        decision_limit = None
+        replay_checksum = None
+
+        with profiler.stage("events"):
+            pressed = actions.pressed
+            if pressed & TOGGLE_STATS:
+                self.show_stats = not self.show_stats
+            if pressed & QUICK_SAVE:
+                self.snapshots.save(session, QUICKSAVE_PATH, self.loader.heroes_data)
+                print(f"Quick saved frame {session.frame} to {QUICKSAVE_PATH}")
+            if pressed & QUICK_LOAD:
+                if recorder is not None or replay_frames is not None:
+                    # A loaded state would not match the replay's input
+                    print("Quick load is disabled while recording or replaying")
+                elif self.snapshots.load(session, QUICKSAVE_PATH, self.loader.heroes_data):
+                    self.rollback.clear()
+                    self._stats_info = None
+                    print(f"Quick loaded frame {session.frame} from {QUICKSAVE_PATH}")
+            if pressed & REWIND:
+                if recorder is not None:
+                    print("Rewinding is disabled while recording")
+                else:
+                    snapshot = self.rollback.rewind(session, REWIND_FRAMES)
+                    if snapshot is not None:
+                        self._stats_info = None
+                        print(f"Rewound to frame {snapshot.frame}")
+            if replay_frames is not None:
+                # Read after the events, since a rewind moves the session back
+                dt, sim_pressed, sim_held, decision_limit, replay_checksum = replay_frames[session.frame]
+            else:
+                sim_pressed = pressed & SIM_ACTIONS
+                sim_held = actions.held & SIM_ACTIONS
+            session.apply_input(sim_pressed, sim_held)
+            audio = self.audio
+            if audio is not None and audio.enabled:
+                if sim_pressed and session.selected_hero:
+                    screen_x, _ = self.camera.world_to_screen(*session.selected_hero.rect.center)
+                    pan = max(-1.0, min(1.0, 2.0 * screen_x / self.camera.view.width - 1.0))
+                    for action, sound in ACTION_SOUNDS:
+                        if sim_pressed & action:
+                            audio.play(sound, pan=pan)
+                audio.update()
+
+        # Update game state
+        with profiler.stage("update"):
+            session.update(dt)
+
+        # Enemy steering every tick, decisions within the AI budget
+        with profiler.stage("ai"):
+            decisions = session.update_ai(dt, decision_limit)
+            self.rollback.record(session)
+
+        # Record the frame, or check playback against the recorded state
+        if recorder is not None:
+            recorder.record_frame(dt, sim_pressed, sim_held, decisions,
+                                  session.checksum() if recorder.wants_checksum() else None)
+        elif replay_checksum is not None and not self.desync_reported and session.checksum() != replay_checksum:
+            print(f"Replay desync: state diverged by frame {session.frame}")
+            self.desync_reported = True
+
+    def draw(self, screen: pygame.Surface):
+        session = self.session
+        if session is None:
+            screen.fill((0, 0, 0))
+            return
+        profiler = self.profiler
+        render_queue = self.render_queue
+        effects = self.effects
+        camera = self.camera
+        font, small_font, tiny_font = self.font, self.small_font, self.tiny_font
+
+        # Follow the selected hero, easing so that switching heroes pans rather than jumps
+        if screen.get_size() != camera.view.size:
+            camera.resize(*screen.get_size())
+        if session.selected_hero is not None:
+            camera.follow(session.selected_hero.rect, CAMERA_SMOOTHING)
+
+        # Queue gradient background, then the visible level chunks over it
+        with profiler.stage("background"):
+            render_queue.submit(self.background, (0, 0), LAYER_BACKGROUND)
+            render_queue.submit_batch(self.level_renderer.blit_sequence(camera), LAYER_TILES)
+
+        # Queue heroes (culled against the camera) over their cached neon halos
+        with profiler.stage("sprites"):
+            for i, hero in enumerate(session.heroes):
+                if camera.is_visible(hero.rect):
+                    glow_color = (255, 255, 0) if i == session.selected_hero_index else (0, 255, 255)
+                    halo = effects.glow(hero.image, glow_color, 8, include_source=False)
+                    render_queue.submit(halo, camera.apply(hero.rect).move(-8, -8), LAYER_SPRITE_GLOW)
+            render_queue.submit_sprites(session.all_sprites, LAYER_SPRITES, camera)
+
+        # Queue projectiles and particles, one blits() batch each
+        with profiler.stage("effects"):
+            render_queue.submit_batch(session.projectiles.blit_sequence(camera.offset), LAYER_EFFECTS)
+            render_queue.submit_batch(session.particles.blit_sequence(camera.offset, camera.view), LAYER_EFFECTS)
+
+        # Queue HUD text and panels
+        with profiler.stage("hud"):
+            # Draw title
+            title_text = effects.text(font, "Neon Knights - Advanced Character Design", (255, 255, 255),
+                                      glow_color=(255, 0, 255), glow_radius=10)
+            render_queue.submit(title_text, (1200 // 2 - title_text.get_width() // 2, 20), LAYER_HUD)
+
+            # Draw subtitle
+            subtitle_text = effects.text(small_font, "Realistic Character Bodies with Gender-Specific Features",
+                                         (200, 200, 255), glow_color=(128, 0, 255), glow_radius=6)
+            render_queue.submit(subtitle_text, (1200 // 2 - subtitle_text.get_width() // 2, 74), LAYER_HUD)
+
+            # Draw hero information
+            hero_labels = self.hero_labels
+            while len(hero_labels) < len(session.heroes):
+                hero_labels.append((Label(tiny_font, color=(180, 180, 180)), Label(tiny_font, color=(150, 255, 150))))
+            for i, hero in enumerate(session.heroes):
+                if not camera.is_visible(hero.rect):
+                    continue
+                rect = camera.apply(hero.rect)
+
+                # Hero name
+                name_text = effects.text(small_font, hero.name, (255, 255, 255),
+                                         outline_color=(0, 0, 0), outline_width=1)
+                text_x = rect.centerx - name_text.get_width() // 2
+                render_queue.submit(name_text, (text_x, rect.y - 36), LAYER_HUD)
+
+                # Gender and body type, animation state
+                info_label, anim_label = hero_labels[i]
+                info_label.set_text(f"{hero.gender} - {hero.body_type}")
+                anim_label.set_text(f"Anim: {hero.current_animation}")
+                info_text, anim_text = info_label.surface, anim_label.surface
+                render_queue.submit(info_text, (rect.centerx - info_text.get_width() // 2, rect.y - 20), LAYER_HUD)
+                render_queue.submit(anim_text, (rect.centerx - anim_text.get_width() // 2, rect.bottom + 5),
+                                    LAYER_HUD)
+
+                # Selection indicator
+                if i == session.selected_hero_index:
+                    render_queue.submit_draw(pygame.draw.rect, (255, 255, 0), rect.inflate(16, 16), 4,
+                                             layer=LAYER_SPRITE_MARKERS)
+
+            # Stats, controls and performance panels: a blit each unless their data changed
+            ui = self.ui
+            if screen.get_size() != ui.area.size:
+                ui.resize(screen.get_size())
+            self.stats_panel.visible = self.show_stats and session.selected_hero is not None
+            self.ai_label.visible = bool(session.enemies)
+            ui.update()
+            ui.submit(render_queue, LAYER_HUD)
+
+        # Submit the frame's draw commands in sorted batches
+        with profiler.stage("render"):
+            render_queue.flush(screen)
@@ -0,0 +1,208 @@
+import os
+import random
+import struct
+import zlib
+from typing import List, Optional
+
+import pygame
+
+from combat.particles import ParticleSystem
+from combat.projectiles import ProjectileManager
+from combat.status_effects import StatusEffects
+from enemy.ai import AIScheduler
+from enemy.enemy import Enemy
+from levels.level_file import load_level
+from levels.pathfinding import PathfindingService
+from levels.renderer import CameraGroup
+from levels.tilemap import TileMap
+from observable import ChangeBus
+from player.input_map import (ATTACK, HURT, LONG_ATTACK, SELECT_NEXT, SELECT_PREV, SPAWN_WAVE, SPECIAL, SUPER,
+                              direction_of)
+from snapshot import capture_swings
+
+# Heroes spawned by the demo, with gender variety
+HERO_CONFIGS = [
+    ("Stormbearer", 150, 350),
+    ("Neon Centurion", 350, 350),
+    ("Aetheria", 550, 350),
+    ("Hellrider", 750, 350),
+    ("Titaness", 950, 350),
+]
+
+# Size of the demo world in pixels: the default arena level, 60 x 40 tiles of 32 px
+WORLD_SIZE = (1920, 1280)
+TILE_SIZE = 32
+# Level the demo is played on (see levels/convert_level.py); without one it uses a walled arena
+LEVEL_PATH = "assets/levels/demo.nklevel"
+
+def load_demo_level(path: str = LEVEL_PATH) -> TileMap:
+    """The level at `path`, or a walled arena of WORLD_SIZE if there is none.
+
+    Replays and the game must load the same level, since enemies path on it.
+    """
+    if os.path.exists(path):
+        try:
+            return load_level(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Failed to load level {path}: {e}")
+    return TileMap.arena(WORLD_SIZE[0] // TILE_SIZE, WORLD_SIZE[1] // TILE_SIZE, TILE_SIZE)
+
+class DemoSession:
+    """Simulation state of the character demo, advanced only through its inputs.
+
+    Everything that affects the outcome comes from step() arguments (frame
+    time, simulation actions, AI decision counts) or from RNGs seeded with
+    `seed`, so the same inputs replay to the same state. Rendering and UI
+    toggles live outside, in main.
+    """
+
+    def __init__(self, loader, seed: Optional[int] = None, tilemap: Optional[TileMap] = None, verbose: bool = True):
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.frame = 0
+
+        # The level enemies path on; the pathfinder follows its tile changes
+        if tilemap is None:
+            tilemap = TileMap.arena(WORLD_SIZE[0] // TILE_SIZE, WORLD_SIZE[1] // TILE_SIZE, TILE_SIZE)
+        self.tilemap = tilemap
+        self.pathfinder = PathfindingService(tilemap)
+        world_size = (tilemap.pixel_width, tilemap.pixel_height)
+        self.world_size = world_size
+
+        # Shared effect pools and enemies
+        self.particles = ParticleSystem(capacity=20000)
+        self.particles.seed(self.seed)
+        self.projectiles = ProjectileManager(bounds=(0, 0, world_size[0], world_size[1]))
+        self.status = StatusEffects()
+        self.enemies = pygame.sprite.Group()
+        self.ai_scheduler = AIScheduler(bucket_count=4, budget_ms=2.0)
+        # Hero HP, energy, animation and position changes, published once per frame
+        self.changes = ChangeBus()
+
+        # Sprites are drawn through a camera so off-screen ones are culled
+        self.all_sprites = CameraGroup()
+        self.heroes = []
+        for name, x, y in HERO_CONFIGS:
+            hero = loader.spawn_hero(name, x, y)
+            if hero:
+                hero.particles = self.particles
+                hero.projectiles = self.projectiles
+                hero.change_bus = self.changes
+                hero.status = self.status
+                hero.targets = self.enemies
+                self.all_sprites.add(hero)
+                self.heroes.append(hero)
+                if verbose:
+                    print(f"Spawned {name} at ({x}, {y})")
+
+        self.selected_hero_index = 0
+        self.animation_demo_timer = 0.0
+        # Held movement and the hero it is driving; heroes are only told when it changes
+        self.move_direction = (0, 0)
+        self.move_hero_index = 0
+
+    @property
+    def selected_hero(self):
+        return self.heroes[self.selected_hero_index] if self.heroes else None
+
+    def apply_input(self, pressed: int = 0, held: int = 0):
+        """Apply one frame of simulation actions (bit masks from player.input_map)."""
+        if not self.heroes:
+            return
+        if pressed & SELECT_PREV:
+            self.selected_hero_index = (self.selected_hero_index - 1) % len(self.heroes)
+        if pressed & SELECT_NEXT:
+            self.selected_hero_index = (self.selected_hero_index + 1) % len(self.heroes)
+        hero = self.selected_hero
+        if pressed & ATTACK:
+            hero.attack()
+        if pressed & LONG_ATTACK:
+            hero.attack("long")
+        if pressed & SPECIAL:
+            hero.attack("special")
+        if pressed & SUPER:
+            hero.attack("super")
+        if pressed & HURT:
+            hero.take_damage(20)
+        if pressed & SPAWN_WAVE:
+            self.spawn_enemy_wave()
+
+        direction = direction_of(held)
+        index = self.selected_hero_index
+        if direction != self.move_direction or index != self.move_hero_index:
+            if self.move_direction != (0, 0) and (direction == (0, 0) or index != self.move_hero_index):
+                self.heroes[self.move_hero_index].move(0, 0)
+            if direction != (0, 0):
+                hero.move(*direction)
+            self.move_direction = direction
+            self.move_hero_index = index
+
+    def spawn_enemy_wave(self, count: int = 40):
+        """Spawn enemies along the top and bottom edges of the world, inside its border tiles."""
+        margin = self.tilemap.tile_size * 1.5
+        for k in range(count):
+            y = margin if k % 2 else self.world_size[1] - margin
+            enemy = Enemy(margin + 30 * k, y, pathfinder=self.pathfinder)
+            self.enemies.add(enemy)
+            self.all_sprites.add(enemy)
+            self.ai_scheduler.add(enemy)
+
+    def update(self, dt: float):
+        """Auto-demo actions, sprites, effects and projectile hits."""
+        self.animation_demo_timer += dt
+        # Auto-demo animations every 5 seconds
+        if self.animation_demo_timer > 5.0:
+            if self.heroes:
+                rng = self.rng
+                demo_hero = rng.choice(self.heroes)
+                action = rng.choice(['attack', 'long', 'special', 'walk', 'hurt'])
+
+                if action == 'attack':
+                    demo_hero.attack()
+                elif action == 'long':
+                    demo_hero.attack("long")
+                elif action == 'special':
+                    demo_hero.attack("special")
+                elif action == 'walk':
+                    demo_hero.move(rng.choice([-1, 1]), 0)
+                elif action == 'hurt':
+                    demo_hero.take_damage(10)
+
+            self.animation_demo_timer = 0
+
+        self.status.update(dt)
+        self.all_sprites.update(dt)
+        self.particles.update(dt)
+        self.projectiles.update(dt, self.heroes + self.enemies.sprites())
+
+    def update_ai(self, dt: float, decision_limit: Optional[int] = None) -> int:
+        """Enemy steering and budgeted decisions; the last step of a frame.
+
+        Returns the decisions made, which replays record. The frame's hero
+        changes are published last, after all state has settled.
+        """
+        decisions = self.ai_scheduler.update(dt, self.heroes, decision_limit)
+        self.frame += 1
+        self.changes.flush()
+        return decisions
+
+    def step(self, dt: float, pressed: int = 0, held: int = 0, decision_limit: Optional[int] = None) -> int:
+        """Advance one frame: input, update, then AI. Returns the AI decisions made."""
+        self.apply_input(pressed, held)
+        self.update(dt)
+        return self.update_ai(dt, decision_limit)
+
+    def checksum(self) -> int:
+        """CRC of the simulation state, for spotting replay desyncs."""
+        state: List = [self.frame, self.selected_hero_index, self.animation_demo_timer, self.move_direction]
+        for hero in self.heroes:
+            # float() so equal values hash the same whether stored as int or float
+            state.append((float(hero.x), float(hero.y), float(hero.current_hp), float(hero.current_energy),
+                          hero.current_animation, hero.animation_frame, float(hero.attack_cooldown)))
+        for enemy in self.enemies:
+            state.append((enemy.x, enemy.y, float(enemy.hp)))
+        state.append(self.status.capture(self.heroes + self.enemies.sprites()))
+        state.append(capture_swings(self.heroes, self.enemies.sprites()))
+        crc = zlib.crc32(repr(state).encode('utf-8'))
+        crc = zlib.crc32(self.particles.pos[:self.particles.count].tobytes(), crc)
+        return zlib.crc32(self.projectiles.pos[:self.projectiles.count].tobytes(), crc)
@@ -0,0 +1,168 @@
+import time
+from array import array
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+class AIScheduler:
+    """Time-sliced enemy AI.
+
+    Enemies are spread round-robin over `bucket_count` buckets. Every tick
+    each enemy steers (cheap, always runs), and the enemies of one bucket
+    are queued for a decision (think: target selection, pathing). Queued
+    decisions are worked off under a per-frame millisecond budget; whatever
+    does not fit waits for the next frame, so a spike in enemy count raises
+    decision latency instead of frame time.
+
+    Usage:
+        scheduler.add(enemy)
+        scheduler.update(dt, targets)   # once per frame
+        print(scheduler.format_report())
+    """
+
+    def __init__(self, bucket_count: int = 4, budget_ms: float = 2.0, history: int = 240,
+                 decide: Optional[Callable] = None):
+        self.bucket_count = max(1, bucket_count)
+        self.budget_ms = budget_ms
+        self.history = history
+        # decide(enemy, targets, frame); defaults to enemy.think(targets, frame)
+        self.decide = decide or (lambda enemy, targets, frame: enemy.think(targets, frame))
+
+        self.buckets: List[List] = [[] for _ in range(self.bucket_count)]
+        self._next_bucket = 0
+        self._pending: Deque[Tuple[object, int]] = deque()
+        self._queued = set()
+        self.frame = 0
+
+        # Per-frame ring buffers for the budget report
+        self._think_ms = array('d', bytes(8 * history))
+        self._steer_ms = array('d', bytes(8 * history))
+        self._decisions = array('l', bytes(array('l').itemsize * history))
+        self._backlog = array('l', bytes(array('l').itemsize * history))
+        self._latency_total = 0
+        self._latency_max = 0
+        self._decision_count = 0
+        # Moving average of one decision's cost, used to stop before overrunning
+        self._decision_cost = 0.0
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def add(self, enemy):
+        """Register an enemy; it gets its first decision as soon as the budget allows."""
+        self.buckets[self._next_bucket].append(enemy)
+        self._next_bucket = (self._next_bucket + 1) % self.bucket_count
+        self._enqueue(enemy)
+
+    def remove(self, enemy):
+        """Unregister an enemy (dead enemies are also dropped automatically)."""
+        for bucket in self.buckets:
+            if enemy in bucket:
+                bucket.remove(enemy)
+                break
+
+    def clear(self):
+        """Drop every enemy and pending decision."""
+        for bucket in self.buckets:
+            bucket.clear()
+        self._pending.clear()
+        self._queued.clear()
+
+    def _enqueue(self, enemy):
+        key = id(enemy)
+        if key not in self._queued:
+            self._queued.add(key)
+            self._pending.append((enemy, self.frame))
+
+    def update(self, dt: float, targets: Sequence, decision_limit: Optional[int] = None) -> int:
+        """Steer every enemy, queue this frame's bucket and run decisions within budget.
+
+        With decision_limit set, exactly that many queued decisions run (or
+        all of them, if fewer are queued) regardless of time, so a replay can
+        reproduce a recorded frame. Returns the number of decisions made.
+        """
+        perf_counter = time.perf_counter
+        slot = self.frame % self.history
+
+        start = perf_counter()
+        for bucket in self.buckets:
+            for enemy in bucket:
+                enemy.steer(dt)
+        steer_end = perf_counter()
+
+        # Queue the bucket whose turn it is, dropping enemies that have died
+        index = self.frame % self.bucket_count
+        bucket = [enemy for enemy in self.buckets[index] if enemy.is_alive()]
+        self.buckets[index] = bucket
+        for enemy in bucket:
+            self._enqueue(enemy)
+
+        # Work off queued decisions while the next one is expected to fit the
+        # budget (always at least one, so the queue keeps moving)
+        pending = self._pending
+        decide = self.decide
+        cost = self._decision_cost
+        decisions = 0
+        think_start = now = perf_counter()
+        deadline = think_start + self.budget_ms / 1000.0
+        while pending and decision_limit != 0:
+            enemy, queued_frame = pending.popleft()
+            self._queued.discard(id(enemy))
+            if not enemy.is_alive():
+                continue
+            decide(enemy, targets, self.frame)
+            decisions += 1
+            latency = self.frame - queued_frame
+            self._latency_total += latency
+            if latency > self._latency_max:
+                self._latency_max = latency
+            previous, now = now, perf_counter()
+            cost += (now - previous - cost) * 0.05
+            if decision_limit is not None:
+                if decisions >= decision_limit:
+                    break
+            elif now + cost >= deadline:
+                break
+        self._decision_cost = cost
+
+        self._decision_count += decisions
+        self._steer_ms[slot] = (steer_end - start) * 1000.0
+        self._think_ms[slot] = (now - think_start) * 1000.0
+        self._decisions[slot] = decisions
+        self._backlog[slot] = len(pending)
+        self.frame += 1
+        return decisions
+
+    def report(self) -> Dict[str, float]:
+        """Budget adherence over the recorded history."""
+        count = min(self.frame, self.history)
+        if count == 0:
+            return {"frames": 0}
+        first = self.frame - count
+        slots = [(first + i) % self.history for i in range(count)]
+        think = sorted(self._think_ms[i] for i in slots)
+        over = sum(1 for ms in think if ms > self.budget_ms)
+        return {
+            "frames": count,
+            "enemies": len(self),
+            "budget_ms": self.budget_ms,
+            "think_mean_ms": sum(think) / count,
+            "think_p95_ms": think[min(count - 1, int(count * 0.95))],
+            "think_max_ms": think[-1],
+            "steer_mean_ms": sum(self._steer_ms[i] for i in slots) / count,
+            "over_budget_frames": over,
+            "over_budget_percent": 100.0 * over / count,
+            "decisions_per_frame": sum(self._decisions[i] for i in slots) / count,
+            "backlog": self._backlog[slots[-1]],
+            "max_backlog": max(self._backlog[i] for i in slots),
+            "mean_latency_frames": self._latency_total / self._decision_count if self._decision_count else 0.0,
+            "max_latency_frames": self._latency_max,
+        }
+
+    def format_report(self) -> str:
+        """One-line summary for the HUD or console."""
+        r = self.report()
+        if not r["frames"]:
+            return "AI: idle"
+        return (f"AI: {r['enemies']} enemies, think {r['think_mean_ms']:.2f}/{r['budget_ms']:.1f} ms "
+                f"(p95 {r['think_p95_ms']:.2f}), over budget {r['over_budget_percent']:.0f}%, "
+                f"backlog {r['backlog']}, latency {r['mean_latency_frames']:.1f} frames")
@@ -0,0 +1,98 @@
+import math
+import pygame
+from typing import Optional, Sequence, Tuple
+
+def _placeholder_image() -> pygame.Surface:
+    """Magenta triangle-in-a-box, the same look as AssetManager's enemy_basic."""
+    surface = pygame.Surface((32, 32), pygame.SRCALPHA)
+    pygame.draw.rect(surface, (255, 0, 255), (0, 0, 32, 32), 2)
+    pygame.draw.polygon(surface, (255, 0, 255), [(16, 8), (24, 24), (8, 24)], 2)
+    return surface
+
+class Enemy(pygame.sprite.Sprite):
+    """A basic chasing enemy.
+
+    Behaviour is split in two so an AI scheduler can time-slice it:
+    think() makes the expensive decisions (target selection, goal choice)
+    and may run only every few frames; steer() is cheap and runs every tick,
+    moving toward the last chosen goal.
+    """
+
+    _shared_image: Optional[pygame.Surface] = None
+
+    def __init__(self, x: float, y: float, image: Optional[pygame.Surface] = None,
+                 hp: int = 30, speed: float = 80.0, sight_range: float = 900.0, pathfinder=None):
+        super().__init__()
+        if image is None:
+            if Enemy._shared_image is None:
+                Enemy._shared_image = _placeholder_image()
+            image = Enemy._shared_image
+        self.image = image
+        self.rect = self.image.get_rect(center=(int(x), int(y)))
+
+        self.x = float(x)
+        self.y = float(y)
+        self.hp = hp
+        self.max_hp = hp
+        self.speed = speed
+        self.sight_range = sight_range
+        # Optional levels.pathfinding.PathfindingService; without one enemies move in straight lines
+        self.pathfinder = pathfinder
+
+        # Decision state written by think(), read by steer()
+        self.target = None
+        self.goal: Optional[Tuple[float, float]] = None
+        self.last_think_frame = -1
+
+    def think(self, targets: Sequence, frame: int = 0):
+        """Pick the nearest living target in sight and head for it."""
+        best = None
+        best_distance = self.sight_range * self.sight_range
+        for target in targets:
+            if hasattr(target, "is_alive") and not target.is_alive():
+                continue
+            dx = target.rect.centerx - self.x
+            dy = target.rect.centery - self.y
+            distance = dx * dx + dy * dy
+            if distance < best_distance:
+                best = target
+                best_distance = distance
+        self.target = best
+        self.goal = (float(best.rect.centerx), float(best.rect.centery)) if best is not None else None
+        self.last_think_frame = frame
+
+    def steer(self, dt: float):
+        """Move toward the current goal, stopping on arrival.
+
+        With a pathfinder the move follows the shared flow field toward the
+        goal's tile, so walls are routed around without a per-enemy search.
+        """
+        if self.goal is None:
+            return
+        dx = self.goal[0] - self.x
+        dy = self.goal[1] - self.y
+        distance = math.hypot(dx, dy)
+        step = self.speed * dt
+        if distance <= step:
+            self.x, self.y = self.goal
+        elif self.pathfinder is not None:
+            ux, uy = self.pathfinder.direction_at_pixel(self.goal, self.x, self.y)
+            self.x += ux * step
+            self.y += uy * step
+        else:
+            self.x += dx / distance * step
+            self.y += dy / distance * step
+        self.rect.center = (int(self.x), int(self.y))
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return self.x, self.y
+
+    def take_damage(self, damage: float):
+        """Apply damage; the enemy removes itself from its groups when it dies."""
+        self.hp = max(0, self.hp - damage)
+        if self.hp <= 0:
+            self.kill()
+
+    def is_alive(self) -> bool:
+        return self.hp > 0
@@ -0,0 +1,230 @@
+import json
+import os
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Main loop stages, in the order they run each frame
+DEFAULT_STAGES = ["events", "update", "ai", "background", "sprites", "effects", "hud", "render", "flip"]
+
+# Overlay colours per stage (neon palette, cycled for extra stages)
+STAGE_COLORS = [
+    (0, 255, 255),    # cyan
+    (255, 0, 255),    # magenta
+    (128, 0, 255),    # purple
+    (0, 255, 0),      # green
+    (255, 255, 0),    # yellow
+    (255, 128, 0),    # orange
+    (255, 20, 147),   # pink
+    (0, 191, 255),    # blue
+]
+
+class _StageTimer:
+    """Reusable context manager that times one stage (no per-frame allocation)."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+class FrameProfiler:
+    """Records per-frame, per-stage timings in ring buffers.
+
+    Usage:
+        profiler.begin_frame()
+        with profiler.stage("update"):
+            all_sprites.update(dt)
+        profiler.end_frame()
+    """
+
+    def __init__(self, stages: Optional[List[str]] = None, history: int = 240,
+                 budget_ms: float = 1000.0 / 60):
+        self.history = history
+        self.budget_ms = budget_ms
+        self.show_overlay = False
+        self.frame_count = 0
+        self.stages: List[str] = []
+
+        # Ring buffers: stage start offset and duration (ms) relative to frame start
+        self._offsets: Dict[str, array] = {}
+        self._durations: Dict[str, array] = {}
+        self._frame_starts = array('d', bytes(8 * history))
+        self._frame_totals = array('d', bytes(8 * history))
+        self._timers: Dict[str, _StageTimer] = {}
+        self._index = 0
+        self._in_frame = False
+        self._frame_start = 0.0
+        self._epoch = time.perf_counter()
+
+        # Overlay state: the graph scrolls one column per frame
+        self._graph = None
+        self._legend: List = []
+
+        for name in stages or DEFAULT_STAGES:
+            self.add_stage(name)
+
+    def add_stage(self, name: str):
+        """Register a stage so it gets ring buffers and an overlay colour."""
+        if name in self._durations:
+            return
+        self.stages.append(name)
+        self._offsets[name] = array('d', bytes(8 * self.history))
+        self._durations[name] = array('d', bytes(8 * self.history))
+        self._timers[name] = _StageTimer(self, name)
+
+    def begin_frame(self):
+        """Start a new frame, clearing its ring buffer slot."""
+        self._index = self.frame_count % self.history
+        for name in self.stages:
+            self._durations[name][self._index] = 0.0
+        self._in_frame = True
+        self._frame_start = time.perf_counter()
+        self._frame_starts[self._index] = (self._frame_start - self._epoch) * 1000.0
+
+    def end_frame(self):
+        """Finish the current frame and record its total time."""
+        self._frame_totals[self._index] = (time.perf_counter() - self._frame_start) * 1000.0
+        self._in_frame = False
+        self.frame_count += 1
+        if self.show_overlay and self._graph is not None:
+            self._draw_graph_column(self._index)
+
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager timing a stage of the current frame."""
+        timer = self._timers.get(name)
+        if timer is None:
+            self.add_stage(name)
+            timer = self._timers[name]
+        return timer
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function as the given stage."""
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+        return decorator
+
+    def record(self, name: str, start: float, end: float):
+        """Record a stage interval (perf_counter seconds).
+
+        A stage entered several times in one frame accumulates its durations
+        and keeps the offset of its first entry.
+        """
+        durations = self._durations[name]
+        if durations[self._index] == 0.0:
+            self._offsets[name][self._index] = (start - self._frame_start) * 1000.0
+        durations[self._index] += (end - start) * 1000.0
+
+    def _recorded_slots(self) -> List[int]:
+        """Ring buffer slots of completed frames, oldest first."""
+        # While a frame is in progress it occupies the oldest slot
+        count = min(self.frame_count, self.history - 1 if self._in_frame else self.history)
+        first = self.frame_count - count
+        return [(first + i) % self.history for i in range(count)]
+
+    def averages(self) -> Dict[str, float]:
+        """Average milliseconds per stage over the recorded history."""
+        slots = self._recorded_slots()
+        if not slots:
+            return {name: 0.0 for name in self.stages}
+        return {name: sum(self._durations[name][i] for i in slots) / len(slots)
+                for name in self.stages}
+
+    def worst_frames(self, count: int = 5) -> List[Tuple[float, str, float]]:
+        """The slowest recorded frames as (total ms, slowest stage, stage ms)."""
+        worst = []
+        for i in sorted(self._recorded_slots(), key=lambda i: self._frame_totals[i], reverse=True)[:count]:
+            stage = max(self.stages, key=lambda name: self._durations[name][i])
+            worst.append((self._frame_totals[i], stage, self._durations[stage][i]))
+        return worst
+
+    def dump_chrome_trace(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the recorded frames as Chrome trace-format JSON (chrome://tracing, Perfetto)."""
+        if path is None:
+            path = time.strftime("frame_trace_%Y%m%d_%H%M%S.json")
+
+        events = [{"name": "process_name", "ph": "M", "pid": os.getpid(),
+                   "args": {"name": "Neon Knights"}}]
+        for slot in self._recorded_slots():
+            frame_ts = self._frame_starts[slot] * 1000.0  # ms -> us
+            events.append({"name": "frame", "cat": "frame", "ph": "X", "pid": os.getpid(), "tid": 0,
+                           "ts": frame_ts, "dur": self._frame_totals[slot] * 1000.0})
+            for name in self.stages:
+                duration = self._durations[name][slot]
+                if duration > 0.0:
+                    events.append({"name": name, "cat": "stage", "ph": "X", "pid": os.getpid(), "tid": 0,
+                                   "ts": frame_ts + self._offsets[name][slot] * 1000.0,
+                                   "dur": duration * 1000.0})
+
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            print(f"Saved frame trace ({len(self._recorded_slots())} frames) to {path}")
+            return path
+        except OSError as e:
+            print(f"Failed to save frame trace {path}: {e}")
+            return None
+
+    def toggle_overlay(self):
+        """Show or hide the overlay graph."""
+        self.show_overlay = not self.show_overlay
+        self._graph = None
+
+    def draw_overlay(self, surface, font, x: int = 10, y: int = 30, height: int = 100):
+        """Draw a scrolling stacked graph of stage times plus a legend with averages."""
+        import pygame
+
+        if self._graph is None:
+            self._graph = pygame.Surface((self.history, height))
+            self._graph.fill((10, 10, 20))
+            for slot in self._recorded_slots():
+                self._draw_graph_column(slot)
+
+        # Legend text changes slowly; re-render twice a second rather than every frame
+        if not self._legend or self.frame_count % 30 == 0:
+            averages = self.averages()
+            self._legend = [font.render(f"{name}: {averages[name]:.2f} ms", True,
+                                        STAGE_COLORS[i % len(STAGE_COLORS)])
+                            for i, name in enumerate(self.stages)]
+
+        surface.blit(self._graph, (x, y))
+        surface.blits([(text, (x + self.history + 8, y + i * (text.get_height() + 2)))
+                       for i, text in enumerate(self._legend)], doreturn=False)
+
+    def _draw_graph_column(self, slot: int):
+        """Scroll the graph left by one pixel and draw the newest frame's stacked bar."""
+        import pygame
+
+        graph = self._graph
+        height = graph.get_height()
+        # Full height covers two frame budgets; the line marks one budget
+        scale = height / (self.budget_ms * 2)
+        column = graph.get_width() - 1
+
+        graph.scroll(-1, 0)
+        pygame.draw.line(graph, (10, 10, 20), (column, 0), (column, height))
+
+        bottom = height
+        for i, name in enumerate(self.stages):
+            bar = self._durations[name][slot] * scale
+            if bar >= 0.5:
+                top = max(0, bottom - int(round(bar)))
+                pygame.draw.line(graph, STAGE_COLORS[i % len(STAGE_COLORS)], (column, bottom - 1), (column, top))
+                bottom = top
+
+        budget_y = height - int(self.budget_ms * scale)
+        graph.set_at((column, budget_y), (255, 255, 255))
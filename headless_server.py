@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Dedicated headless match server: runs many independent matches without
+pygame, a display or any surfaces, and reports tick rate and CPU per match.
+
+Each match is a handful of HeroSimulation heroes under simple bot control
+(close in, attack, regenerate energy). Attacks resolve through the heroes'
+compiled abilities, exactly as in the game: every other hero in a match is
+a target, and whoever is inside an attack's hit shape takes its damage. Matches in one process share an
+asyncio loop; --workers spreads them over a process pool, one loop per
+worker process.
+
+Usage:
+    python headless_server.py --matches 48 --seconds 20
+    python headless_server.py --matches 96 --workers 4 --seconds 20
+    python headless_server.py --matches 48 --unpaced     # as fast as possible
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from character_loader import CharacterDataLoader
+
+# Horizontal gap bots close to before swinging; vertically they line up with their target
+STANDOFF = 40.0
+ENERGY_REGEN = 5.0  # per second
+
+class Match:
+    """One match: heroes fight until one is left or the time limit is reached."""
+
+    def __init__(self, match_id: int, loader: CharacterDataLoader, seed: int, heroes: int = 4,
+                 world=(1200, 800), time_limit: float = 120.0):
+        self.match_id = match_id
+        self.loader = loader
+        self.hero_count = heroes
+        self.world = world
+        self.reset(seed, time_limit)
+
+    def reset(self, seed: int, time_limit: float):
+        """Start a new round with freshly spawned heroes."""
+        self.time_limit = time_limit
+        self.time = 0.0
+        self.finished = False
+        rng = random.Random(seed)
+        loader = self.loader
+        names = rng.sample(loader.get_hero_names(), min(self.hero_count, len(loader.heroes_data)))
+        self.heroes = []
+        for name in names:
+            hero = loader.spawn_simulated_hero(name, rng.uniform(0, self.world[0]), rng.uniform(0, self.world[1]))
+            hero.announce = False
+            hero.targets = self.heroes
+            self.heroes.append(hero)
+
+    def step(self, dt: float):
+        """Advance one tick: bots choose moves and attacks, then every hero updates."""
+        alive = [hero for hero in self.heroes if hero.is_alive()]
+        for hero in alive:
+            target = None
+            best = math.inf
+            for other in alive:
+                if other is not hero and other.is_alive():
+                    distance = math.hypot(other.x - hero.x, other.y - hero.y)
+                    if distance < best:
+                        target, best = other, distance
+            if target is None:
+                hero.move(0, 0)
+                continue
+            dx = target.x - hero.x
+            dy = target.y - hero.y
+            facing_right = dx >= 0
+            if hero.abilities["short"].shape.contains(dx, dy, facing_right):
+                # In reach: face the target and swing; the ability decides whom it hits
+                hero.move(0, 0)
+                hero.facing_right = facing_right
+                hero.attack()
+            else:
+                step_x = (dx > 0) - (dx < 0) if abs(dx) > STANDOFF else 0
+                step_y = (dy > 4) - (dy < -4)
+                if not (step_x or step_y):
+                    # Lined up but too close for the swing's arc: back off a step
+                    step_x = -1 if facing_right else 1
+                hero.move(step_x, step_y)
+            hero.restore_energy(ENERGY_REGEN * dt)
+        for hero in self.heroes:
+            hero.update(dt)
+
+        self.time += dt
+        survivors = sum(1 for hero in self.heroes if hero.is_alive())
+        if survivors <= 1 or self.time >= self.time_limit:
+            self.finished = True
+
+    def winner(self) -> Optional[str]:
+        survivors = [hero.name for hero in self.heroes if hero.is_alive()]
+        return survivors[0] if len(survivors) == 1 else None
+
+async def run_match(match: Match, seconds: float, tick_rate: int = 60, paced: bool = True) -> Dict:
+    """Host a match slot on the current event loop for `seconds` of play.
+
+    A match that ends early is reset, like a server starting the next one.
+
+    Paced runs hold `tick_rate`; unpaced runs go as fast as the loop
+    allows, yielding between ticks so matches interleave.
+    """
+    loop = asyncio.get_running_loop()
+    dt = 1.0 / tick_rate
+    thread_time = time.thread_time
+    started = loop.time()
+    ticks = 0
+    cpu = 0.0
+    rounds = 1
+    sim_time = 0.0
+    while True:
+        cpu_start = thread_time()
+        match.step(dt)
+        cpu += thread_time() - cpu_start
+        ticks += 1
+        sim_time += dt
+        if sim_time >= seconds:
+            break
+        if match.finished:
+            match.reset(match.match_id * 7919 + rounds, seconds - sim_time)
+            rounds += 1
+        if paced:
+            delay = started + ticks * dt - loop.time()
+            await asyncio.sleep(delay if delay > 0 else 0)
+        else:
+            await asyncio.sleep(0)
+    wall = loop.time() - started
+    return {
+        "match_id": match.match_id,
+        "ticks": ticks,
+        "rounds": rounds,
+        "wall_seconds": wall,
+        "tick_rate": ticks / wall if wall > 0 else 0.0,
+        "cpu_ms_per_tick": cpu * 1000.0 / ticks if ticks else 0.0,
+        "cpu_percent": 100.0 * cpu / wall if wall > 0 else 0.0,
+    }
+
+_worker_loader: Optional[CharacterDataLoader] = None
+
+def _loader() -> CharacterDataLoader:
+    """The roster, loaded once per process."""
+    global _worker_loader
+    if _worker_loader is None:
+        _worker_loader = CharacterDataLoader()
+    return _worker_loader
+
+async def host_matches(match_ids: List[int], seconds: float, tick_rate: int = 60, paced: bool = True,
+                       heroes: int = 4) -> List[Dict]:
+    """Run matches concurrently on one event loop."""
+    loader = _loader()
+    matches = [Match(match_id, loader, match_id * 7919, heroes, time_limit=seconds) for match_id in match_ids]
+    return await asyncio.gather(*(run_match(match, seconds, tick_rate, paced) for match in matches))
+
+def _host_in_worker(match_ids: List[int], seconds: float, tick_rate: int, paced: bool, heroes: int) -> List[Dict]:
+    return asyncio.run(host_matches(match_ids, seconds, tick_rate, paced, heroes))
+
+def run_server(matches: int, seconds: float, workers: int = 1, tick_rate: int = 60, paced: bool = True,
+               heroes: int = 4) -> List[Dict]:
+    """Host `matches` matches for `seconds`, in-process or over a pool of worker processes."""
+    match_ids = list(range(1, matches + 1))
+    if workers <= 1:
+        return _host_in_worker(match_ids, seconds, tick_rate, paced, heroes)
+    shares = [match_ids[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_host_in_worker, share, seconds, tick_rate, paced, heroes) for share in shares if share]
+        return [report for future in futures for report in future.result()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Host headless Neon Knights matches and report their cost")
+    parser.add_argument("--matches", type=int, default=24)
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long to host them")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (1 = this process only)")
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--heroes", type=int, default=4, help="heroes per match")
+    parser.add_argument("--unpaced", action="store_true", help="tick as fast as possible instead of in real time")
+    parser.add_argument("--per-match", action="store_true", help="print a line per match")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    reports = run_server(args.matches, args.seconds, max(1, args.workers), args.tick_rate,
+                         not args.unpaced, args.heroes)
+    wall = time.perf_counter() - start
+
+    if args.per_match:
+        for r in sorted(reports, key=lambda r: r["match_id"]):
+            print(f"  match {r['match_id']:3d}: {r['tick_rate']:6.1f} ticks/s, "
+                  f"{r['cpu_ms_per_tick']:.3f} ms CPU per tick, {r['cpu_percent']:.1f}% of a core, "
+                  f"{r['rounds']} rounds")
+    count = len(reports)
+    tick_rates = sorted(r["tick_rate"] for r in reports)
+    cpu_ms = sum(r["cpu_ms_per_tick"] for r in reports) / count
+    cpu_percent = sum(r["cpu_percent"] for r in reports) / count
+    print(f"Hosted {count} matches for {wall:.1f} s on {max(1, args.workers)} process(es) "
+          f"({os.cpu_count()} CPUs available)")
+    print(f"Tick rate: {tick_rates[count // 2]:.1f}/s median, {tick_rates[0]:.1f}/s worst "
+          f"(target {'unpaced' if args.unpaced else args.tick_rate})")
+    print(f"CPU per match: {cpu_ms:.3f} ms per tick, {cpu_percent:.2f}% of a core")
+    if not args.unpaced and cpu_percent > 0:
+        print(f"Estimated capacity: ~{int(100.0 / cpu_percent)} matches per core at {args.tick_rate} Hz")
+    if args.workers <= 1:
+        print(f"Process CPU: {time.process_time() - cpu_start:.2f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,50 @@
 import pygame
-import json
 import os
-from typing import Dict, List, Optional, Tuple
-from character_data import HeroData, HeroStats, HeroAttacks
+from typing import Dict, List, Tuple
+from character_data import HeroData
+from combat.frame_boxes import boxes_for_frame, load_sheet_boxes
+from combat.hitboxes import CollisionFrame, build_collision_frame, overlaps, shape_mask
+from hero_simulation import HeroSimulation
 
-class Hero(pygame.sprite.Sprite):
-    """Hero entity class for spawning and managing heroes in the game."""
+_label_font = None
+
+def _ensure_subsystems():
+    """Start only the SDL subsystems heroes need (fonts for placeholder labels)."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+def _placeholder_label_font() -> pygame.font.Font:
+    """Font for the name on placeholder sprites, opened once rather than per sprite."""
+    global _label_font
+    if _label_font is None:
+        _label_font = pygame.font.Font(None, 12)
+    return _label_font
+
+class Hero(HeroSimulation, pygame.sprite.Sprite):
+    """Hero entity class for spawning and managing heroes in the game.
+    
+    Game state and rules come from HeroSimulation; this class adds the
+    sprites, image and rect used for drawing.
+    """
     
     def __init__(self, hero_data: HeroData, x: int = 0, y: int = 0):
-        super().__init__()
-        
-        # Store hero data
-        self.hero_data = hero_data
-        self.name = hero_data.name
-        self.backstory = hero_data.backstory
-        self.attacks = hero_data.attacks
-        self.gender = hero_data.gender
-        
-        # Current stats (can be modified during gameplay)
-        self.current_hp = hero_data.stats.hp
-        self.max_hp = hero_data.stats.hp
-        self.speed = hero_data.stats.speed
-        self.strength = hero_data.stats.strength
-        self.current_energy = hero_data.stats.energy
-        self.max_energy = hero_data.stats.energy
-        
-        # Position and movement
-        self.x = x
-        self.y = y
-        self.velocity_x = 0
-        self.velocity_y = 0
+        pygame.sprite.Sprite.__init__(self)
+        _ensure_subsystems()
+        HeroSimulation.__init__(self, hero_data, x, y)
         
         # Advanced character design features
-        self.body_type = self._determine_body_type()
         self.sprite_variants = self._get_sprite_variants()
-        self.animation_sets = self._initialize_animation_sets()
         
         # Animation and sprite handling
         self.sprite_sheets = {}
-        self.current_animation = "idle"
-        self.animation_frame = 0
-        self.animation_timer = 0
-        self.animation_speed = 100  # milliseconds per frame
+        self._flipped_frames: Dict[Tuple[str, int], pygame.Surface] = {}
+        
+        # Masks of each animation frame's hitboxes/hurtboxes, keyed (animation, frame, facing right)
+        self._collision: Dict[Tuple[str, int, bool], CollisionFrame] = {}
         
         # Load sprites based on gender
         self._load_sprites()
-        
-        # Combat state
-        self.is_attacking = False
-        self.attack_cooldown = 0
-        self.facing_right = True
+        self._build_collision()
         
         # Set initial sprite (after facing_right is initialized)
         self.image = self._get_current_sprite()
@@ -64,6 +59,8 @@ class Hero(pygame.sprite.Sprite):
         
         # Animation states to load
         animations = ["idle", "walk", "attack", "special", "hurt", "death"]
+        # Animations without a sheet share one placeholder, drawn on first need
+        placeholder = None
         
         for animation in animations:
             sprite_path = f"{base_path}_{animation}.png"
@@ -73,11 +70,71 @@ class Hero(pygame.sprite.Sprite):
                 try:
                     sprite_sheet = pygame.image.load(sprite_path).convert_alpha()
                     self.sprite_sheets[animation] = self._load_sprite_frames(sprite_sheet)
+                    # Hitboxes drawn for this sheet replace the defaults
+                    sheet_boxes = load_sheet_boxes(sprite_path)
+                    if sheet_boxes is not None:
+                        self.frame_boxes[animation] = sheet_boxes
+                    continue
                 except pygame.error:
-                    self.sprite_sheets[animation] = [self._create_placeholder_sprite()]
-            else:
-                # Create placeholder sprite with gender-specific color
-                self.sprite_sheets[animation] = [self._create_placeholder_sprite()]
+                    pass
+            # Create placeholder sprite with gender-specific color
+            if placeholder is None:
+                placeholder = self._create_placeholder_sprite()
+            self.sprite_sheets[animation] = [placeholder]
+    
+    def _build_collision(self):
+        """Flip every frame and precompute collision masks for each animation frame and facing, once.
+        
+        Images and boxes can have different frame counts (a single placeholder
+        image with per-frame hitboxes), so each animation frame pairs its
+        image with its boxes; identical pairs share one CollisionFrame.
+        """
+        for animation, frames in self.sprite_sheets.items():
+            boxes = self.frame_boxes.get(animation, [])
+            for index, frame in enumerate(frames):
+                if (animation, index) not in self._flipped_frames:
+                    self._flipped_frames[(animation, index)] = pygame.transform.flip(frame, True, False)
+            count = max(len(frames), len(boxes), self.animation_sets.get(animation, {}).get('frames', 1))
+            built = {}
+            for index in range(count):
+                image_index = index % len(frames)
+                frame_boxes = boxes_for_frame(boxes, index)
+                for facing_right in (True, False):
+                    key = (image_index, frame_boxes, facing_right)
+                    collision = built.get(key)
+                    if collision is None:
+                        image = frames[image_index] if facing_right else self._flipped_frames[(animation, image_index)]
+                        collision = built[key] = build_collision_frame(image, frame_boxes, facing_right)
+                    self._collision[(animation, index, facing_right)] = collision
+    
+    @property
+    def collision_frame(self) -> CollisionFrame:
+        """Hitboxes and hurtboxes of the frame being shown, relative to rect.topleft."""
+        collision = self._collision.get((self.current_animation, self.animation_frame, self.facing_right))
+        if collision is None:
+            # Animations without sprites are drawn with the idle sheet
+            collision = self._collision[("idle", 0, self.facing_right)]
+        return collision
+    
+    def _strike(self, spec, struck) -> List:
+        """Pixel-accurate strike area test.
+        
+        The area is the ability's shape, or the current frame's hitboxes for
+        abilities without one, as in HeroSimulation; each target is
+        rect-tested first, and only those that pass get one mask overlap
+        against their hurtbox mask.
+        """
+        if spec.shape.kind != "none":
+            area_mask, area_rect = shape_mask(spec.shape, self.facing_right)
+            area_rect = area_rect.move(self.rect.center)
+        else:
+            frame = self.collision_frame
+            if frame.hit_mask is None:
+                return []
+            area_mask, area_rect = frame.hit_mask, frame.hit_bounds.move(self.rect.topleft)
+        return [target for target in self.targets
+                if target is not self and target not in struck and target.is_alive()
+                and overlaps(area_mask, area_rect, target)]
     
     def _load_sprite_frames(self, sprite_sheet: pygame.Surface) -> List[pygame.Surface]:
         """Load individual frames from a sprite sheet."""
@@ -85,27 +142,6 @@ class Hero(pygame.sprite.Sprite):
         # This can be extended to handle multi-frame animations
         return [sprite_sheet]
     
-    def _determine_body_type(self):
-        """Determine body type based on gender and character attributes"""
-        if self.gender.lower() == 'female':
-            # Female body types with distinguishable features
-            strength = self.strength
-            if strength > 80:
-                return 'athletic_female'  # Muscular but feminine
-            elif strength > 60:
-                return 'fit_female'      # Toned and curvy
-            else:
-                return 'slender_female'  # Graceful and elegant
-        else:
-            # Male body types
-            strength = self.strength
-            if strength > 80:
-                return 'muscular_male'
-            elif strength > 60:
-                return 'athletic_male'
-            else:
-                return 'lean_male'
-    
     def _get_sprite_variants(self):
         """Get sprite variants for different body types and animations"""
         variants = {
@@ -124,16 +160,6 @@ class Hero(pygame.sprite.Sprite):
         
         return variants
     
-    def _initialize_animation_sets(self):
-        """Initialize animation frame sets for different actions"""
-        return {
-            'idle': {'frames': 4, 'loop': True, 'speed': 200},
-            'walk': {'frames': 6, 'loop': True, 'speed': 120},
-            'attack': {'frames': 8, 'loop': False, 'speed': 80},
-            'hurt': {'frames': 3, 'loop': False, 'speed': 100},
-            'victory': {'frames': 6, 'loop': True, 'speed': 150}
-        }
-    
     def _create_placeholder_sprite(self) -> pygame.Surface:
         """Create a placeholder sprite with gender-specific appearance."""
         if self.gender.lower() == 'female':
@@ -161,6 +187,7 @@ class Hero(pygame.sprite.Sprite):
         else:
             primary_color = (255, 100, 150)   # Default pink
             secondary_color = (200, 200, 200) # Light gray
+        self.effect_color = primary_color
         
         # Draw female body silhouette with curves
         # Head (smaller, more oval)
@@ -190,7 +217,7 @@ class Hero(pygame.sprite.Sprite):
         pygame.draw.circle(sprite, (255, 200, 200), (38, 35), 6)
         
         # Add hero name text
-        font = pygame.font.Font(None, 12)
+        font = _placeholder_label_font()
         text = font.render(self.name[:8], True, (255, 255, 255))
         sprite.blit(text, (2, 2))
         
@@ -219,6 +246,7 @@ class Hero(pygame.sprite.Sprite):
         else:
             primary_color = (100, 150, 255)   # Default blue
             secondary_color = (200, 200, 200) # Light gray
+        self.effect_color = primary_color
         
         # Draw male body silhouette (broader, more angular)
         # Head (larger, more square)
@@ -242,7 +270,7 @@ class Hero(pygame.sprite.Sprite):
         pygame.draw.rect(sprite, (200, 180, 160), (18, 35, 28, 20))
         
         # Add hero name text
-        font = pygame.font.Font(None, 12)
+        font = _placeholder_label_font()
         text = font.render(self.name[:8], True, (255, 255, 255))
         sprite.blit(text, (2, 2))
         
@@ -256,174 +284,23 @@ class Hero(pygame.sprite.Sprite):
                 frame_index = self.animation_frame % len(frames)
                 sprite = frames[frame_index]
                 
-                # Flip sprite if facing left
+                # Flip sprite if facing left (flipped frames are made once, at load, so
+                # the image is a stable surface that effect and mask caches can key on)
                 if not self.facing_right:
-                    sprite = pygame.transform.flip(sprite, True, False)
+                    sprite = self._flipped_frames[(self.current_animation, frame_index)]
                 
                 return sprite
         
         # Fallback to idle animation
         return self.sprite_sheets.get("idle", [self._create_placeholder_sprite()])[0]
     
-    def update(self, dt: float):
-        """Update hero state, animations, and position."""
-        # Update attack cooldown
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= dt
-            if self.attack_cooldown <= 0:
-                self.is_attacking = False
-                self.set_animation('idle')
-        
-        # Update animation based on current state
-        self._update_animation(dt)
-        
-        # Update position
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.y)
-    
-    def _update_animation(self, dt: float):
-        """Update character animation based on current state"""
-        animation_info = self.animation_sets[self.current_animation]
-        
-        # Update animation timer
-        self.animation_timer += dt * 1000  # Convert to milliseconds
-        
-        # Check if it's time to advance frame
-        if self.animation_timer >= animation_info['speed']:
-            self.animation_frame += 1
-            self.animation_timer = 0
-            
-            # Handle animation looping
-            if self.animation_frame >= animation_info['frames']:
-                if animation_info['loop']:
-                    self.animation_frame = 0
-                else:
-                    # Non-looping animation finished
-                    self.animation_frame = animation_info['frames'] - 1
-                    if self.current_animation == 'attack':
-                        self.set_animation('idle')
-                    elif self.current_animation == 'hurt':
-                        self.set_animation('idle')
-            
-            # Update sprite with new frame
-            self.image = self._get_current_sprite()
-    
-    def set_animation(self, animation: str):
-        """Set the current animation state."""
-        if animation != self.current_animation:
-            self.current_animation = animation
-            self.animation_frame = 0
-            self.animation_timer = 0
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.rect.center
     
-    def move(self, dx: float, dy: float):
-        """Move the hero by the specified amount with walking animation."""
-        if dx != 0 or dy != 0:
-            # Set walking animation if moving
-            if self.current_animation == 'idle':
-                self.set_animation('walk')
-            
-            self.velocity_x = dx * self.speed
-            self.velocity_y = dy * self.speed
-            
-            # Update facing direction
-            if dx > 0:
-                if not self.facing_right:
-                    self.facing_right = True
-                    self.image = self._get_current_sprite()
-            elif dx < 0:
-                if self.facing_right:
-                    self.facing_right = False
-                    self.image = self._get_current_sprite()
-        else:
-            # Stop walking animation when not moving
-            if self.current_animation == 'walk':
-                self.set_animation('idle')
-            self.velocity_x = 0
-            self.velocity_y = 0
-    
-    def attack(self, attack_type: str = "short") -> bool:
-        """Perform an attack with enhanced animation if not on cooldown."""
-        if self.is_attacking or self.attack_cooldown > 0:
-            return False
-        
-        if self.current_energy < 10:
-            return False
-        
-        self.is_attacking = True
-        self.attack_cooldown = 1.0  # 1 second cooldown
-        self.current_energy -= 10
-        
-        # Set appropriate animation
-        if attack_type == "special":
-            self.set_animation("special")
-        else:
-            self.set_animation("attack")
-        
-        # Calculate damage based on strength and body type
-        base_damage = self.strength
-        
-        # Body type modifiers
-        if 'muscular' in self.body_type or 'athletic' in self.body_type:
-            base_damage *= 1.1  # 10% bonus for muscular/athletic builds
-        
-        print(f"{self.name} ({self.body_type}) attacks for {base_damage:.1f} damage!")
-        
-        return True
-    
-    def take_damage(self, damage: int):
-        """Take damage with hurt animation and gender-specific reactions."""
-        # Apply damage with body type considerations
-        actual_damage = damage
-        if 'athletic' in self.body_type or 'muscular' in self.body_type:
-            actual_damage *= 0.9  # 10% damage reduction for fit characters
-        
-        self.current_hp = max(0, self.current_hp - actual_damage)
-        
-        if self.current_hp <= 0:
-            self.set_animation("death")
-            print(f"{self.name} has been defeated!")
-        else:
-            self.set_animation("hurt")
-        
-        # Gender-specific damage reactions
-        if self.gender.lower() == 'female':
-            print(f"{self.name} gracefully absorbs {actual_damage:.1f} damage! HP: {self.current_hp}/{self.max_hp}")
-        else:
-            print(f"{self.name} takes {actual_damage:.1f} damage like a champion! HP: {self.current_hp}/{self.max_hp}")
-    
-    def heal(self, amount: int):
-        """Heal the hero."""
-        self.current_hp = min(self.max_hp, self.current_hp + amount)
-    
-    def use_energy(self, amount: int) -> bool:
-        """Use energy for special abilities."""
-        if self.current_energy >= amount:
-            self.current_energy -= amount
-            return True
-        return False
-    
-    def restore_energy(self, amount: int):
-        """Restore energy."""
-        self.current_energy = min(self.max_energy, self.current_energy + amount)
-    
-    def is_alive(self) -> bool:
-        """Check if the hero is still alive."""
-        return self.current_hp > 0
+    def _on_sprite_changed(self):
+        self.image = self._get_current_sprite()
     
-    def get_info(self) -> Dict:
-        """Get hero information for UI display."""
-        return {
-            "name": self.name,
-            "hp": f"{self.current_hp}/{self.max_hp}",
-            "energy": f"{self.current_energy}/{self.max_energy}",
-            "gender": self.gender,
-            "backstory": self.backstory,
-            "attacks": {
-                "short_attack": self.attacks.short_attack,
-                "long_attack": self.attacks.long_attack,
-                "special": self.attacks.special,
-                "super_power": self.attacks.super_power
-            }
-        }
\ No newline at end of file
+    def _on_moved(self):
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
@@ -0,0 +1,391 @@
+import math
+from typing import Dict, List, Tuple
+from character_data import HeroData
+from combat.abilities import load_abilities
+from combat.frame_boxes import boxes_for_frame, load_default_boxes, mirror_boxes, strikes_on
+from observable import ObservableField
+
+class HeroSimulation:
+    """Hero game state and rules, with no pygame dependency.
+    
+    Stats, movement, the animation state machine and combat live here so a
+    dedicated server can run matches without a display or surfaces. The
+    rendered Hero subclasses it and refreshes its sprite through the
+    _on_sprite_changed() and _on_moved() hooks.
+    """
+    
+    # Body box used for attack origins when there is no sprite rect
+    width = 64
+    height = 96
+    
+    # Print combat narration; servers hosting many matches turn it off
+    announce = True
+    
+    # Observable state: changed values are published once per tick on change_bus, if set
+    current_hp = ObservableField()
+    current_energy = ObservableField()
+    current_animation = ObservableField()
+    animation_frame = ObservableField()
+    x = ObservableField()
+    y = ObservableField()
+    change_bus = None
+    
+    def __init__(self, hero_data: HeroData, x: float = 0, y: float = 0):
+        # Store hero data
+        self.hero_data = hero_data
+        self.name = hero_data.name
+        self.backstory = hero_data.backstory
+        self.attacks = hero_data.attacks
+        self.gender = hero_data.gender
+        
+        # Current stats (can be modified during gameplay)
+        self.current_hp = hero_data.stats.hp
+        self.max_hp = hero_data.stats.hp
+        self.speed = hero_data.stats.speed
+        self.strength = hero_data.stats.strength
+        self.current_energy = hero_data.stats.energy
+        self.max_energy = hero_data.stats.energy
+        
+        # Position and movement
+        self.x = x
+        self.y = y
+        self.velocity_x = 0
+        self.velocity_y = 0
+        
+        self.body_type = self._determine_body_type()
+        self.animation_sets = self._initialize_animation_sets()
+        
+        # Animation state
+        self.current_animation = "idle"
+        self.animation_frame = 0
+        self.animation_timer = 0
+        self.animation_speed = 100  # milliseconds per frame
+        
+        # Effect colour for particles (placeholder sprites set it to their primary colour)
+        self.effect_color = (0, 255, 255)
+        
+        # Optional particle system that special and super attacks emit into
+        self.particles = None
+        
+        # Optional projectile manager that long attacks fire into
+        self.projectiles = None
+        
+        # Optional combat.status_effects.StatusEffects: stuns, shields, buffs
+        self.status = None
+        
+        # Attack slot -> compiled AbilitySpec, shared with every hero using the same abilities
+        self.abilities = load_abilities().for_hero(self.name)
+        
+        # Optional iterable of what area abilities can hit (needs center, is_alive, take_damage)
+        self.targets = None
+        
+        # Animation -> per-frame hitboxes and hurtboxes; they time swings (renderers add sheet boxes)
+        self.frame_boxes = dict(load_default_boxes())
+        
+        # Swing in progress: (spec, damage, targets it already struck)
+        self._swing = None
+        
+        # Combat state
+        self.is_attacking = False
+        self.attack_cooldown = 0
+        self.facing_right = True
+        
+        # get_info() result, rebuilt only when the stats it formats change
+        self._info = None
+        self._info_key = None
+    
+    def _determine_body_type(self):
+        """Determine body type based on gender and character attributes"""
+        if self.gender.lower() == 'female':
+            # Female body types with distinguishable features
+            strength = self.strength
+            if strength > 80:
+                return 'athletic_female'  # Muscular but feminine
+            elif strength > 60:
+                return 'fit_female'      # Toned and curvy
+            else:
+                return 'slender_female'  # Graceful and elegant
+        else:
+            # Male body types
+            strength = self.strength
+            if strength > 80:
+                return 'muscular_male'
+            elif strength > 60:
+                return 'athletic_male'
+            else:
+                return 'lean_male'
+    
+    def _initialize_animation_sets(self):
+        """Initialize animation frame sets for different actions"""
+        return {
+            'idle': {'frames': 4, 'loop': True, 'speed': 200},
+            'walk': {'frames': 6, 'loop': True, 'speed': 120},
+            'attack': {'frames': 8, 'loop': False, 'speed': 80},
+            'special': {'frames': 8, 'loop': False, 'speed': 90},
+            'hurt': {'frames': 3, 'loop': False, 'speed': 100},
+            'death': {'frames': 6, 'loop': False, 'speed': 150},
+            'victory': {'frames': 6, 'loop': True, 'speed': 150}
+        }
+    
+    @property
+    def center(self) -> Tuple[int, int]:
+        """Centre of the hero's body, where attacks start."""
+        return int(self.x) + self.width // 2, int(self.y) + self.height // 2
+    
+    def _on_sprite_changed(self):
+        """Called when the animation frame or facing changes; renderers refresh the image."""
+    
+    def _on_moved(self):
+        """Called after the position is integrated; renderers move the rect."""
+    
+    def _announce(self, message: str):
+        if self.announce:
+            print(message)
+    
+    def update(self, dt: float):
+        """Update hero state, animations, and position."""
+        # Update attack cooldown
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= dt
+            if self.attack_cooldown <= 0:
+                self.is_attacking = False
+                self.set_animation('idle')
+        
+        # Update animation based on current state
+        self._update_animation(dt)
+        
+        # Update position (standing heroes skip the observable writes; stunned ones hold still)
+        if (self.velocity_x or self.velocity_y) and not (self.status is not None and self.status.is_stunned(self)):
+            self.x += self.velocity_x * dt
+            self.y += self.velocity_y * dt
+        self._on_moved()
+    
+    def _update_animation(self, dt: float):
+        """Update character animation based on current state"""
+        animation_info = self.animation_sets[self.current_animation]
+        
+        # Update animation timer
+        self.animation_timer += dt * 1000  # Convert to milliseconds
+        
+        # Check if it's time to advance frame
+        if self.animation_timer >= animation_info['speed']:
+            self.animation_frame += 1
+            self.animation_timer = 0
+            
+            # Handle animation looping
+            if self.animation_frame >= animation_info['frames']:
+                if animation_info['loop']:
+                    self.animation_frame = 0
+                else:
+                    # Non-looping animation finished
+                    self.animation_frame = animation_info['frames'] - 1
+                    if self.current_animation in ('attack', 'special'):
+                        self.set_animation('idle')
+                    elif self.current_animation == 'hurt':
+                        self.set_animation('idle')
+            
+            # Update sprite with new frame
+            self._on_sprite_changed()
+            
+            # A swing strikes again on each active frame of its animation
+            if self._swing is not None:
+                self._resolve_swing()
+    
+    def set_animation(self, animation: str):
+        """Set the current animation state."""
+        if animation != self.current_animation:
+            self.current_animation = animation
+            self.animation_frame = 0
+            self.animation_timer = 0
+    
+    def move(self, dx: float, dy: float):
+        """Move the hero by the specified amount with walking animation."""
+        if dx != 0 or dy != 0:
+            # Set walking animation if moving
+            if self.current_animation == 'idle':
+                self.set_animation('walk')
+            
+            speed = self.speed if self.status is None else self.status.stat(self, "speed", self.speed)
+            self.velocity_x = dx * speed
+            self.velocity_y = dy * speed
+            
+            # Update facing direction
+            if dx > 0:
+                if not self.facing_right:
+                    self.facing_right = True
+                    self._on_sprite_changed()
+            elif dx < 0:
+                if self.facing_right:
+                    self.facing_right = False
+                    self._on_sprite_changed()
+        else:
+            # Stop walking animation when not moving
+            if self.current_animation == 'walk':
+                self.set_animation('idle')
+            self.velocity_x = 0
+            self.velocity_y = 0
+    
+    def attack(self, attack_type: str = "short") -> bool:
+        """Cast the hero's ability for an attack slot (short, long, special, super) if not on cooldown.
+        
+        Everything about the attack comes from the hero's compiled AbilitySpec;
+        unknown attack types use the short attack.
+        """
+        spec = self.abilities.get(attack_type) or self.abilities["short"]
+        if self.is_attacking or self.attack_cooldown > 0:
+            return False
+        
+        if self.current_energy < spec.cost:
+            return False
+        
+        if self.status is not None and self.status.is_stunned(self):
+            return False
+        
+        self.is_attacking = True
+        self.attack_cooldown = spec.cooldown
+        self.current_energy -= spec.cost
+        
+        self.set_animation(spec.animation)
+        center_x, center_y = self.center
+        if spec.burst is not None and self.particles is not None:
+            self.particles.emit_burst(spec.burst, center_x, center_y, self.effect_color)
+        if spec.self_effect is not None and self.status is not None:
+            self.status.apply(self, spec.self_effect)
+        
+        damage = self.attack_damage() * spec.power
+        
+        # Volleys deal their damage on impact; other abilities swing over their animation
+        if spec.volley is not None:
+            if self.projectiles is not None:
+                angle = 0.0 if self.facing_right else math.pi
+                self.projectiles.fire_volley(spec.volley, center_x, center_y, angle, damage, owner=self)
+        elif self.targets is not None:
+            self._swing = (spec, damage, set())
+            self._resolve_swing()
+        
+        self._announce(f"{self.name} ({self.body_type}) attacks for {damage:.1f} damage!")
+        
+        return True
+    
+    def _resolve_swing(self):
+        """Strike with the swing in progress if the current frame is one of its active frames.
+        
+        A swing lasts while its ability's animation plays (being hurt ends it)
+        and strikes on every frame with hitboxes, or on the first frame for
+        animations without any. Each target is struck at most once a swing.
+        """
+        spec, damage, struck = self._swing
+        if self.current_animation != spec.animation:
+            self._swing = None
+            return
+        if not strikes_on(self.frame_boxes.get(spec.animation, ()), self.animation_frame):
+            return
+        effect = spec.target_effect if self.status is not None else None
+        for target in self._strike(spec, struck):
+            struck.add(target)
+            target.take_damage(damage)
+            if effect is not None and target.is_alive():
+                self.status.apply(target, effect)
+    
+    def _strike(self, spec, struck) -> List:
+        """Living targets not yet struck whose centre is inside the strike area.
+        
+        The area is the ability's hit shape, or, for abilities without one,
+        the current frame's hitboxes.
+        """
+        if spec.shape.kind != "none":
+            shape, facing_right = spec.shape, self.facing_right
+            center_x, center_y = self.center
+            
+            def inside(x, y):
+                return shape.contains(x - center_x, y - center_y, facing_right)
+        else:
+            boxes = boxes_for_frame(self.frame_boxes.get(self.current_animation, ()), self.animation_frame).hit
+            if not boxes:
+                return []
+            if not self.facing_right:
+                boxes = mirror_boxes(boxes, self.width)
+            left, top = int(self.x), int(self.y)
+            
+            def inside(x, y):
+                return any(bx <= x - left < bx + bw and by <= y - top < by + bh for bx, by, bw, bh in boxes)
+        return [target for target in self.targets
+                if target is not self and target not in struck and target.is_alive() and inside(*target.center)]
+    
+    def attack_damage(self) -> float:
+        """Damage of one attack, from strength (with any buffs) and body type."""
+        base_damage = self.strength if self.status is None else self.status.stat(self, "strength", self.strength)
+        
+        # Body type modifiers
+        if 'muscular' in self.body_type or 'athletic' in self.body_type:
+            base_damage *= 1.1  # 10% bonus for muscular/athletic builds
+        
+        return base_damage
+    
+    def take_damage(self, damage: float):
+        """Take damage with hurt animation and gender-specific reactions."""
+        # Apply damage with body type considerations
+        actual_damage = damage
+        if 'athletic' in self.body_type or 'muscular' in self.body_type:
+            actual_damage *= 0.9  # 10% damage reduction for fit characters
+        
+        # Debuffs, then shields
+        if self.status is not None:
+            actual_damage = self.status.absorb(self, self.status.stat(self, "damage_taken", actual_damage))
+        
+        self.current_hp = max(0, self.current_hp - actual_damage)
+        
+        if self.current_hp <= 0:
+            self.set_animation("death")
+            self._announce(f"{self.name} has been defeated!")
+        else:
+            self.set_animation("hurt")
+        
+        # Gender-specific damage reactions
+        if self.gender.lower() == 'female':
+            self._announce(f"{self.name} gracefully absorbs {actual_damage:.1f} damage! HP: {self.current_hp}/{self.max_hp}")
+        else:
+            self._announce(f"{self.name} takes {actual_damage:.1f} damage like a champion! HP: {self.current_hp}/{self.max_hp}")
+    
+    def heal(self, amount: int):
+        """Heal the hero."""
+        self.current_hp = min(self.max_hp, self.current_hp + amount)
+    
+    def use_energy(self, amount: int) -> bool:
+        """Use energy for special abilities."""
+        if self.current_energy >= amount:
+            self.current_energy -= amount
+            return True
+        return False
+    
+    def restore_energy(self, amount: int):
+        """Restore energy."""
+        self.current_energy = min(self.max_energy, self.current_energy + amount)
+    
+    def is_alive(self) -> bool:
+        """Check if the hero is still alive."""
+        return self.current_hp > 0
+    
+    def get_info(self) -> Dict:
+        """Get hero information for UI display.
+        
+        The dict is cached until HP or energy change, so treat it as read-only.
+        """
+        key = (self.current_hp, self.max_hp, self.current_energy, self.max_energy)
+        if key == self._info_key:
+            return self._info
+        self._info_key = key
+        self._info = {
+            "name": self.name,
+            "hp": f"{self.current_hp}/{self.max_hp}",
+            "energy": f"{self.current_energy}/{self.max_energy}",
+            "gender": self.gender,
+            "backstory": self.backstory,
+            "attacks": {
+                "short_attack": self.attacks.short_attack,
+                "long_attack": self.attacks.long_attack,
+                "special": self.attacks.special,
+                "super_power": self.attacks.super_power
+            }
+        }
+        return self._info
\ No newline at end of file
@@ -0,0 +1,200 @@
+import importlib
+import json
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# (module, class, method) pairs instrumented by default
+DEFAULT_TARGETS = [
+    ("hero_entity", "Hero", "update"),
+    ("hero_entity", "Hero", "_update_animation"),
+    ("hero_entity", "Hero", "_get_current_sprite"),
+    ("hero_entity", "Hero", "attack"),
+    ("hero_entity", "Hero", "take_damage"),
+    ("asset_manager", "AssetManager", "load_image"),
+    ("asset_manager", "AssetManager", "load_sound"),
+    ("asset_manager", "AssetManager", "load_music"),
+    ("asset_manager", "AssetManager", "load_font"),
+]
+
+# Histogram bucket upper bounds in seconds (1us .. 100ms)
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4,
+                   5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 1e-1)
+
+class _Series:
+    """Call counter and sampled timing histogram for one method on one entity type."""
+
+    __slots__ = ("calls", "samples", "total", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.samples = 0
+        self.total = 0.0
+        # One extra bucket for observations above the last bound (+Inf)
+        self.buckets = [0] * (bucket_count + 1)
+
+class HotPathMetrics:
+    """Opt-in call counters and sampled timing histograms for hot methods.
+
+    install() swaps timing wrappers onto the target classes and uninstall()
+    puts the original functions back, so disabled metrics cost nothing: no
+    flag checks remain on the hot path. Every call is counted; one call in
+    `sample_every` per series is timed.
+    """
+
+    def __init__(self, targets: Optional[List[Tuple[str, str, str]]] = None,
+                 sample_every: int = 8, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.targets = list(targets or DEFAULT_TARGETS)
+        self.sample_every = max(1, sample_every)
+        self.bounds = tuple(buckets)
+        self.series: Dict[Tuple[str, str], _Series] = {}
+        self._installed: List[Tuple[type, str, Callable, bool]] = []
+        self._started = time.perf_counter()
+        self._active_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._installed)
+
+    def install(self) -> bool:
+        """Install wrappers on all targets. Returns False if already installed."""
+        if self._installed:
+            return False
+        for module_name, class_name, method_name in self.targets:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            # Remember whether the class defines the method itself or inherits it
+            own = method_name in cls.__dict__
+            original = getattr(cls, method_name)
+            setattr(cls, method_name, self._wrap(f"{class_name}.{method_name}", original))
+            self._installed.append((cls, method_name, original, own))
+        self._started = time.perf_counter()
+        return True
+
+    def uninstall(self) -> bool:
+        """Restore the original methods. Returns False if nothing was installed."""
+        if not self._installed:
+            return False
+        for cls, method_name, original, own in reversed(self._installed):
+            if own:
+                setattr(cls, method_name, original)
+            else:
+                delattr(cls, method_name)
+        self._installed.clear()
+        self._active_seconds += time.perf_counter() - self._started
+        return True
+
+    def toggle(self) -> bool:
+        """Switch metrics on or off; returns the new state."""
+        if self.enabled:
+            self.uninstall()
+        else:
+            self.install()
+        return self.enabled
+
+    def reset(self):
+        """Clear all recorded counts."""
+        self.series.clear()
+        self._active_seconds = 0.0
+        self._started = time.perf_counter()
+
+    def _wrap(self, method: str, func: Callable) -> Callable:
+        series_by_type: Dict[type, _Series] = {}
+        all_series = self.series
+        bounds = self.bounds
+        sample_every = self.sample_every
+        perf_counter = time.perf_counter
+
+        def wrapper(obj, *args, **kwargs):
+            entity_type = type(obj)
+            series = series_by_type.get(entity_type)
+            if series is None:
+                series = all_series.setdefault((method, entity_type.__name__), _Series(len(bounds)))
+                series_by_type[entity_type] = series
+            series.calls += 1
+            if series.calls % sample_every:
+                return func(obj, *args, **kwargs)
+
+            start = perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                series.samples += 1
+                series.total += elapsed
+                series.buckets[bisect_left(bounds, elapsed)] += 1
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def active_seconds(self) -> float:
+        """Wall time during which metrics were installed."""
+        if self.enabled:
+            return self._active_seconds + time.perf_counter() - self._started
+        return self._active_seconds
+
+    def summary(self) -> List[Dict]:
+        """Per (method, entity type) call counts, rates and sampled timings."""
+        seconds = self.active_seconds() or 1e-9
+        rows = []
+        for (method, entity), series in sorted(self.series.items()):
+            mean = series.total / series.samples if series.samples else 0.0
+            rows.append({
+                "method": method,
+                "entity": entity,
+                "calls": series.calls,
+                "calls_per_second": series.calls / seconds,
+                "samples": series.samples,
+                "mean_seconds": mean,
+                # Sampled mean scaled up to every call
+                "estimated_total_seconds": mean * series.calls,
+                "buckets": dict(zip([str(bound) for bound in self.bounds] + ["+Inf"], series.buckets)),
+            })
+        return rows
+
+    def export_json(self, path: str = "hot_paths.json") -> bool:
+        """Write the summary as JSON."""
+        data = {
+            "active_seconds": self.active_seconds(),
+            "sample_every": self.sample_every,
+            "series": self.summary(),
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            return True
+        except OSError as e:
+            print(f"Failed to write metrics {path}: {e}")
+            return False
+
+    def export_prometheus(self, path: str = "hot_paths.prom") -> bool:
+        """Write counters and histograms in Prometheus text exposition format."""
+        lines = [
+            "# HELP neon_knights_calls_total Calls of instrumented hot-path methods.",
+            "# TYPE neon_knights_calls_total counter",
+        ]
+        for (method, entity), series in sorted(self.series.items()):
+            lines.append(f'neon_knights_calls_total{{method="{method}",entity="{entity}"}} {series.calls}')
+
+        lines += [
+            "# HELP neon_knights_call_duration_seconds Sampled durations of instrumented hot-path methods.",
+            "# TYPE neon_knights_call_duration_seconds histogram",
+        ]
+        for (method, entity), series in sorted(self.series.items()):
+            labels = f'method="{method}",entity="{entity}"'
+            cumulative = 0
+            for bound, count in zip(self.bounds, series.buckets):
+                cumulative += count
+                lines.append(f'neon_knights_call_duration_seconds_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'neon_knights_call_duration_seconds_bucket{{{labels},le="+Inf"}} {series.samples}')
+            lines.append(f'neon_knights_call_duration_seconds_sum{{{labels}}} {series.total:.9f}')
+            lines.append(f'neon_knights_call_duration_seconds_count{{{labels}}} {series.samples}')
+
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+            return True
+        except OSError as e:
+            print(f"Failed to write metrics {path}: {e}")
+            return False
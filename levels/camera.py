@@ -0,0 +1,56 @@
+import pygame
+from typing import Optional, Tuple
+
+class Camera:
+    """A scrolling viewport into a world larger than the screen."""
+
+    def __init__(self, width: int, height: int, world_width: Optional[int] = None,
+                 world_height: Optional[int] = None):
+        self.view = pygame.Rect(0, 0, width, height)
+        self.world = None
+        if world_width is not None and world_height is not None:
+            self.world = pygame.Rect(0, 0, world_width, world_height)
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """Translation from world to screen coordinates."""
+        return -self.view.x, -self.view.y
+
+    def resize(self, width: int, height: int):
+        """Change the viewport size (e.g. after a window resize)."""
+        self.view.size = (width, height)
+        self._clamp()
+
+    def move_to(self, x: int, y: int):
+        """Place the viewport's top-left corner at a world position."""
+        self.view.topleft = (int(x), int(y))
+        self._clamp()
+
+    def center_on(self, x: float, y: float):
+        """Center the viewport on a world position."""
+        self.view.center = (int(x), int(y))
+        self._clamp()
+
+    def follow(self, target: pygame.Rect, smoothing: float = 1.0):
+        """Move toward the target's center; smoothing < 1 eases the motion."""
+        cx, cy = self.view.center
+        tx, ty = target.center
+        self.center_on(cx + (tx - cx) * smoothing, cy + (ty - cy) * smoothing)
+
+    def is_visible(self, rect: pygame.Rect) -> bool:
+        """Whether a world-space rect overlaps the viewport."""
+        return self.view.colliderect(rect)
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        """Convert a world-space rect to screen space."""
+        return rect.move(-self.view.x, -self.view.y)
+
+    def world_to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x) - self.view.x, int(y) - self.view.y
+
+    def screen_to_world(self, x: int, y: int) -> Tuple[int, int]:
+        return x + self.view.x, y + self.view.y
+
+    def _clamp(self):
+        if self.world is not None and self.world.width >= self.view.width and self.world.height >= self.view.height:
+            self.view.clamp_ip(self.world)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Convert text or JSON level maps into the packed, memory-mappable level format.
+
+Text maps use one character per tile (see DEFAULT_LEGEND); a line containing
+only '---' starts the next layer. JSON maps look like:
+
+    {"tile_size": 32, "width": 3, "height": 2, "legend": {"#": 2, ".": 1},
+     "layers": [{"name": "ground", "rows": ["###", "#.#"]},
+                {"name": "props", "data": [0, 0, 0, 0, 3, 0]}]}
+
+where each layer gives either "rows" (strings decoded with the legend) or a
+flat row-major "data" list of tile IDs.
+
+Usage:
+    python -m levels.convert_level input.txt|input.json [output.nklevel] [--chunk-size 16]
+"""
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from levels.level_file import LEVEL_EXTENSION, save_level
+from levels.tilemap import TILE_EMPTY, TILE_FLOOR, TILE_WALL, TileLayer, TileMap
+
+DEFAULT_LEGEND = {
+    ' ': TILE_EMPTY,
+    '.': TILE_FLOOR,
+    '#': TILE_WALL,
+}
+
+LAYER_SEPARATOR = '---'
+
+def _rows_to_layer(rows: List[str], width: int, legend: Dict[str, int], name: str) -> TileLayer:
+    """Decode character rows into a flat layer; short rows are padded with empty tiles."""
+    tiles = array('H', bytes(2 * width * len(rows)))
+    for y, row in enumerate(rows):
+        base = y * width
+        for x, char in enumerate(row[:width]):
+            try:
+                tiles[base + x] = legend[char]
+            except KeyError:
+                raise ValueError(f"Layer '{name}' row {y}: unknown tile character {char!r}")
+    return TileLayer(width, len(rows), tiles, name=name)
+
+def _split_layers(lines: Iterable[str]) -> List[List[str]]:
+    layers = [[]]
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.strip() == LAYER_SEPARATOR:
+            layers.append([])
+        else:
+            layers[-1].append(line)
+    # Ignore trailing blank lines in each layer
+    for rows in layers:
+        while rows and not rows[-1].strip():
+            rows.pop()
+    return [rows for rows in layers if rows]
+
+def text_to_tilemap(path: str, tile_size: int = 32, legend: Optional[Dict[str, int]] = None) -> TileMap:
+    """Parse a text map (one character per tile, '---' between layers)."""
+    legend = legend or DEFAULT_LEGEND
+    with open(path, 'r', encoding='utf-8') as f:
+        layer_rows = _split_layers(f)
+    if not layer_rows:
+        raise ValueError(f"{path} contains no tiles")
+
+    width = max(len(row) for rows in layer_rows for row in rows)
+    height = max(len(rows) for rows in layer_rows)
+    layers = []
+    for i, rows in enumerate(layer_rows):
+        rows = rows + [''] * (height - len(rows))
+        layers.append(_rows_to_layer(rows, width, legend, f"layer{i}"))
+    return TileMap(width, height, tile_size, layers)
+
+def json_to_tilemap(path: str) -> TileMap:
+    """Parse a JSON map with per-layer "rows" strings or flat "data" arrays."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    legend = dict(DEFAULT_LEGEND)
+    legend.update(data.get("legend", {}))
+    width = data["width"]
+    height = data["height"]
+    layers = []
+    for i, layer in enumerate(data["layers"]):
+        name = layer.get("name", f"layer{i}")
+        if "rows" in layer:
+            rows = layer["rows"] + [''] * (height - len(layer["rows"]))
+            layers.append(_rows_to_layer(rows, width, legend, name))
+        else:
+            layers.append(TileLayer(width, height, layer["data"], name=name))
+    return TileMap(width, height, data.get("tile_size", 32), layers)
+
+def convert_level(input_path: str, output_path: Optional[str] = None, chunk_size: int = 16,
+                  tile_size: int = 32) -> str:
+    """Convert a text or JSON map to a level file and return the output path."""
+    if output_path is None:
+        output_path = os.path.splitext(input_path)[0] + LEVEL_EXTENSION
+    if input_path.endswith(".json"):
+        tilemap = json_to_tilemap(input_path)
+    else:
+        tilemap = text_to_tilemap(input_path, tile_size)
+    save_level(tilemap, output_path, chunk_size)
+    return output_path
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Convert text/JSON maps to packed level files")
+    arg_parser.add_argument("input", help="Text (.txt) or JSON (.json) map")
+    arg_parser.add_argument("output", nargs="?", help=f"Output path (default: input with {LEVEL_EXTENSION})")
+    arg_parser.add_argument("--chunk-size", type=int, default=16, help="Tiles per chunk side")
+    arg_parser.add_argument("--tile-size", type=int, default=32, help="Tile size in pixels (text maps)")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        output = convert_level(args.input, args.output, args.chunk_size, args.tile_size)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error converting {args.input}: {e}")
+        return 1
+    print(f"Wrote {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+
+from levels.tilemap import TILE_EMPTY, TileMap
+
+# Binary level format (little-endian):
+#   header:      magic, version, tile_size, width, height, chunk_size, layer_count
+#   layer table: per layer a 32-byte UTF-8 name and the u64 offset of its data
+#   layer data:  page-aligned; chunks stored one after another in row-major
+#                chunk order, each chunk_size * chunk_size uint16 tile IDs
+#                (tiles past the map edge are padded with TILE_EMPTY)
+# Storing whole chunks contiguously means a chunk is one slice of the mapping,
+# and only the pages of chunks the camera actually shows are ever read.
+LEVEL_MAGIC = b'NKLV'
+LEVEL_VERSION = 1
+HEADER = struct.Struct('<4sHHIIHH')
+LAYER_ENTRY = struct.Struct('<32sQ')
+PAGE_SIZE = mmap.PAGESIZE
+LEVEL_EXTENSION = ".nklevel"
+
+class MappedTileLayer:
+    """A tile layer backed by a memory-mapped level file (chunk-major storage).
+
+    Tile reads index straight into the mapping; nothing is copied into Python
+    lists. The mapping is copy-on-write, so runtime edits stay in memory and
+    never touch the file.
+    """
+
+    def __init__(self, tiles: Sequence[int], width: int, height: int, chunk_size: int, name: str = ""):
+        self.tiles = tiles
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.name = name
+        self.chunk_columns = (width + chunk_size - 1) // chunk_size
+        self._chunk_area = chunk_size * chunk_size
+
+    def _index(self, x: int, y: int) -> int:
+        size = self.chunk_size
+        chunk = (y // size) * self.chunk_columns + x // size
+        return chunk * self._chunk_area + (y % size) * size + x % size
+
+    def get(self, x: int, y: int) -> int:
+        """Tile ID at (x, y); out-of-bounds reads are empty."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tiles[self._index(x, y)]
+        return TILE_EMPTY
+
+    def set(self, x: int, y: int, tile_id: int):
+        """Set the tile ID at (x, y) in the private copy-on-write mapping."""
+        self.tiles[self._index(x, y)] = tile_id
+
+    def chunk_rows(self, cx: int, cy: int, chunk_size: int) -> Iterator[Tuple[int, Sequence[int]]]:
+        """Yield (row offset, tile IDs) for each row of a chunk, clipped to the layer."""
+        x0 = cx * chunk_size
+        y0 = cy * chunk_size
+        width = min(chunk_size, self.width - x0)
+        height = min(chunk_size, self.height - y0)
+        if chunk_size == self.chunk_size:
+            # Matching chunk size: each row is a zero-copy slice of the mapping
+            base = (cy * self.chunk_columns + cx) * self._chunk_area
+            for row in range(height):
+                start = base + row * chunk_size
+                yield row, self.tiles[start:start + width]
+        else:
+            get = self.get
+            for row in range(height):
+                yield row, [get(x, y0 + row) for x in range(x0, x0 + width)]
+
+class LevelFile:
+    """An open, memory-mapped level file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._views: List[memoryview] = []
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, version, self.tile_size, self.width, self.height, self.chunk_size, layer_count = \
+                HEADER.unpack_from(self._mmap, 0)
+            if magic != LEVEL_MAGIC:
+                raise ValueError(f"{path} is not a Neon Knights level file")
+            if version != LEVEL_VERSION:
+                raise ValueError(f"{path} has unsupported level version {version}")
+            columns = (self.width + self.chunk_size - 1) // self.chunk_size
+            rows = (self.height + self.chunk_size - 1) // self.chunk_size
+            self._layer_tiles = columns * rows * self.chunk_size * self.chunk_size
+            if HEADER.size + layer_count * LAYER_ENTRY.size > len(self._mmap):
+                raise ValueError(f"{path} is truncated")
+            for i in range(layer_count):
+                _, offset = LAYER_ENTRY.unpack_from(self._mmap, HEADER.size + i * LAYER_ENTRY.size)
+                if offset + self._layer_tiles * 2 > len(self._mmap):
+                    raise ValueError(f"{path} is truncated")
+            if hasattr(self._mmap, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+                # Chunks are read in camera order, not file order; skip readahead
+                self._mmap.madvise(mmap.MADV_RANDOM)
+            self.layers = [self._map_layer(i) for i in range(layer_count)]
+        except Exception:
+            self.close()
+            raise
+
+    def _map_layer(self, index: int) -> MappedTileLayer:
+        raw_name, offset = LAYER_ENTRY.unpack_from(self._mmap, HEADER.size + index * LAYER_ENTRY.size)
+        name = raw_name.rstrip(b'\0').decode('utf-8', 'replace')
+        count = self._layer_tiles
+        if sys.byteorder == 'little':
+            view = memoryview(self._mmap)[offset:offset + count * 2].cast('H')
+            self._views.append(view)
+            tiles = view
+        else:
+            # Big-endian hosts need a byte-swapped copy; the file is little-endian
+            tiles = array('H')
+            tiles.frombytes(self._mmap[offset:offset + count * 2])
+            tiles.byteswap()
+        return MappedTileLayer(tiles, self.width, self.height, self.chunk_size, name)
+
+    def to_tilemap(self) -> TileMap:
+        """Wrap the mapped layers in a TileMap that keeps this file open."""
+        tilemap = TileMap(self.width, self.height, self.tile_size, list(self.layers))
+        tilemap.preferred_chunk_size = self.chunk_size
+        tilemap.source = self
+        return tilemap
+
+    def close(self):
+        """Release the mapping. Layers from this file must not be used afterwards."""
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+def load_level(path: str) -> TileMap:
+    """Memory-map a level file; call tilemap.close() when done with it."""
+    return LevelFile(path).to_tilemap()
+
+def _layer_chunk_bytes(layer, chunk_size: int) -> Iterator[bytes]:
+    """Serialize a layer chunk by chunk in file order."""
+    columns = (layer.width + chunk_size - 1) // chunk_size
+    rows = (layer.height + chunk_size - 1) // chunk_size
+    for cy in range(rows):
+        for cx in range(columns):
+            chunk = array('H', bytes(2 * chunk_size * chunk_size))
+            for row, tiles in layer.chunk_rows(cx, cy, chunk_size):
+                start = row * chunk_size
+                chunk[start:start + len(tiles)] = array('H', tiles)
+            if sys.byteorder == 'big':
+                chunk.byteswap()
+            yield chunk.tobytes()
+
+def save_level(tilemap: TileMap, path: str, chunk_size: int = 16):
+    """Write a TileMap to the packed level format, replacing the file atomically."""
+    layer_count = len(tilemap.layers)
+    table_end = HEADER.size + layer_count * LAYER_ENTRY.size
+    chunk_bytes = (((tilemap.width + chunk_size - 1) // chunk_size)
+                   * ((tilemap.height + chunk_size - 1) // chunk_size)
+                   * chunk_size * chunk_size * 2)
+
+    def align(offset: int) -> int:
+        return (offset + PAGE_SIZE - 1) // PAGE_SIZE * PAGE_SIZE
+
+    offsets = []
+    offset = align(table_end)
+    for _ in tilemap.layers:
+        offsets.append(offset)
+        offset = align(offset + chunk_bytes)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=LEVEL_EXTENSION)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, tilemap.tile_size, tilemap.width,
+                                tilemap.height, chunk_size, layer_count))
+            for layer, layer_offset in zip(tilemap.layers, offsets):
+                # Cut to the 32-byte field on a character boundary
+                name = getattr(layer, "name", "").encode('utf-8')[:32].decode('utf-8', 'ignore').encode('utf-8')
+                f.write(LAYER_ENTRY.pack(name, layer_offset))
+            for layer, layer_offset in zip(tilemap.layers, offsets):
+                f.seek(layer_offset)
+                for data in _layer_chunk_bytes(layer, chunk_size):
+                    f.write(data)
+            f.truncate(offsets[-1] + chunk_bytes if offsets else table_end)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
@@ -0,0 +1,288 @@
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from levels.tilemap import TILE_WALL, TileMap
+
+# Tile IDs agents cannot walk through
+BLOCKING_TILES = frozenset({TILE_WALL})
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+# Neighbour steps (dx, dy): the four orthogonal moves first, then diagonals
+_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+def walkable_grid(tilemap: TileMap, layer: int = 0, blocking: Iterable[int] = BLOCKING_TILES) -> np.ndarray:
+    """Boolean (height, width) grid of walkable tiles on a layer."""
+    source = tilemap.layers[layer]
+    blocked = np.array(sorted(blocking), dtype=np.uint16)
+    tiles = getattr(source, "tiles", None)
+    if tiles is not None and len(tiles) == tilemap.width * tilemap.height and not hasattr(source, "chunk_columns"):
+        # Row-major layer: view the tile array directly
+        grid = np.frombuffer(tiles, dtype=np.uint16).reshape(tilemap.height, tilemap.width)
+    else:
+        # Chunked or mapped layers: assemble rows chunk by chunk
+        grid = np.zeros((tilemap.height, tilemap.width), dtype=np.uint16)
+        size = getattr(source, "chunk_size", tilemap.preferred_chunk_size)
+        for cy in range((tilemap.height + size - 1) // size):
+            for cx in range((tilemap.width + size - 1) // size):
+                for row, values in source.chunk_rows(cx, cy, size):
+                    grid[cy * size + row, cx * size:cx * size + len(values)] = values
+    return ~np.isin(grid, blocked)
+
+class FlowField:
+    """Distances to one target tile and the step to take from every tile.
+
+    Computed once per target and shared by every agent heading there: an
+    agent's move is a table lookup, not a search.
+    """
+
+    def __init__(self, target: Tuple[int, int], distance: np.ndarray, step_x: np.ndarray, step_y: np.ndarray):
+        self.target = target
+        self.distance = distance
+        self.step_x = step_x
+        self.step_y = step_y
+        self.dirty = False
+
+    def reachable(self, x: int, y: int) -> bool:
+        return self.distance[y, x] != UNREACHABLE
+
+    def direction(self, x: int, y: int) -> Tuple[int, int]:
+        """Grid step (dx, dy) toward the target; (0, 0) at the target or when unreachable."""
+        return int(self.step_x[y, x]), int(self.step_y[y, x])
+
+class PathfindingService:
+    """Flow fields for crowds and A* for single agents on a tilemap's grid.
+
+    Flow fields are computed with a NumPy breadth-first wavefront and kept in
+    an LRU cache per target tile. When a tile changes only the fields it can
+    affect are marked dirty; they are rebuilt the next time they are asked
+    for. Single agents can use find_path(), whose A* reuses one heap and
+    generation-stamped score arrays across searches.
+    """
+
+    def __init__(self, tilemap: TileMap, layer: int = 0, blocking: Iterable[int] = BLOCKING_TILES,
+                 max_fields: int = 32, diagonal: bool = True):
+        self.tilemap = tilemap
+        self.layer = layer
+        self.blocking = frozenset(blocking)
+        self.max_fields = max_fields
+        self.diagonal = diagonal
+        self.width = tilemap.width
+        self.height = tilemap.height
+
+        # Walkability padded with a blocked border so neighbour indexing never wraps
+        self._stride = self.width + 2
+        padded = np.zeros((self.height + 2, self._stride), dtype=bool)
+        padded[1:-1, 1:-1] = walkable_grid(tilemap, layer, self.blocking)
+        self._walkable = padded
+        self._walkable_flat = padded.reshape(-1)
+        # Byte copy for A*: scalar indexing into NumPy arrays is slow in Python loops
+        self._walkable_bytes = bytearray(self._walkable_flat.tobytes())
+        self._offsets = np.array([dy * self._stride + dx for dx, dy in _STEPS[:4]], dtype=np.int64)
+
+        self._fields: 'OrderedDict[Tuple[int, int], FlowField]' = OrderedDict()
+        self.fields_computed = 0
+        self.field_hits = 0
+        self.searches = 0
+
+        # A* scratch space reused across searches; stamps mark which entries
+        # belong to the current search, so nothing is cleared between searches
+        size = (self.height + 2) * self._stride
+        self._g = array('d', bytes(8 * size))
+        self._parent = array('q', bytes(8 * size))
+        self._stamp = array('L', bytes(array('L').itemsize * size))
+        self._closed = array('L', bytes(array('L').itemsize * size))
+        self._generation = 0
+        self._heap: List[Tuple[float, int]] = []
+
+        tilemap.add_listener(self._on_tile_changed)
+
+    def _index(self, x: int, y: int) -> int:
+        return (y + 1) * self._stride + x + 1
+
+    def walkable(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self._walkable[y + 1, x + 1])
+
+    def pixel_to_tile(self, px: float, py: float) -> Tuple[int, int]:
+        size = self.tilemap.tile_size
+        return int(px // size), int(py // size)
+
+    # Flow fields
+
+    def flow_field(self, target: Tuple[int, int]) -> FlowField:
+        """The (cached) flow field toward a target tile."""
+        target = (int(target[0]), int(target[1]))
+        field = self._fields.get(target)
+        if field is not None and not field.dirty:
+            self._fields.move_to_end(target)
+            self.field_hits += 1
+            return field
+        field = self._compute_field(target)
+        self._fields[target] = field
+        self._fields.move_to_end(target)
+        while len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
+
+    def _compute_field(self, target: Tuple[int, int]) -> FlowField:
+        self.fields_computed += 1
+        walkable = self._walkable_flat
+        distance = np.full(walkable.shape, UNREACHABLE, dtype=np.int32)
+
+        if self.walkable(*target):
+            start = self._index(*target)
+            distance[start] = 0
+            frontier = np.array([start], dtype=np.int64)
+            offsets = self._offsets
+            d = 0
+            # Breadth-first wavefront: expand the whole frontier per step
+            while frontier.size:
+                d += 1
+                neighbours = (frontier[:, None] + offsets).reshape(-1)
+                neighbours = neighbours[walkable[neighbours] & (distance[neighbours] == UNREACHABLE)]
+                neighbours = np.unique(neighbours)
+                distance[neighbours] = d
+                frontier = neighbours
+
+        grid = distance.reshape(self._walkable.shape)
+        step_x, step_y = self._descent(grid)
+        return FlowField(target, grid[1:-1, 1:-1].copy(), step_x, step_y)
+
+    def _descent(self, grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """For every tile, the neighbour step with the smallest distance."""
+        h, w = self.height, self.width
+        inner = grid[1:-1, 1:-1].astype(np.int64)
+        steps = _STEPS if self.diagonal else _STEPS[:4]
+        candidates = np.empty((len(steps), h, w), dtype=np.int64)
+        walkable = self._walkable
+        for i, (dx, dy) in enumerate(steps):
+            neighbour = grid[1 + dy:h + 1 + dy, 1 + dx:w + 1 + dx].astype(np.int64)
+            if dx and dy:
+                # No corner cutting: both orthogonal neighbours must be walkable
+                clear = walkable[1:h + 1, 1 + dx:w + 1 + dx] & walkable[1 + dy:h + 1 + dy, 1:w + 1]
+                neighbour = np.where(clear, neighbour, UNREACHABLE)
+            candidates[i] = neighbour
+        best = candidates.argmin(axis=0)
+        improves = np.take_along_axis(candidates, best[None], axis=0)[0] < inner
+        dx = np.array([s[0] for s in steps], dtype=np.int8)
+        dy = np.array([s[1] for s in steps], dtype=np.int8)
+        return np.where(improves, dx[best], 0).astype(np.int8), np.where(improves, dy[best], 0).astype(np.int8)
+
+    def direction_at_pixel(self, target_px: Tuple[float, float], px: float, py: float) -> Tuple[float, float]:
+        """Unit vector to move along from a world position toward a world target."""
+        tx, ty = self.pixel_to_tile(*target_px)
+        x, y = self.pixel_to_tile(px, py)
+        if not (0 <= x < self.width and 0 <= y < self.height) or not self.walkable(tx, ty):
+            return 0.0, 0.0
+        dx, dy = self.flow_field((tx, ty)).direction(x, y)
+        if dx == 0 and dy == 0:
+            # Same tile as the target (or cut off): head straight for it
+            vx, vy = target_px[0] - px, target_px[1] - py
+            length = math.hypot(vx, vy)
+            return (vx / length, vy / length) if length > 1e-6 else (0.0, 0.0)
+        if dx and dy:
+            return dx * math.sqrt(0.5), dy * math.sqrt(0.5)
+        return float(dx), float(dy)
+
+    def _on_tile_changed(self, x: int, y: int):
+        """Update walkability and dirty only the flow fields the change can affect."""
+        walkable = self.tilemap.get_tile(x, y, self.layer) not in self.blocking
+        if walkable == self._walkable[y + 1, x + 1]:
+            return
+        self._walkable[y + 1, x + 1] = walkable
+        self._walkable_bytes[self._index(x, y)] = walkable
+        for field in self._fields.values():
+            if field.dirty:
+                continue
+            if walkable:
+                # A new opening matters only if it touches the reachable region
+                y0, y1 = max(0, y - 1), min(self.height, y + 2)
+                x0, x1 = max(0, x - 1), min(self.width, x + 2)
+                field.dirty = bool((field.distance[y0:y1, x0:x1] != UNREACHABLE).any())
+            else:
+                # A new wall matters only if agents could stand there
+                field.dirty = field.distance[y, x] != UNREACHABLE
+
+    def invalidate_all(self):
+        """Drop every cached flow field (e.g. after reloading the map)."""
+        self._fields.clear()
+
+    # Single-agent A*
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """Shortest tile path from start to goal (inclusive), or None if there is none."""
+        if not (self.walkable(*start) and self.walkable(*goal)):
+            return None
+        self.searches += 1
+        self._generation += 1
+        generation = self._generation
+        stride = self._stride
+        walkable = self._walkable_bytes
+        g_score = self._g
+        parent = self._parent
+        stamp = self._stamp
+        closed = self._closed
+        heap = self._heap
+        heap.clear()
+        push = heapq.heappush
+        pop = heapq.heappop
+
+        diagonal = self.diagonal
+        moves = [(dy * stride + dx, dx, dy, math.sqrt(2.0) if dx and dy else 1.0)
+                 for dx, dy in (_STEPS if diagonal else _STEPS[:4])]
+        start_index = self._index(*start)
+        goal_index = self._index(*goal)
+        gx, gy = goal
+
+        def heuristic(index: int) -> float:
+            x = index % stride - 1
+            y = index // stride - 1
+            ddx = abs(x - gx)
+            ddy = abs(y - gy)
+            if diagonal:
+                return max(ddx, ddy) + (math.sqrt(2.0) - 1.0) * min(ddx, ddy)
+            return ddx + ddy
+
+        g_score[start_index] = 0.0
+        stamp[start_index] = generation
+        parent[start_index] = -1
+        push(heap, (heuristic(start_index), start_index))
+        while heap:
+            _, current = pop(heap)
+            if closed[current] == generation:
+                continue
+            if current == goal_index:
+                path = []
+                while current != -1:
+                    path.append((current % stride - 1, current // stride - 1))
+                    current = parent[current]
+                path.reverse()
+                return path
+            closed[current] = generation
+            base = g_score[current]
+            for offset, dx, dy, cost in moves:
+                neighbour = current + offset
+                if not walkable[neighbour] or closed[neighbour] == generation:
+                    continue
+                if dx and dy and not (walkable[current + dx] and walkable[current + dy * stride]):
+                    continue
+                tentative = base + cost
+                if stamp[neighbour] != generation or tentative < g_score[neighbour]:
+                    stamp[neighbour] = generation
+                    g_score[neighbour] = tentative
+                    parent[neighbour] = current
+                    push(heap, (tentative + heuristic(neighbour), neighbour))
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached_fields": len(self._fields),
+            "fields_computed": self.fields_computed,
+            "field_hits": self.field_hits,
+            "searches": self.searches,
+        }
@@ -0,0 +1,139 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from levels.camera import Camera
+from levels.tilemap import TILE_ASSETS, TileMap
+
+def build_tileset(asset_manager, tile_size: int = 32) -> Dict[int, pygame.Surface]:
+    """Map tile IDs to the AssetManager's tile surfaces, scaled to the tile size."""
+    tileset = {}
+    for tile_id, asset_name in TILE_ASSETS.items():
+        surface = asset_manager.get_sprite(asset_name)
+        if surface is None:
+            continue
+        if surface.get_size() != (tile_size, tile_size):
+            surface = pygame.transform.scale(surface, (tile_size, tile_size))
+        tileset[tile_id] = surface
+    return tileset
+
+class TileMapRenderer:
+    """Draws a TileMap through a Camera using pre-rendered chunk surfaces.
+
+    Each chunk (chunk_size x chunk_size tiles, all layers composited) is
+    rendered once and cached, so a frame costs one blit per visible chunk.
+    Only chunks overlapping the viewport are touched and the cache is an LRU
+    bounded by the viewport size, so per-frame cost and memory depend on the
+    screen, not the world.
+    """
+
+    def __init__(self, tilemap: TileMap, tileset: Dict[int, pygame.Surface], chunk_size: Optional[int] = None,
+                 max_cached_chunks: Optional[int] = None):
+        self.tilemap = tilemap
+        self.tileset = tileset
+        self.chunk_size = chunk_size or tilemap.preferred_chunk_size
+        self.chunk_pixels = self.chunk_size * tilemap.tile_size
+        # None: sized to the viewport, and re-sized whenever the viewport changes
+        self.auto_cache_size = max_cached_chunks is None
+        self.max_cached_chunks = max_cached_chunks
+        self._view_size: Optional[Tuple[int, int]] = None
+        self._chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self.chunks_drawn = 0
+        self.chunks_rendered = 0
+        tilemap.add_listener(self.invalidate_tile)
+
+    def invalidate_tile(self, x: int, y: int):
+        """Drop the cached chunk containing a changed tile."""
+        self._chunks.pop((x // self.chunk_size, y // self.chunk_size), None)
+
+    def invalidate_all(self):
+        """Drop every cached chunk (e.g. after swapping the tileset)."""
+        self._chunks.clear()
+
+    def visible_chunk_range(self, camera: Camera) -> Tuple[range, range]:
+        """Chunk columns and rows overlapping the camera view."""
+        view = camera.view
+        size = self.chunk_pixels
+        cols = (self.tilemap.width + self.chunk_size - 1) // self.chunk_size
+        rows = (self.tilemap.height + self.chunk_size - 1) // self.chunk_size
+        cx0 = max(0, view.left // size)
+        cy0 = max(0, view.top // size)
+        cx1 = min(cols, (view.right - 1) // size + 1)
+        cy1 = min(rows, (view.bottom - 1) // size + 1)
+        return range(cx0, cx1), range(cy0, cy1)
+
+    def blit_sequence(self, camera: Camera) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """(chunk surface, screen position) for each visible chunk, rendering any not cached."""
+        columns, rows = self.visible_chunk_range(camera)
+        if self.auto_cache_size and camera.view.size != self._view_size:
+            # Room for two screens' worth of chunks so small camera moves don't re-render
+            self._view_size = camera.view.size
+            self.max_cached_chunks = 2 * (len(columns) + 1) * (len(rows) + 1)
+
+        ox, oy = camera.offset
+        size = self.chunk_pixels
+        chunks = self._chunks
+        blits = []
+        for cy in rows:
+            for cx in columns:
+                key = (cx, cy)
+                chunk = chunks.get(key)
+                if chunk is None:
+                    chunk = self._render_chunk(cx, cy)
+                    chunks[key] = chunk
+                else:
+                    chunks.move_to_end(key)
+                blits.append((chunk, (cx * size + ox, cy * size + oy)))
+
+        while len(chunks) > self.max_cached_chunks:
+            chunks.popitem(last=False)
+        self.chunks_drawn = len(blits)
+        return blits
+
+    def draw(self, surface: pygame.Surface, camera: Camera) -> int:
+        """Blit the visible chunks; returns the number of chunks drawn."""
+        surface.blits(self.blit_sequence(camera), doreturn=False)
+        return self.chunks_drawn
+
+    def _render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        tile_size = self.tilemap.tile_size
+        width = min(self.chunk_size, self.tilemap.width - cx * self.chunk_size) * tile_size
+        height = min(self.chunk_size, self.tilemap.height - cy * self.chunk_size) * tile_size
+        chunk = pygame.Surface((width, height), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert_alpha()
+
+        tileset = self.tileset
+        blits = []
+        for layer in self.tilemap.layers:
+            for row, tiles in layer.chunk_rows(cx, cy, self.chunk_size):
+                py = row * tile_size
+                for col, tile_id in enumerate(tiles):
+                    tile = tileset.get(tile_id) if tile_id else None
+                    if tile is not None:
+                        blits.append((tile, (col * tile_size, py)))
+        chunk.blits(blits, doreturn=False)
+        self.chunks_rendered += 1
+        return chunk
+
+class CameraGroup(pygame.sprite.Group):
+    """Sprite group that culls sprites outside the camera before blitting."""
+
+    def __init__(self, *sprites):
+        super().__init__(*sprites)
+        self.drawn = 0
+        self.culled = 0
+
+    def draw(self, surface: pygame.Surface, camera: Optional[Camera] = None):
+        """Blit only sprites overlapping the camera view, offset into screen space."""
+        if camera is None:
+            return super().draw(surface)
+        view = camera.view
+        ox, oy = camera.offset
+        colliderect = view.colliderect
+        sprites = self.sprites()
+        visible = [(sprite.image, sprite.rect.move(ox, oy)) for sprite in sprites if colliderect(sprite.rect)]
+        surface.blits(visible, doreturn=False)
+        self.drawn = len(visible)
+        self.culled = len(sprites) - self.drawn
+        return []
@@ -0,0 +1,110 @@
+from array import array
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+# Tile IDs (0 is always empty and never drawn)
+TILE_EMPTY = 0
+TILE_FLOOR = 1
+TILE_WALL = 2
+
+# Asset names for each tile ID, as created by AssetManager
+TILE_ASSETS = {
+    TILE_FLOOR: 'tile_floor',
+    TILE_WALL: 'tile_wall',
+}
+
+class TileLayer:
+    """A 2D grid of tile IDs stored as one flat row-major array of uint16."""
+
+    def __init__(self, width: int, height: int, tiles: Optional[Sequence[int]] = None, name: str = ""):
+        self.width = width
+        self.height = height
+        self.name = name
+        if tiles is None:
+            self.tiles = array('H', bytes(2 * width * height))
+        else:
+            self.tiles = array('H', tiles)
+            if len(self.tiles) != width * height:
+                raise ValueError(f"Layer '{name}' needs {width * height} tiles, got {len(self.tiles)}")
+
+    def get(self, x: int, y: int) -> int:
+        """Tile ID at (x, y); out-of-bounds reads are empty."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.tiles[y * self.width + x]
+        return TILE_EMPTY
+
+    def set(self, x: int, y: int, tile_id: int):
+        """Set the tile ID at (x, y)."""
+        self.tiles[y * self.width + x] = tile_id
+
+    def chunk_rows(self, cx: int, cy: int, chunk_size: int) -> Iterator[Tuple[int, Sequence[int]]]:
+        """Yield (row offset, tile IDs) for each row of a chunk, clipped to the layer."""
+        x0 = cx * chunk_size
+        x1 = min(x0 + chunk_size, self.width)
+        y0 = cy * chunk_size
+        y1 = min(y0 + chunk_size, self.height)
+        tiles = self.tiles
+        for y in range(y0, y1):
+            start = y * self.width
+            yield y - y0, tiles[start + x0:start + x1]
+
+class TileMap:
+    """A level made of stacked tile layers sharing one grid and tile size."""
+
+    def __init__(self, width: int, height: int, tile_size: int = 32, layers: Optional[List[TileLayer]] = None):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.layers: List[TileLayer] = layers if layers is not None else [TileLayer(width, height, name="ground")]
+        self._listeners: List[Callable[[int, int], None]] = []
+        # Chunk size renderers should use (matches on-disk chunks for mapped levels)
+        self.preferred_chunk_size = 16
+        # Backing resource (e.g. an open LevelFile) released by close()
+        self.source = None
+
+    @property
+    def pixel_width(self) -> int:
+        return self.width * self.tile_size
+
+    @property
+    def pixel_height(self) -> int:
+        return self.height * self.tile_size
+
+    def add_listener(self, callback: Callable[[int, int], None]):
+        """Register a callback(x, y) fired whenever a tile changes."""
+        self._listeners.append(callback)
+
+    def get_tile(self, x: int, y: int, layer: int = 0) -> int:
+        """Tile ID at grid position (x, y) on a layer."""
+        return self.layers[layer].get(x, y)
+
+    def set_tile(self, x: int, y: int, tile_id: int, layer: int = 0):
+        """Change a tile and notify listeners (e.g. renderers caching chunks)."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        if self.layers[layer].get(x, y) == tile_id:
+            return
+        self.layers[layer].set(x, y, tile_id)
+        for callback in self._listeners:
+            callback(x, y)
+
+    def tile_at_pixel(self, px: float, py: float, layer: int = 0) -> int:
+        """Tile ID under a world pixel position."""
+        return self.get_tile(int(px // self.tile_size), int(py // self.tile_size), layer)
+
+    def close(self):
+        """Release the backing level file, if any."""
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+    @classmethod
+    def arena(cls, width: int, height: int, tile_size: int = 32) -> 'TileMap':
+        """Create a floor-filled map enclosed by walls."""
+        tiles = array('H', [TILE_FLOOR]) * (width * height)
+        for x in range(width):
+            tiles[x] = TILE_WALL
+            tiles[(height - 1) * width + x] = TILE_WALL
+        for y in range(height):
+            tiles[y * width] = TILE_WALL
+            tiles[y * width + width - 1] = TILE_WALL
+        return cls(width, height, tile_size, [TileLayer(width, height, tiles, name="ground")])
@@ -0,0 +1,143 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+# pygame-ce ships a native blur; classic pygame falls back to a smoothscale round trip
+_native_blur = getattr(pygame.transform, "gaussian_blur", None)
+
+_disc_kernels: Dict[int, pygame.mask.Mask] = {}
+
+def _disc_kernel(radius: int) -> pygame.mask.Mask:
+    """A filled circular mask of the given radius, used as the dilation kernel."""
+    kernel = _disc_kernels.get(radius)
+    if kernel is None:
+        size = radius * 2 + 1
+        kernel = pygame.mask.Mask((size, size))
+        limit = radius * radius + radius  # include the rim for a rounder outline
+        for y in range(size):
+            for x in range(size):
+                if (x - radius) ** 2 + (y - radius) ** 2 <= limit:
+                    kernel.set_at((x, y))
+        _disc_kernels[radius] = kernel
+    return kernel
+
+def dilate(mask: pygame.mask.Mask, radius: int) -> pygame.mask.Mask:
+    """Grow a mask by radius pixels on every side (output is padded by radius)."""
+    return mask.convolve(_disc_kernel(radius))
+
+def blur(surface: pygame.Surface, radius: int) -> pygame.Surface:
+    """Cheap approximate blur of a per-pixel alpha surface."""
+    if radius <= 0:
+        return surface
+    if _native_blur is not None:
+        return _native_blur(surface, radius)
+    # Downscale then upscale: smoothscale's filtering spreads each pixel over
+    # roughly `factor` pixels in both directions for the cost of two scales
+    width, height = surface.get_size()
+    factor = max(2, radius // 2)
+    small = pygame.transform.smoothscale(surface, (max(1, width // factor), max(1, height // factor)))
+    return pygame.transform.smoothscale(small, (width, height))
+
+def make_outline(source: pygame.Surface, color: Tuple[int, int, int], width: int = 1) -> pygame.Surface:
+    """Source with a solid outline: one mask dilation instead of one blit per offset.
+
+    The result is padded by `width` on every side.
+    """
+    silhouette = dilate(pygame.mask.from_surface(source), width)
+    outlined = silhouette.to_surface(setcolor=(*color, 255), unsetcolor=(0, 0, 0, 0))
+    outlined.blit(source, (width, width))
+    return outlined
+
+def make_glow(source: pygame.Surface, color: Tuple[int, int, int], radius: int = 6,
+              include_source: bool = True) -> pygame.Surface:
+    """Source over a soft neon halo: one silhouette, one dilation, one blur.
+
+    The result is padded by `radius` on every side. With include_source=False
+    only the halo is returned, for drawing underneath a sprite that is drawn
+    separately.
+    """
+    mask = pygame.mask.from_surface(source)
+    spread = max(1, radius // 3)
+    silhouette = dilate(mask, spread)
+    pad = radius - spread
+    halo = pygame.Surface((silhouette.get_size()[0] + pad * 2, silhouette.get_size()[1] + pad * 2), pygame.SRCALPHA)
+    halo.blit(silhouette.to_surface(setcolor=(*color, 255), unsetcolor=(0, 0, 0, 0)), (pad, pad))
+    halo = blur(halo, radius)
+    if include_source:
+        halo.blit(source, (radius, radius))
+    return halo
+
+class NeonEffects:
+    """Builds outline and glow surfaces once and caches them.
+
+    Entries are keyed by (source key, effect, colour, size) and evicted least
+    recently used first. The source key defaults to the surface itself; pass
+    an explicit key for surfaces that are regenerated but look the same.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        # key -> (source object kept alive so its id cannot be reused, result)
+        self._cache: 'OrderedDict[Hashable, Tuple[object, pygame.Surface]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _lookup(self, key: Hashable, source: object) -> Optional[pygame.Surface]:
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] is source:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def _store(self, key: Hashable, source: object, result: pygame.Surface) -> pygame.Surface:
+        self._cache[key] = (source, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return result
+
+    def outline(self, source: pygame.Surface, color: Tuple[int, int, int], width: int = 1,
+                key: Hashable = None) -> pygame.Surface:
+        """Cached make_outline(); the result is padded by `width`."""
+        cache_key = ("outline", key if key is not None else id(source), tuple(color), width)
+        anchor = None if key is not None else source
+        result = self._lookup(cache_key, anchor)
+        if result is None:
+            result = self._store(cache_key, anchor, make_outline(source, color, width))
+        return result
+
+    def glow(self, source: pygame.Surface, color: Tuple[int, int, int], radius: int = 6,
+             key: Hashable = None, include_source: bool = True) -> pygame.Surface:
+        """Cached make_glow(); the result is padded by `radius`."""
+        cache_key = ("glow", key if key is not None else id(source), tuple(color), radius, include_source)
+        anchor = None if key is not None else source
+        result = self._lookup(cache_key, anchor)
+        if result is None:
+            result = self._store(cache_key, anchor, make_glow(source, color, radius, include_source))
+        return result
+
+    def text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int],
+             outline_color: Optional[Tuple[int, int, int]] = None, outline_width: int = 1,
+             glow_color: Optional[Tuple[int, int, int]] = None, glow_radius: int = 0) -> pygame.Surface:
+        """Render text once and apply an optional outline and glow, cached per string and style."""
+        cache_key = ("text", id(font), text, tuple(color),
+                     tuple(outline_color) if outline_color else None, outline_width,
+                     tuple(glow_color) if glow_color else None, glow_radius)
+        result = self._lookup(cache_key, font)
+        if result is None:
+            result = font.render(text, True, color)
+            if outline_color:
+                result = make_outline(result, outline_color, outline_width)
+            if glow_color and glow_radius > 0:
+                result = make_glow(result, glow_color, glow_radius)
+            self._store(cache_key, font, result)
+        return result
+
+    def clear(self):
+        """Drop all cached surfaces."""
+        self._cache.clear()
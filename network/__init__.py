@@ -0,0 +1,2 @@
+# Network module
+# Contains multiplayer state sync: wire protocol, interest management, server and client
\ No newline at end of file
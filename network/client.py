@@ -0,0 +1,132 @@
+import asyncio
+import struct
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from network.protocol import (ANY_ENTITY, HELLO, INPUT, MSG_BYE, MSG_HELLO, MSG_INPUT, MSG_SNAPSHOT,
+                              MSG_WELCOME, WELCOME, EntityState, Quantised, decode_snapshot, dequantise)
+
+class SyncClient(asyncio.DatagramProtocol):
+    """UDP client mirroring the entities the server says are near it.
+
+    Every snapshot received is acknowledged with the client's held input,
+    so the server can delta-encode against it. Received snapshots are kept
+    for `history` ticks because later packets may still use them as their
+    baseline.
+
+    Usage:
+        client = SyncClient()
+        if await client.connect("127.0.0.1", port):
+            client.set_input(1, 0)
+            ... client.entities ...
+    """
+
+    def __init__(self, entity_id: int = ANY_ENTITY, history: int = 32):
+        self.requested_entity = entity_id
+        self.history = history
+        self.client_id: Optional[int] = None
+        self.entity_id: Optional[int] = None
+        self.tick_rate = 0
+
+        self.snapshots: 'OrderedDict[int, Dict[int, Quantised]]' = OrderedDict()
+        self.latest_tick = 0
+        self._entities: Dict[int, EntityState] = {}
+        self._entities_tick = -1
+        self._input = (0, 0, 0)
+
+        self._transport = None
+        self._link = None
+        self._welcomed: Optional[asyncio.Future] = None
+        self.connected = False
+
+        self.bytes_received = 0
+        self.packets_received = 0
+        self.packets_stale = 0
+        self.packets_undecodable = 0
+
+    async def connect(self, host: str, port: int, link=None, timeout: float = 5.0,
+                      retry_interval: float = 0.25) -> bool:
+        """Join the server, resending the hello until welcomed; returns whether it worked."""
+        self._link = link
+        loop = asyncio.get_running_loop()
+        self._welcomed = loop.create_future()
+        await loop.create_datagram_endpoint(lambda: self, remote_addr=(host, port))
+        deadline = loop.time() + timeout
+        hello = HELLO.pack(MSG_HELLO, self.requested_entity)
+        while not self._welcomed.done() and loop.time() < deadline:
+            self._transport.sendto(hello)
+            try:
+                await asyncio.wait_for(asyncio.shield(self._welcomed), retry_interval)
+            except asyncio.TimeoutError:
+                pass
+        if not self._welcomed.done():
+            print(f"Could not connect to {host}:{port}")
+            self.close()
+            return False
+        return True
+
+    def connection_made(self, transport):
+        self._transport = self._link.wrap(transport) if self._link is not None else transport
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.sendto(bytes((MSG_BYE,)))
+            self._transport.close()
+            self._transport = None
+        self.connected = False
+
+    def datagram_received(self, data: bytes, address):
+        self.bytes_received += len(data)
+        self.packets_received += 1
+        try:
+            kind = data[0]
+            if kind == MSG_SNAPSHOT:
+                self._on_snapshot(data)
+            elif kind == MSG_WELCOME:
+                _, self.client_id, self.entity_id, self.tick_rate = WELCOME.unpack_from(data, 0)
+                self.connected = True
+                if self._welcomed is not None and not self._welcomed.done():
+                    self._welcomed.set_result(True)
+            elif kind == MSG_BYE:
+                self.connected = False
+        except (IndexError, struct.error):
+            self.packets_undecodable += 1
+
+    def error_received(self, exc):
+        print(f"Network client error: {exc}")
+
+    def _on_snapshot(self, data: bytes):
+        # Out-of-order packets older than what we have add nothing
+        tick = struct.unpack_from('<I', data, 1)[0]
+        if tick <= self.latest_tick:
+            self.packets_stale += 1
+            return
+        decoded = decode_snapshot(data, self.snapshots)
+        if decoded is None:
+            self.packets_undecodable += 1
+            return
+        tick, states = decoded
+        self.snapshots[tick] = states
+        while len(self.snapshots) > self.history:
+            self.snapshots.popitem(last=False)
+        self.latest_tick = tick
+        self._send_input()
+
+    def _send_input(self):
+        if self._transport is not None:
+            dx, dy, buttons = self._input
+            self._transport.sendto(INPUT.pack(MSG_INPUT, self.latest_tick, dx, dy, buttons))
+
+    def set_input(self, dx: int, dy: int, buttons: int = 0):
+        """Held movement direction (-1..1 per axis) and buttons; sent now and with every ack."""
+        self._input = (dx, dy, buttons)
+        self._send_input()
+
+    @property
+    def entities(self) -> Dict[int, EntityState]:
+        """Entities in view as of the latest snapshot."""
+        if self._entities_tick != self.latest_tick:
+            states = self.snapshots.get(self.latest_tick, {})
+            self._entities = {entity_id: dequantise(state) for entity_id, state in states.items()}
+            self._entities_tick = self.latest_tick
+        return self._entities
@@ -0,0 +1,135 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+class InterestGrid:
+    """Uniform grid of entity positions for "what is near this point" queries.
+
+    A radius query touches just the cells the circle covers, so deciding
+    what a client can see costs in proportion to the entities around it.
+
+    Positions can be pushed with move(), or entities can be tracked: a
+    tracked entity is re-read only when it could have strayed more than
+    `slack` outside its cell, given its speed limit. Queries search `slack`
+    further to make up for it and measure distances from live positions,
+    so results stay exact while most entities go untouched for many ticks:
+    keeping the grid current costs in proportion to movement, not to the
+    size of the world. Anything that moves an entity faster than its limit
+    (a teleport, a state restore) must call touch().
+    """
+
+    def __init__(self, cell_size: float = 256.0, slack: Optional[float] = None):
+        self.cell_size = float(cell_size)
+        self.slack = self.cell_size / 2 if slack is None else float(slack)
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._entity_cells: Dict[int, Tuple[int, int]] = {}
+        self._positions: Dict[int, Tuple[float, float]] = {}
+
+        # Tracked entities: the object, its speed limit, and when it is next due a re-read
+        self._tracked: Dict[int, Tuple[object, Optional[float]]] = {}
+        self._due_at: Dict[int, float] = {}
+        self._due: List[Tuple[float, int]] = []
+        self._time = 0.0
+        self.rechecks_last_refresh = 0
+
+    def __len__(self) -> int:
+        return len(self._entity_cells)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def move(self, entity_id: int, x: float, y: float):
+        """Insert or move an entity by position."""
+        self._positions[entity_id] = (x, y)
+        self._place(entity_id, self._cell(x, y))
+
+    def _place(self, entity_id: int, cell: Tuple[int, int]):
+        old = self._entity_cells.get(entity_id)
+        if old == cell:
+            return
+        if old is not None:
+            members = self._cells[old]
+            members.discard(entity_id)
+            if not members:
+                del self._cells[old]
+        self._cells.setdefault(cell, set()).add(entity_id)
+        self._entity_cells[entity_id] = cell
+
+    def remove(self, entity_id: int):
+        cell = self._entity_cells.pop(entity_id, None)
+        self._positions.pop(entity_id, None)
+        self._tracked.pop(entity_id, None)
+        self._due_at.pop(entity_id, None)
+        if cell is not None:
+            members = self._cells[cell]
+            members.discard(entity_id)
+            if not members:
+                del self._cells[cell]
+
+    # Tracked entities
+
+    def track(self, entity_id: int, entity, max_speed: Optional[float] = None):
+        """Follow an object's x and y; max_speed (units/s) None means re-read it every refresh."""
+        self._tracked[entity_id] = (entity, max_speed)
+        self.touch(entity_id)
+
+    def touch(self, entity_id: int):
+        """Re-read a tracked entity now, e.g. after it was moved directly."""
+        entity, max_speed = self._tracked[entity_id]
+        x, y = entity.x, entity.y
+        cell = self._cell(x, y)
+        self._place(entity_id, cell)
+        if max_speed is None:
+            due = self._time
+        elif max_speed <= 0:
+            due = math.inf
+        else:
+            # Time until it could be `slack` past the nearest edge of its cell
+            size = self.cell_size
+            margin = min(x - cell[0] * size, (cell[0] + 1) * size - x, y - cell[1] * size, (cell[1] + 1) * size - y)
+            due = self._time + (margin + self.slack) / max_speed
+        self._due_at[entity_id] = due
+        if due != math.inf:
+            heapq.heappush(self._due, (due, entity_id))
+
+    def refresh(self, now: float):
+        """Re-read the tracked entities that may have changed cell by time `now` (seconds)."""
+        self._time = now
+        due_heap = self._due
+        due_at = self._due_at
+        ready = []
+        while due_heap and due_heap[0][0] <= now:
+            due, entity_id = heapq.heappop(due_heap)
+            if due_at.get(entity_id) == due:  # else removed or rescheduled since
+                ready.append(entity_id)
+        # Touch after draining: some are due again at once and must wait for the next refresh
+        for entity_id in ready:
+            self.touch(entity_id)
+        self.rechecks_last_refresh = len(ready)
+
+    def query(self, x: float, y: float, radius: float) -> List[Tuple[float, int]]:
+        """(squared distance, id) of entities within radius of (x, y), nearest first."""
+        reach = radius + (self.slack if self._tracked else 0.0)
+        x0, y0 = self._cell(x - reach, y - reach)
+        x1, y1 = self._cell(x + reach, y + reach)
+        limit = radius * radius
+        positions = self._positions
+        tracked = self._tracked
+        cells = self._cells
+        found = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                members = cells.get((cx, cy))
+                if not members:
+                    continue
+                for entity_id in members:
+                    entry = tracked.get(entity_id)
+                    if entry is not None:
+                        ex, ey = entry[0].x, entry[0].y
+                    else:
+                        ex, ey = positions[entity_id]
+                    distance = (ex - x) * (ex - x) + (ey - y) * (ey - y)
+                    if distance <= limit:
+                        found.append((distance, entity_id))
+        found.sort()
+        return found
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Localhost test harness for the state sync: a simulated lossy link and a
+headless server-plus-clients run that reports bandwidth and tick cost.
+
+Usage:
+    python -m network.loopback
+    python -m network.loopback --clients 4 --latency 0.08 --loss 0.1 --crowd 3000
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+from typing import Optional, Tuple
+
+class _LossyTransport:
+    """Wraps a datagram transport: drops, delays and jitters outgoing packets."""
+
+    def __init__(self, transport, link: 'LossyLink'):
+        self._transport = transport
+        self._link = link
+
+    def sendto(self, data: bytes, address=None):
+        link = self._link
+        link.sent += 1
+        if link.rng.random() < link.loss:
+            link.dropped += 1
+            return
+        delay = max(0.0, link.latency + link.rng.uniform(-link.jitter, link.jitter))
+        loop = asyncio.get_running_loop()
+        if address is None:
+            loop.call_later(delay, self._deliver, data)
+        else:
+            loop.call_later(delay, self._deliver, data, address)
+
+    def _deliver(self, *args):
+        if not self._transport.is_closing():
+            self._transport.sendto(*args)
+
+    def close(self):
+        self._transport.close()
+
+    def is_closing(self) -> bool:
+        return self._transport.is_closing()
+
+    def get_extra_info(self, name, default=None):
+        return self._transport.get_extra_info(name, default)
+
+class LossyLink:
+    """One direction of a simulated network: one-way latency, jitter and loss.
+
+    Pass it to SyncServer.start() or SyncClient.connect() to impair what
+    that endpoint sends. Seed it for repeatable runs.
+    """
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.01, loss: float = 0.05, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.dropped = 0
+
+    def wrap(self, transport) -> _LossyTransport:
+        return _LossyTransport(transport, self)
+
+class _Wanderer:
+    """Crowd entity for the harness: walks between random points of the world."""
+
+    def __init__(self, rng: random.Random, world: Tuple[int, int]):
+        self.rng = rng
+        self.world = world
+        self.x = rng.uniform(0, world[0])
+        self.y = rng.uniform(0, world[1])
+        self.hp = 30
+        self.speed = 60.0
+        self._pick()
+
+    def _pick(self):
+        self.goal = (self.rng.uniform(0, self.world[0]), self.rng.uniform(0, self.world[1]))
+
+    def update(self, dt: float):
+        dx, dy = self.goal[0] - self.x, self.goal[1] - self.y
+        distance = math.hypot(dx, dy)
+        step = self.speed * dt
+        if distance <= step:
+            self._pick()
+        else:
+            self.x += dx / distance * step
+            self.y += dy / distance * step
+
+async def run_loopback(clients: int = 3, seconds: float = 10.0, latency: float = 0.05, jitter: float = 0.01,
+                       loss: float = 0.05, crowd: int = 1000, world: Tuple[int, int] = (8000, 8000),
+                       tick_rate: int = 20, seed: int = 1) -> dict:
+    """Run the demo simulation behind a SyncServer with clients over a lossy localhost link."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.display.init()
+
+    from character_loader import CharacterDataLoader
+    from demo_session import DemoSession
+    from network.client import SyncClient
+    from network.server import SyncServer
+
+    session = DemoSession(CharacterDataLoader(), seed=seed, verbose=False)
+    server = SyncServer(tick_rate=tick_rate)
+    host, port = await server.start(link=LossyLink(latency, jitter, loss, seed=seed))
+    hero_ids = [server.add_entity(hero) for hero in session.heroes]
+    rng = random.Random(seed)
+    wanderers = [_Wanderer(rng, world) for _ in range(crowd)]
+    for wanderer in wanderers:
+        server.add_entity(wanderer)
+
+    peers = []
+    for i in range(clients):
+        client = SyncClient(hero_ids[i % len(hero_ids)])
+        if await client.connect(host, port, link=LossyLink(latency, jitter, loss, seed=seed + 1 + i)):
+            peers.append(client)
+
+    dt = 1.0 / 60.0
+    frames_per_tick = max(1, round(60 / tick_rate))
+    tick_ms = []
+    rechecks = []
+    frame = 0
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while loop.time() - start < seconds:
+        frame += 1
+        if frame % 90 == 0:
+            for client in peers:
+                client.set_input(rng.choice((-1, 0, 1)), 0, rng.choice((0, 0, 1)))
+        session.step(dt)
+        for wanderer in wanderers:
+            wanderer.update(dt)
+        if frame % frames_per_tick == 0:
+            server.update(frame * dt)
+            tick_ms.append(server.last_tick_ms)
+            rechecks.append(server.grid.rechecks_last_refresh)
+        # Keep roughly real time so latency and the simulation line up
+        await asyncio.sleep(max(0.0, start + frame * dt - loop.time()))
+
+    # Compare each client's view of its own hero with the server's
+    errors = []
+    for client in peers:
+        hero = server.entities.get(client.entity_id)
+        seen = client.entities.get(client.entity_id)
+        if hero is not None and seen is not None:
+            errors.append(math.hypot(hero.x - seen.x, hero.y - seen.y))
+
+    stats = server.stats()
+    elapsed = loop.time() - start
+    report = {
+        "clients": len(peers),
+        "entities": stats["entities"],
+        "ticks": stats["tick"],
+        "tick_ms_mean": sum(tick_ms) / len(tick_ms) if tick_ms else 0.0,
+        "tick_ms_max": max(tick_ms) if tick_ms else 0.0,
+        "visible_per_client": stats["visible_per_client"],
+        "grid_rechecks": sum(rechecks) / len(rechecks) if rechecks else 0.0,
+        "bytes_per_second_per_client": (sum(c.bytes_received for c in peers) / len(peers) / elapsed
+                                        if peers else 0.0),
+        "bytes_per_snapshot": stats["bytes_per_client_tick"],
+        "undecodable": sum(c.packets_undecodable for c in peers),
+        "stale": sum(c.packets_stale for c in peers),
+        "hero_error_px": max(errors) if errors else 0.0,
+    }
+    for client in peers:
+        client.close()
+    server.close()
+    pygame.quit()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the state sync over a simulated lossy localhost link")
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="one-way latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="latency jitter in seconds")
+    parser.add_argument("--loss", type=float, default=0.05, help="packet loss probability per direction")
+    parser.add_argument("--crowd", type=int, default=1000, help="extra entities wandering the world")
+    parser.add_argument("--tick-rate", type=int, default=20)
+    args = parser.parse_args()
+
+    # Heroes narrate every attack; keep the report readable
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            report = asyncio.run(run_loopback(args.clients, args.seconds, args.latency, args.jitter,
+                                              args.loss, args.crowd, tick_rate=args.tick_rate))
+        finally:
+            sys.stdout = stdout
+
+    print(f"{report['clients']} clients, {report['entities']} entities, {report['ticks']} ticks")
+    print(f"Server tick: {report['tick_ms_mean']:.3f} ms mean, {report['tick_ms_max']:.3f} ms max, "
+          f"{report['grid_rechecks']:.0f} grid re-reads per tick")
+    print(f"Per client: {report['visible_per_client']:.1f} entities in view, "
+          f"{report['bytes_per_snapshot']:.0f} B per snapshot, {report['bytes_per_second_per_client'] / 1024:.1f} KiB/s")
+    print(f"Packets: {report['undecodable']} undecodable, {report['stale']} stale; "
+          f"own hero off by {report['hero_error_px']:.1f} px")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import struct
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Packet types (first byte of every datagram)
+MSG_HELLO = 1       # client -> server: join, asking for an entity to control
+MSG_WELCOME = 2     # server -> client: assigned client id and entity
+MSG_INPUT = 3       # client -> server: latest snapshot tick received, plus held input
+MSG_SNAPSHOT = 4    # server -> client: entity states, delta-encoded against an acked snapshot
+MSG_BYE = 5         # either way: leaving
+
+ANY_ENTITY = 0xFFFF
+MAX_PACKET = 1200   # stays under common path MTUs once IP/UDP headers are added
+
+HELLO = struct.Struct('<BH')
+WELCOME = struct.Struct('<BHHH')
+INPUT = struct.Struct('<BIbbB')
+SNAPSHOT = struct.Struct('<BIIHH')
+ENTRY = struct.Struct('<HH')
+ENTITY_ID = struct.Struct('<H')
+
+# Input buttons
+BUTTON_ATTACK = 1
+BUTTON_LONG = 2
+BUTTON_SPECIAL = 4
+
+# Entity kinds
+KIND_HERO = 0
+KIND_ENEMY = 1
+
+# Animations by wire index; unknown names are sent as idle
+ANIMATIONS = ('idle', 'walk', 'attack', 'hurt', 'special', 'death')
+_ANIMATION_INDEX = {name: i for i, name in enumerate(ANIMATIONS)}
+
+FLAG_FACING_RIGHT = 1
+FLAG_ATTACKING = 2
+
+# Quantisation: positions to 1/4 px (worlds up to 16384 px), velocities to
+# 1/4 px/s, HP and energy to 1/10
+POSITION_SCALE = 4.0
+VELOCITY_SCALE = 4.0
+STAT_SCALE = 10.0
+
+# Wire fields of a quantised entity state, in order, with their struct codes
+FIELDS = (("kind", "B"), ("x", "H"), ("y", "H"), ("vx", "h"), ("vy", "h"),
+          ("hp", "H"), ("energy", "H"), ("animation", "B"), ("frame", "B"), ("flags", "B"))
+FULL_MASK = (1 << len(FIELDS)) - 1
+
+# A quantised entity state: one int per field of FIELDS
+Quantised = Tuple[int, ...]
+
+class EntityState(NamedTuple):
+    """A dequantised entity state as a client sees it."""
+    kind: int
+    x: float
+    y: float
+    vx: float
+    vy: float
+    hp: float
+    energy: float
+    animation: str
+    frame: int
+    facing_right: bool
+    is_attacking: bool
+
+def _clamp(value: float, low: int, high: int) -> int:
+    value = int(round(value))
+    return low if value < low else high if value > high else value
+
+def quantise(entity) -> Quantised:
+    """Quantised wire state of a hero or enemy, as a tuple in FIELDS order."""
+    is_hero = hasattr(entity, "current_hp")
+    flags = 0
+    if getattr(entity, "facing_right", True):
+        flags |= FLAG_FACING_RIGHT
+    if getattr(entity, "is_attacking", False):
+        flags |= FLAG_ATTACKING
+    return (
+        KIND_HERO if is_hero else KIND_ENEMY,
+        _clamp(entity.x * POSITION_SCALE, 0, 0xFFFF),
+        _clamp(entity.y * POSITION_SCALE, 0, 0xFFFF),
+        _clamp(getattr(entity, "velocity_x", 0) * VELOCITY_SCALE, -0x8000, 0x7FFF),
+        _clamp(getattr(entity, "velocity_y", 0) * VELOCITY_SCALE, -0x8000, 0x7FFF),
+        _clamp((entity.current_hp if is_hero else entity.hp) * STAT_SCALE, 0, 0xFFFF),
+        _clamp(getattr(entity, "current_energy", 0) * STAT_SCALE, 0, 0xFFFF),
+        _ANIMATION_INDEX.get(getattr(entity, "current_animation", "idle"), 0),
+        min(getattr(entity, "animation_frame", 0), 0xFF),
+        flags,
+    )
+
+def dequantise(state: Sequence[int]) -> EntityState:
+    kind, x, y, vx, vy, hp, energy, animation, frame, flags = state
+    return EntityState(kind, x / POSITION_SCALE, y / POSITION_SCALE, vx / VELOCITY_SCALE, vy / VELOCITY_SCALE,
+                       hp / STAT_SCALE, energy / STAT_SCALE,
+                       ANIMATIONS[animation] if animation < len(ANIMATIONS) else 'idle', frame,
+                       bool(flags & FLAG_FACING_RIGHT), bool(flags & FLAG_ATTACKING))
+
+def delta_mask(old: Optional[Sequence[int]], new: Sequence[int]) -> int:
+    """Bit i set when field i differs; every field for an entity the receiver does not have."""
+    if old is None:
+        return FULL_MASK
+    mask = 0
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a != b:
+            mask |= 1 << i
+    return mask
+
+@lru_cache(maxsize=None)
+def _field_struct(mask: int) -> Tuple[struct.Struct, Tuple[int, ...]]:
+    """Struct packing just the masked fields, and their indices."""
+    indices = tuple(i for i in range(len(FIELDS)) if mask & (1 << i))
+    return struct.Struct('<' + ''.join(FIELDS[i][1] for i in indices)), indices
+
+def encode_entry(entity_id: int, mask: int, state: Sequence[int]) -> bytes:
+    packer, indices = _field_struct(mask)
+    return ENTRY.pack(entity_id, mask) + packer.pack(*[state[i] for i in indices])
+
+def encode_snapshot(tick: int, baseline: int, removed: Sequence[int], entries: Iterable[bytes],
+                    entry_count: int) -> bytes:
+    """Snapshot packet: header, removed entity ids, then pre-encoded entries."""
+    parts = [SNAPSHOT.pack(MSG_SNAPSHOT, tick, baseline, len(removed), entry_count)]
+    parts.extend(ENTITY_ID.pack(entity_id) for entity_id in removed)
+    parts.extend(entries)
+    return b''.join(parts)
+
+def decode_snapshot(data: bytes, baselines: Dict[int, Dict[int, Quantised]]
+                    ) -> Optional[Tuple[int, Dict[int, Quantised]]]:
+    """Rebuild the full entity states of a snapshot packet.
+
+    Returns (tick, states), or None when the packet's baseline is not in
+    `baselines` (it was never received or already dropped); the server
+    falls back to an older baseline once it stops hearing acks for it.
+    Raises struct.error on truncated packets.
+    """
+    _, tick, baseline, removed_count, entry_count = SNAPSHOT.unpack_from(data, 0)
+    if baseline:
+        base = baselines.get(baseline)
+        if base is None:
+            return None
+        states = dict(base)
+    else:
+        states = {}
+    pos = SNAPSHOT.size
+    for _ in range(removed_count):
+        entity_id, = ENTITY_ID.unpack_from(data, pos)
+        states.pop(entity_id, None)
+        pos += ENTITY_ID.size
+    for _ in range(entry_count):
+        entity_id, mask = ENTRY.unpack_from(data, pos)
+        pos += ENTRY.size
+        packer, indices = _field_struct(mask & FULL_MASK)
+        values = packer.unpack_from(data, pos)
+        pos += packer.size
+        old = states.get(entity_id)
+        if old is None and mask != FULL_MASK:
+            continue  # a partial update for an entity we never had; cannot happen with a valid baseline
+        state: List[int] = list(old) if old is not None else [0] * len(FIELDS)
+        for i, value in zip(indices, values):
+            state[i] = value
+        states[entity_id] = tuple(state)
+    return tick, states
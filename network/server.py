@@ -0,0 +1,271 @@
+import asyncio
+import struct
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from network.interest import InterestGrid
+from network.protocol import (ANY_ENTITY, BUTTON_ATTACK, BUTTON_LONG, BUTTON_SPECIAL, ENTITY_ID, HELLO,
+                              INPUT, MAX_PACKET, MSG_BYE, MSG_HELLO, MSG_INPUT, MSG_WELCOME, SNAPSHOT,
+                              WELCOME, delta_mask, encode_entry, encode_snapshot, quantise)
+
+Address = Tuple[str, int]
+
+class ClientConnection:
+    """Server-side view of one client: what it was sent and what it acknowledged."""
+
+    def __init__(self, client_id: int, address: Address, entity_id: int, now: float):
+        self.client_id = client_id
+        self.address = address
+        self.entity_id = entity_id
+        self.last_heard = now
+        # Entity states per sent snapshot tick, kept until acked or too old to use
+        self.sent: 'OrderedDict[int, Dict[int, Tuple[int, ...]]]' = OrderedDict()
+        self.acked = 0
+        self.input = (0, 0, 0)
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.entries_sent = 0
+        self.visible = 0
+
+class SyncServer(asyncio.DatagramProtocol):
+    """Authoritative UDP state server.
+
+    Every tick each client gets one snapshot of the entities within
+    `view_radius` of the entity it controls, delta-encoded against the
+    latest snapshot it acknowledged (or in full if it has acknowledged none
+    that is still kept). Unchanged entities cost nothing; entities leaving
+    the view are listed by id. Quantisation happens at most once per entity
+    per tick and only for entities some client can see, and the interest
+    grid re-reads an entity only when its speed says it may have changed
+    cell, so tick cost follows what is near clients, not the world size.
+
+    Usage:
+        server = SyncServer()
+        host, port = await server.start()
+        hero_id = server.add_entity(hero)
+        server.update()   # once per network tick, after the simulation step
+    """
+
+    def __init__(self, view_radius: float = 700.0, cell_size: float = 256.0, tick_rate: int = 20,
+                 max_packet: int = MAX_PACKET, history: int = 32, timeout: float = 5.0):
+        self.view_radius = view_radius
+        self.tick_rate = tick_rate
+        self.max_packet = max_packet
+        self.history = history
+        self.timeout = timeout
+        self.tick = 0
+
+        self.entities: Dict[int, object] = {}
+        self._next_entity_id = 1
+        self.grid = InterestGrid(cell_size)
+        self.clients: Dict[Address, ClientConnection] = {}
+        self._next_client_id = 1
+        self._transport = None
+        self._link = None
+
+        self.last_tick_ms = 0.0
+        self.packets_rejected = 0
+
+    # Entities
+
+    def add_entity(self, entity, max_speed: Optional[float] = None) -> int:
+        """Start syncing an entity (anything with x and y); returns its network id.
+
+        max_speed (px/s per axis) defaults to the entity's `speed`; entities
+        with neither are re-read by the interest grid every tick.
+        """
+        entity_id = self._next_entity_id
+        if entity_id >= ANY_ENTITY:
+            raise ValueError("out of network entity ids")
+        self._next_entity_id += 1
+        self.entities[entity_id] = entity
+        if max_speed is None:
+            max_speed = getattr(entity, "speed", None)
+        self.grid.track(entity_id, entity, max_speed)
+        return entity_id
+
+    def touch_entity(self, entity_id: int):
+        """Tell the interest grid an entity jumped (teleport, respawn, state restore)."""
+        if entity_id in self.entities:
+            self.grid.touch(entity_id)
+
+    def remove_entity(self, entity_id: int):
+        self.entities.pop(entity_id, None)
+        self.grid.remove(entity_id)
+
+    # Transport
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, link=None) -> Address:
+        """Bind the UDP socket; returns the bound address. `link` may simulate a lossy network."""
+        self._link = link
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        return self._transport.get_extra_info("sockname")[:2]
+
+    def connection_made(self, transport):
+        self._transport = self._link.wrap(transport) if self._link is not None else transport
+
+    def close(self):
+        if self._transport is not None:
+            for address in self.clients:
+                self._transport.sendto(bytes((MSG_BYE,)), address)
+            self._transport.close()
+            self._transport = None
+
+    def datagram_received(self, data: bytes, address: Address):
+        try:
+            kind = data[0]
+            if kind == MSG_INPUT:
+                self._on_input(data, address)
+            elif kind == MSG_HELLO:
+                self._on_hello(data, address)
+            elif kind == MSG_BYE:
+                self.clients.pop(address, None)
+            else:
+                self.packets_rejected += 1
+        except (IndexError, struct.error):
+            self.packets_rejected += 1
+
+    def error_received(self, exc):
+        print(f"Network server error: {exc}")
+
+    def _on_hello(self, data: bytes, address: Address):
+        _, requested = HELLO.unpack_from(data, 0)
+        client = self.clients.get(address)
+        if client is None:
+            entity_id = self._assign_entity(requested)
+            client = ClientConnection(self._next_client_id, address, entity_id, time.monotonic())
+            self._next_client_id += 1
+            self.clients[address] = client
+        # Answer repeated hellos too: the first welcome may have been lost
+        self._send(client, WELCOME.pack(MSG_WELCOME, client.client_id, client.entity_id, self.tick_rate))
+
+    def _assign_entity(self, requested: int) -> int:
+        taken = {client.entity_id for client in self.clients.values()}
+        if requested in self.entities and requested not in taken:
+            return requested
+        for entity_id, entity in self.entities.items():
+            if entity_id not in taken and hasattr(entity, "current_hp"):
+                return entity_id
+        return ANY_ENTITY  # spectator
+
+    def _on_input(self, data: bytes, address: Address):
+        client = self.clients.get(address)
+        if client is None:
+            self.packets_rejected += 1
+            return
+        _, ack, dx, dy, buttons = INPUT.unpack_from(data, 0)
+        client.last_heard = time.monotonic()
+        if ack > client.acked and ack in client.sent:
+            client.acked = ack
+            # Older snapshots can no longer be a baseline
+            while next(iter(client.sent)) < ack:
+                client.sent.popitem(last=False)
+        entity = self.entities.get(client.entity_id)
+        if entity is None:
+            return
+        dx = max(-1, min(1, dx))
+        dy = max(-1, min(1, dy))
+        if (dx, dy) != client.input[:2] and hasattr(entity, "move"):
+            entity.move(dx, dy)
+        if buttons and hasattr(entity, "attack"):
+            if buttons & BUTTON_SPECIAL:
+                entity.attack("special")
+            elif buttons & BUTTON_LONG:
+                entity.attack("long")
+            elif buttons & BUTTON_ATTACK:
+                entity.attack()
+        client.input = (dx, dy, buttons)
+
+    def _send(self, client: ClientConnection, packet: bytes):
+        if self._transport is not None:
+            self._transport.sendto(packet, client.address)
+            client.bytes_sent += len(packet)
+            client.packets_sent += 1
+
+    # Snapshots
+
+    def update(self, sim_time: Optional[float] = None) -> int:
+        """Send this tick's snapshots; returns the bytes sent.
+
+        sim_time is the simulation clock in seconds, which bounds how far
+        entities can have moved; it defaults to the wall clock.
+        """
+        start = time.perf_counter()
+        self.tick += 1
+        now = time.monotonic()
+        for address in [a for a, c in self.clients.items() if now - c.last_heard > self.timeout]:
+            print(f"Network client {self.clients[address].client_id} timed out")
+            del self.clients[address]
+
+        self.grid.refresh(sim_time if sim_time is not None else now)
+
+        quantised: Dict[int, Tuple[int, ...]] = {}
+        sent = 0
+        for client in self.clients.values():
+            sent += self._send_snapshot(client, quantised)
+        self.last_tick_ms = (time.perf_counter() - start) * 1000.0
+        return sent
+
+    def _send_snapshot(self, client: ClientConnection, quantised: Dict[int, Tuple[int, ...]]) -> int:
+        focus = self.entities.get(client.entity_id)
+        if focus is not None:
+            visible = self.grid.query(focus.x, focus.y, self.view_radius)
+        else:
+            # Spectators see everything; fine for a handful of entities in tests
+            visible = [(0.0, entity_id) for entity_id in self.entities]
+        client.visible = len(visible)
+
+        base = client.sent.get(client.acked) if client.acked else None
+        baseline_tick = client.acked if base is not None else 0
+        base = base or {}
+        visible_ids = {entity_id for _, entity_id in visible}
+        removed = [entity_id for entity_id in base if entity_id not in visible_ids]
+
+        entities = self.entities
+        size = SNAPSHOT.size + len(removed) * ENTITY_ID.size
+        state: Dict[int, Tuple[int, ...]] = {}
+        entries: List[bytes] = []
+        # Nearest first, so a full packet drops the farthest updates
+        for _, entity_id in visible:
+            q = quantised.get(entity_id)
+            if q is None:
+                q = quantised[entity_id] = quantise(entities[entity_id])
+            old = base.get(entity_id)
+            if old == q:
+                state[entity_id] = q
+                continue
+            entry = encode_entry(entity_id, delta_mask(old, q), q)
+            if size + len(entry) > self.max_packet:
+                # Does not fit: the client keeps what it had, and so does our record of it
+                if old is not None:
+                    state[entity_id] = old
+                continue
+            entries.append(entry)
+            size += len(entry)
+            state[entity_id] = q
+
+        tick = self.tick
+        client.sent[tick] = state
+        while len(client.sent) > self.history:
+            client.sent.popitem(last=False)
+        client.entries_sent += len(entries)
+        packet = encode_snapshot(tick, baseline_tick, removed, entries, len(entries))
+        self._send(client, packet)
+        return len(packet)
+
+    def stats(self) -> Dict[str, float]:
+        """Per-tick cost and per-client bandwidth figures."""
+        clients = list(self.clients.values())
+        return {
+            "tick": self.tick,
+            "entities": len(self.entities),
+            "clients": len(clients),
+            "tick_ms": self.last_tick_ms,
+            "bytes_per_client_tick": (sum(c.bytes_sent for c in clients) / sum(c.packets_sent for c in clients)
+                                      if clients and any(c.packets_sent for c in clients) else 0.0),
+            "grid_rechecks": self.grid.rechecks_last_refresh,
+            "visible_per_client": sum(c.visible for c in clients) / len(clients) if clients else 0.0,
+            "rejected_packets": self.packets_rejected,
+        }
@@ -0,0 +1,100 @@
+"""
+Observable fields and a per-tick change bus.
+
+Declare fields on a class with ObservableField and give instances a
+`change_bus`; every assignment that changes a value is recorded, and
+ChangeBus.flush() (once per tick) delivers one coalesced ChangeEvent per
+changed object to the subscribers interested in those fields. A value
+that changes and changes back within a tick produces no event, and
+objects whose fields did not change cost nothing at flush time.
+
+Usage:
+    class Hero:
+        current_hp = ObservableField()
+        change_bus = None
+
+    bus = ChangeBus()
+    hero.change_bus = bus
+    bus.subscribe(lambda event: print(event.changes), fields=("current_hp",))
+    hero.current_hp -= 10
+    bus.flush()       # -> {'current_hp': (120, 110)}
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_MISSING = object()
+
+class ChangeEvent(NamedTuple):
+    source: Any
+    changes: Dict[str, Tuple[Any, Any]]  # field -> (value at the start of the tick, value now)
+
+class ObservableField:
+    """Attribute that reports changed assignments to its owner's `change_bus`.
+
+    Only __set__ is defined and the value lives in the instance __dict__
+    under the attribute's own name, so reads are ordinary attribute lookups
+    at full speed; only writes pay for the comparison.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __set__(self, obj, value):
+        values = obj.__dict__
+        old = values.get(self.name, _MISSING)
+        values[self.name] = value
+        if old is not _MISSING and old != value:
+            bus = obj.change_bus
+            if bus is not None:
+                bus.record(obj, self.name, old, value)
+
+class ChangeBus:
+    """Collects field changes during a tick and publishes them on flush()."""
+
+    def __init__(self):
+        self._pending: Dict[int, Tuple[Any, Dict[str, List]]] = {}
+        self._subscribers: List[Tuple[Callable[[ChangeEvent], None], Optional[frozenset]]] = []
+        self.events_last_flush = 0
+
+    def record(self, source, name: str, old, new):
+        pending = self._pending.get(id(source))
+        if pending is None:
+            pending = self._pending[id(source)] = (source, {})
+        change = pending[1].get(name)
+        if change is None:
+            pending[1][name] = [old, new]
+        else:
+            # Keep the value from the start of the tick; only the latest new value matters
+            change[1] = new
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None], fields: Optional[Iterable[str]] = None):
+        """Call `callback` with each flushed event touching `fields` (all fields if None)."""
+        self._subscribers.append((callback, frozenset(fields) if fields is not None else None))
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]):
+        self._subscribers = [(c, f) for c, f in self._subscribers if c is not callback]
+
+    def flush(self) -> int:
+        """Deliver this tick's coalesced changes; returns the number of events sent."""
+        if not self._pending:
+            self.events_last_flush = 0
+            return 0
+        pending = self._pending
+        self._pending = {}
+        events = 0
+        for source, fields in pending.values():
+            changes = {name: (old, new) for name, (old, new) in fields.items() if old != new}
+            if not changes:
+                continue
+            event = ChangeEvent(source, changes)
+            events += 1
+            for callback, wanted in self._subscribers:
+                if wanted is None or not wanted.isdisjoint(changes):
+                    callback(event)
+        self.events_last_flush = events
+        return events
+
+    def clear(self):
+        """Drop changes not yet flushed."""
+        self._pending.clear()
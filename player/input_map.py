@@ -0,0 +1,264 @@
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+# Actions are bit flags, so a frame's input is a couple of ints however many
+# events produced it
+SELECT_PREV = 1 << 0
+SELECT_NEXT = 1 << 1
+ATTACK = 1 << 2
+LONG_ATTACK = 1 << 3
+SPECIAL = 1 << 4
+SUPER = 1 << 5
+HURT = 1 << 6
+SPAWN_WAVE = 1 << 7
+MOVE_UP = 1 << 8
+MOVE_DOWN = 1 << 9
+MOVE_LEFT = 1 << 10
+MOVE_RIGHT = 1 << 11
+QUIT = 1 << 16
+TOGGLE_STATS = 1 << 17
+TOGGLE_PROFILER = 1 << 18
+DUMP_TRACE = 1 << 19
+TOGGLE_METRICS = 1 << 20
+EXPORT_METRICS = 1 << 21
+QUICK_SAVE = 1 << 22
+QUICK_LOAD = 1 << 23
+REWIND = 1 << 24
+
+ACTIONS: Dict[str, int] = {
+    "select_prev": SELECT_PREV, "select_next": SELECT_NEXT, "attack": ATTACK, "long_attack": LONG_ATTACK,
+    "special": SPECIAL, "super": SUPER, "hurt": HURT, "spawn_wave": SPAWN_WAVE,
+    "move_up": MOVE_UP, "move_down": MOVE_DOWN, "move_left": MOVE_LEFT, "move_right": MOVE_RIGHT,
+    "quit": QUIT, "toggle_stats": TOGGLE_STATS, "toggle_profiler": TOGGLE_PROFILER, "dump_trace": DUMP_TRACE,
+    "toggle_metrics": TOGGLE_METRICS, "export_metrics": EXPORT_METRICS, "quick_save": QUICK_SAVE,
+    "quick_load": QUICK_LOAD, "rewind": REWIND,
+}
+
+MOVE_ACTIONS = MOVE_UP | MOVE_DOWN | MOVE_LEFT | MOVE_RIGHT
+# Actions that change the simulation (recorded in replays); the rest are UI
+SIM_ACTIONS = (SELECT_PREV | SELECT_NEXT | ATTACK | LONG_ATTACK | SPECIAL | SUPER | HURT | SPAWN_WAVE
+               | MOVE_ACTIONS)
+
+DEFAULT_KEY_BINDINGS: Dict[int, int] = {
+    pygame.K_LEFT: SELECT_PREV,
+    pygame.K_RIGHT: SELECT_NEXT,
+    pygame.K_SPACE: ATTACK,
+    pygame.K_f: LONG_ATTACK,
+    pygame.K_q: SPECIAL,
+    pygame.K_e: SUPER,
+    pygame.K_h: HURT,
+    pygame.K_n: SPAWN_WAVE,
+    pygame.K_w: MOVE_UP,
+    pygame.K_a: MOVE_LEFT,
+    pygame.K_d: MOVE_RIGHT,
+    pygame.K_ESCAPE: QUIT,
+    pygame.K_s: TOGGLE_STATS,
+    pygame.K_F3: TOGGLE_PROFILER,
+    pygame.K_F4: DUMP_TRACE,
+    pygame.K_F6: TOGGLE_METRICS,
+    pygame.K_F7: EXPORT_METRICS,
+    pygame.K_F9: QUICK_SAVE,
+    pygame.K_F10: QUICK_LOAD,
+    pygame.K_BACKSPACE: REWIND,
+}
+
+# Standard controller layout: A, B, X, Y, LB, RB, Back
+DEFAULT_BUTTON_BINDINGS: Dict[int, int] = {
+    0: ATTACK,
+    1: SPECIAL,
+    2: LONG_ATTACK,
+    3: SUPER,
+    4: SELECT_PREV,
+    5: SELECT_NEXT,
+    6: TOGGLE_STATS,
+}
+
+class ActionState:
+    """One frame of input: actions that went down, are held, and went up."""
+
+    __slots__ = ("pressed", "held", "released")
+
+    def __init__(self, pressed: int = 0, held: int = 0, released: int = 0):
+        self.pressed = pressed
+        self.held = held
+        self.released = released
+
+    def direction(self) -> Tuple[int, int]:
+        """Movement direction (-1, 0 or 1 per axis) from the held move actions."""
+        return direction_of(self.held)
+
+def direction_of(held: int) -> Tuple[int, int]:
+    dx = bool(held & MOVE_RIGHT) - bool(held & MOVE_LEFT)
+    dy = bool(held & MOVE_DOWN) - bool(held & MOVE_UP)
+    return dx, dy
+
+class InputMap:
+    """Maps keys and gamepads to actions and coalesces each frame's events.
+
+    poll() drains the event queue once per frame and returns an
+    ActionState; gameplay reads that instead of individual events, so a key
+    repeated fifty times in a frame is still one press. Per event the work
+    is a dictionary lookup and a bit operation. Gamepad sticks are not read
+    from events at all: axis motion is blocked from the queue and the axes
+    are sampled once per poll, so a flood of stick events costs nothing.
+
+    Usage:
+        input_map = InputMap()
+        input_map.install()             # once, after pygame.display.init()
+        state = input_map.poll()        # once per frame
+        if state.pressed & ATTACK: ...
+    """
+
+    def __init__(self, key_bindings: Optional[Dict[int, int]] = None,
+                 button_bindings: Optional[Dict[int, int]] = None, deadzone: float = 0.5):
+        self.key_bindings: Dict[int, int] = dict(DEFAULT_KEY_BINDINGS if key_bindings is None else key_bindings)
+        self.button_bindings: Dict[int, int] = dict(DEFAULT_BUTTON_BINDINGS if button_bindings is None
+                                                    else button_bindings)
+        self.deadzone = deadzone
+        self._keys_down: Dict[int, int] = {}      # key -> its action, while held
+        self._buttons_down: Dict[Tuple[int, int], int] = {}
+        self._hats: Dict[int, int] = {}           # instance id -> move actions from the d-pad
+        self._held = 0
+        self._gamepads: Dict[int, object] = {}
+        self.events_last_poll = 0
+
+    # Bindings
+
+    def bind_key(self, key: int, action: int):
+        self.key_bindings[key] = action
+
+    def unbind_key(self, key: int):
+        self.key_bindings.pop(key, None)
+
+    def bind_button(self, button: int, action: int):
+        self.button_bindings[button] = action
+
+    def load_bindings(self, path: str) -> bool:
+        """Override bindings from JSON: {"keys": {"w": "move_up", ...}, "buttons": {"0": "attack", ...}}."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            keys = {pygame.key.key_code(name): ACTIONS[action] for name, action in data.get("keys", {}).items()}
+            buttons = {int(button): ACTIONS[action] for button, action in data.get("buttons", {}).items()}
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            print(f"Error loading input bindings from {path}: {e}")
+            return False
+        self.key_bindings.update(keys)
+        self.button_bindings.update(buttons)
+        return True
+
+    def save_bindings(self, path: str) -> bool:
+        names = {flag: name for name, flag in ACTIONS.items()}
+        data = {
+            "keys": {pygame.key.name(key): names[action] for key, action in self.key_bindings.items()},
+            "buttons": {str(button): names[action] for button, action in self.button_bindings.items()},
+        }
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            return True
+        except OSError as e:
+            print(f"Error saving input bindings to {path}: {e}")
+            return False
+
+    # Event queue
+
+    def install(self, gamepads: bool = True):
+        """Admit only the events poll() uses, so unrelated floods never reach the queue."""
+        allowed = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP]
+        if gamepads:
+            if not pygame.joystick.get_init():
+                pygame.joystick.init()
+            allowed += [pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYHATMOTION,
+                        pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED]
+            for index in range(pygame.joystick.get_count()):
+                self._add_gamepad(index)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(allowed)
+
+    def _add_gamepad(self, device_index: int):
+        joystick = pygame.joystick.Joystick(device_index)
+        self._gamepads[joystick.get_instance_id()] = joystick
+
+    def poll(self, events: Optional[Iterable] = None) -> ActionState:
+        """Coalesce this frame's events (the pygame queue by default) into an ActionState."""
+        if events is None:
+            events = pygame.event.get()
+        keys = self.key_bindings
+        keys_down = self._keys_down
+        pressed = 0
+        released = 0
+        count = 0
+        for event in events:
+            count += 1
+            kind = event.type
+            if kind == pygame.KEYDOWN:
+                action = keys.get(event.key)
+                if action:
+                    pressed |= action
+                    keys_down[event.key] = action
+            elif kind == pygame.KEYUP:
+                action = keys_down.pop(event.key, 0)
+                released |= action
+            elif kind == pygame.QUIT:
+                pressed |= QUIT
+            elif kind == pygame.JOYBUTTONDOWN:
+                action = self.button_bindings.get(event.button)
+                if action:
+                    pressed |= action
+                    self._buttons_down[(event.instance_id, event.button)] = action
+            elif kind == pygame.JOYBUTTONUP:
+                released |= self._buttons_down.pop((event.instance_id, event.button), 0)
+            elif kind == pygame.JOYHATMOTION:
+                x, y = event.value
+                self._hats[event.instance_id] = ((MOVE_RIGHT if x > 0 else MOVE_LEFT if x < 0 else 0)
+                                                 | (MOVE_UP if y > 0 else MOVE_DOWN if y < 0 else 0))
+            elif kind == pygame.JOYDEVICEADDED:
+                self._add_gamepad(event.device_index)
+            elif kind == pygame.JOYDEVICEREMOVED:
+                self._gamepads.pop(event.instance_id, None)
+                self._hats.pop(event.instance_id, None)
+        self.events_last_poll = count
+
+        held = 0
+        for action in keys_down.values():
+            held |= action
+        for action in self._buttons_down.values():
+            held |= action
+        for action in self._hats.values():
+            held |= action
+        held |= self._stick_actions()
+        # A tap shorter than a frame still counts as a press
+        previous, self._held = self._held, held
+        return ActionState(pressed | (held & ~previous), held, released | (previous & ~held))
+
+    def _stick_actions(self) -> int:
+        actions = 0
+        deadzone = self.deadzone
+        for joystick in self._gamepads.values():
+            if joystick.get_numaxes() < 2:
+                continue
+            x = joystick.get_axis(0)
+            y = joystick.get_axis(1)
+            if x > deadzone:
+                actions |= MOVE_RIGHT
+            elif x < -deadzone:
+                actions |= MOVE_LEFT
+            if y > deadzone:
+                actions |= MOVE_DOWN
+            elif y < -deadzone:
+                actions |= MOVE_UP
+        return actions
+
+    def reset(self):
+        """Forget held inputs (e.g. after the window loses focus)."""
+        self._keys_down.clear()
+        self._buttons_down.clear()
+        self._hats.clear()
+        self._held = 0
+
+def actions_to_names(actions: int) -> List[str]:
+    """Names of the actions in a mask, for logs and debugging."""
+    return [name for name, flag in ACTIONS.items() if actions & flag]
@@ -0,0 +1,140 @@
+import pygame
+from operator import itemgetter
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+# Draw layers, back to front. Commands that must overlap in submission order
+# belong on different layers: within a layer commands are grouped by texture.
+LAYER_BACKGROUND = 0
+LAYER_TILES = 10
+LAYER_SPRITE_GLOW = 15
+LAYER_SPRITES = 20
+LAYER_SPRITE_MARKERS = 25
+LAYER_EFFECTS = 30
+LAYER_HUD_PANELS = 40
+LAYER_HUD = 45
+LAYER_OVERLAY = 50
+
+_sort_key = itemgetter(0, 1)
+
+def _blit_batch(target: pygame.Surface, blits: Iterable[Sequence]):
+    target.blits(blits, doreturn=False)
+
+class RenderQueue:
+    """Collects draw commands during a frame and submits them in batches.
+
+    Commands are sorted once per frame by (layer, texture) and sent to
+    Surface.blits in runs of up to `batch_size`, so a frame with hundreds of
+    sprites and labels costs a handful of Python-to-SDL calls instead of one
+    per item. Each flush records how many commands and draw calls it made.
+    """
+
+    def __init__(self, batch_size: int = 1024):
+        self.batch_size = batch_size
+        # (layer, texture key, blit tuple or None, callable or None)
+        self._commands: List[Tuple] = []
+        self.commands_last_frame = 0
+        self.draw_calls_last_frame = 0
+        self.culled_last_frame = 0
+        self._culled = 0
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def submit(self, surface: pygame.Surface, dest, layer: int = LAYER_SPRITES,
+               area: Optional[pygame.Rect] = None, special_flags: int = 0):
+        """Queue one blit."""
+        if area is None and not special_flags:
+            blit = (surface, dest)
+        else:
+            blit = (surface, dest, area, special_flags)
+        self._commands.append((layer, id(surface), blit, None))
+
+    def submit_many(self, blits: Iterable[Sequence], layer: int = LAYER_SPRITES):
+        """Queue several (surface, dest[, area, flags]) blits on one layer."""
+        append = self._commands.append
+        for blit in blits:
+            append((layer, id(blit[0]), tuple(blit), None))
+
+    def submit_sprites(self, sprites: Iterable[pygame.sprite.Sprite], layer: int = LAYER_SPRITES,
+                       camera=None) -> int:
+        """Queue sprite images at their rects, culling against a camera if given.
+
+        Returns the number of sprites queued.
+        """
+        append = self._commands.append
+        queued = 0
+        culled = 0
+        if camera is None:
+            for sprite in sprites:
+                append((layer, id(sprite.image), (sprite.image, sprite.rect), None))
+                queued += 1
+        else:
+            colliderect = camera.view.colliderect
+            ox, oy = camera.offset
+            for sprite in sprites:
+                if colliderect(sprite.rect):
+                    append((layer, id(sprite.image), (sprite.image, sprite.rect.move(ox, oy)), None))
+                    queued += 1
+                else:
+                    culled += 1
+        self._culled += culled
+        return queued
+
+    def submit_batch(self, blits: Iterable[Sequence], layer: int = LAYER_EFFECTS):
+        """Queue a prebuilt blits() sequence (e.g. particles) as a single command.
+
+        The sequence is drawn as-is in one call, without per-item sorting; an
+        iterator is consumed at flush time.
+        """
+        if blits:
+            self._commands.append((layer, 0, None, (_blit_batch, (blits,))))
+
+    def submit_draw(self, func: Callable, *args, layer: int = LAYER_SPRITE_MARKERS):
+        """Queue a non-blit draw call such as pygame.draw.rect(target, ...).
+
+        The target surface is passed as the first argument at flush time.
+        Each one ends the current blit batch, so keep them on their own layer.
+        """
+        self._commands.append((layer, 0, None, (func, args)))
+
+    def flush(self, target: pygame.Surface) -> int:
+        """Draw all queued commands onto target and clear the queue.
+
+        Returns the number of draw calls made.
+        """
+        commands = self._commands
+        commands.sort(key=_sort_key)
+
+        draw_calls = 0
+        batch = []
+        batch_size = self.batch_size
+        for _, _, blit, draw in commands:
+            if blit is not None:
+                batch.append(blit)
+                if len(batch) >= batch_size:
+                    target.blits(batch, doreturn=False)
+                    draw_calls += 1
+                    batch = []
+            else:
+                if batch:
+                    target.blits(batch, doreturn=False)
+                    draw_calls += 1
+                    batch = []
+                func, args = draw
+                func(target, *args)
+                draw_calls += 1
+        if batch:
+            target.blits(batch, doreturn=False)
+            draw_calls += 1
+
+        self.commands_last_frame = len(commands)
+        self.draw_calls_last_frame = draw_calls
+        self.culled_last_frame = self._culled
+        self._culled = 0
+        commands.clear()
+        return draw_calls
+
+    def clear(self):
+        """Drop queued commands without drawing them."""
+        self._commands.clear()
+        self._culled = 0
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Deterministic replay recording and playback for the character demo.
+
+A replay stores the session seed and, per frame, the frame time, the
+simulation actions pressed and held (bit masks from player.input_map) and
+the number of AI decisions made. Every `checksum_interval` frames it also
+stores a CRC of the simulation state, so playback can report the first
+frame where it diverged.
+
+File format: an uncompressed header (magic, version, seed, checksum
+interval) followed by one zlib stream of varint-encoded frame records.
+
+Usage:
+    python main.py --record session.nkreplay
+    python replay.py session.nkreplay              # headless, as fast as possible
+    python replay.py session.nkreplay --realtime   # headless, paced by recorded frame times
+    python main.py --replay session.nkreplay       # rendered, in real time
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from typing import Dict, Iterator, NamedTuple, Optional
+
+REPLAY_MAGIC = b'NKRP'
+REPLAY_VERSION = 2  # 2: action masks instead of key codes
+HEADER = struct.Struct('<4sHQI')
+CHECKSUM = struct.Struct('<I')
+REPLAY_EXTENSION = ".nkreplay"
+
+class ReplayFrame(NamedTuple):
+    dt: float
+    pressed: int
+    held: int
+    decisions: int
+    checksum: Optional[int]
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(data: bytes, pos: int):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+class ReplayWriter:
+    """Streams frame records into a compressed replay file."""
+
+    def __init__(self, path: str, seed: int, checksum_interval: int = 60):
+        self.path = path
+        self.seed = seed
+        self.checksum_interval = checksum_interval
+        self.frames = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, checksum_interval))
+        self._compressor = zlib.compressobj(9)
+        self._buffer = bytearray()
+
+    def wants_checksum(self) -> bool:
+        """Whether the frame about to be recorded should carry a state checksum."""
+        return self.checksum_interval > 0 and (self.frames + 1) % self.checksum_interval == 0
+
+    def record_frame(self, dt: float, pressed: int, held: int, decisions: int, checksum: Optional[int] = None):
+        """Append one frame; pass a checksum exactly when wants_checksum() was True."""
+        buffer = self._buffer
+        _write_varint(buffer, int(round(dt * 1_000_000)))
+        _write_varint(buffer, pressed)
+        _write_varint(buffer, held)
+        _write_varint(buffer, decisions)
+        if self.wants_checksum():
+            buffer += CHECKSUM.pack(checksum or 0)
+        self.frames += 1
+        if len(buffer) >= 64 * 1024:
+            self._file.write(self._compressor.compress(bytes(buffer)))
+            buffer.clear()
+
+    def close(self):
+        """Flush and close the file."""
+        if self._file.closed:
+            return
+        self._file.write(self._compressor.compress(bytes(self._buffer)))
+        self._file.write(self._compressor.flush())
+        self._buffer.clear()
+        self._file.close()
+
+class ReplayReader:
+    """Loads a replay file and iterates its frames."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a replay")
+        magic, version, self.seed, self.checksum_interval = HEADER.unpack_from(raw, 0)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a Neon Knights replay")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"{path} has unsupported replay version {version} (expected {REPLAY_VERSION}; "
+                             f"re-record it with this build)")
+        self._data = zlib.decompress(raw[HEADER.size:])
+
+    def frames(self) -> Iterator[ReplayFrame]:
+        data = self._data
+        interval = self.checksum_interval
+        pos = 0
+        index = 0
+        while pos < len(data):
+            dt_us, pos = _read_varint(data, pos)
+            pressed, pos = _read_varint(data, pos)
+            held, pos = _read_varint(data, pos)
+            decisions, pos = _read_varint(data, pos)
+            checksum = None
+            index += 1
+            if interval > 0 and index % interval == 0:
+                checksum, = CHECKSUM.unpack_from(data, pos)
+                pos += CHECKSUM.size
+            yield ReplayFrame(dt_us / 1_000_000, pressed, held, decisions, checksum)
+
+def play_replay(path: str, realtime: bool = False, verbose: bool = False) -> Dict:
+    """Re-run a replay headless and report timing and the first desync, if any."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.display.init()
+    pygame.font.init()
+
+    from character_loader import CharacterDataLoader
+    from demo_session import DemoSession, load_demo_level
+
+    reader = ReplayReader(path)
+    loader = CharacterDataLoader()
+    session = DemoSession(loader, seed=reader.seed, tilemap=load_demo_level(), verbose=verbose)
+
+    first_desync = None
+    checksums = 0
+    sim_seconds = 0.0
+    step_seconds = 0.0
+    perf_counter = time.perf_counter
+    wall_start = perf_counter()
+    for frame in reader.frames():
+        start = perf_counter()
+        session.step(frame.dt, frame.pressed, frame.held, frame.decisions)
+        step_seconds += perf_counter() - start
+        sim_seconds += frame.dt
+        if frame.checksum is not None:
+            checksums += 1
+            if first_desync is None and session.checksum() != frame.checksum:
+                first_desync = session.frame
+        if realtime:
+            # Pace the loop so frames land when they did in the recording
+            delay = sim_seconds - (perf_counter() - wall_start)
+            if delay > 0:
+                time.sleep(delay)
+    wall_seconds = perf_counter() - wall_start
+    pygame.quit()
+
+    frames = session.frame
+    return {
+        "frames": frames,
+        "sim_seconds": sim_seconds,
+        "wall_seconds": wall_seconds,
+        "speedup": sim_seconds / wall_seconds if wall_seconds > 0 else 0.0,
+        "step_ms_mean": step_seconds * 1000.0 / frames if frames else 0.0,
+        "checksums": checksums,
+        "first_desync_frame": first_desync,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a Neon Knights replay headless")
+    parser.add_argument("replay", help="replay file recorded with main.py --record")
+    parser.add_argument("--realtime", action="store_true", help="pace playback by the recorded frame times")
+    parser.add_argument("--verbose", action="store_true", help="keep simulation console output")
+    args = parser.parse_args()
+
+    try:
+        if args.verbose:
+            report = play_replay(args.replay, args.realtime, verbose=True)
+        else:
+            # Heroes narrate every attack; silence them for clean timing output
+            stdout = sys.stdout
+            with open(os.devnull, 'w') as devnull:
+                sys.stdout = devnull
+                try:
+                    report = play_replay(args.replay, args.realtime)
+                finally:
+                    sys.stdout = stdout
+    except (OSError, ValueError, zlib.error) as e:
+        print(f"Failed to play replay {args.replay}: {e}")
+        return 1
+
+    print(f"Replayed {report['frames']} frames ({report['sim_seconds']:.1f} s of play) "
+          f"in {report['wall_seconds']:.2f} s ({report['speedup']:.1f}x), "
+          f"{report['step_ms_mean']:.3f} ms per simulation step")
+    if report["first_desync_frame"] is None:
+        print(f"Deterministic: all {report['checksums']} state checksums matched")
+        return 0
+    print(f"DESYNC: state first diverged by frame {report['first_desync_frame']}")
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
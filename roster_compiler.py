@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Incremental roster compiler for Neon Knights.
+
+Parses hero source files (metahumans-style .txt rosters or .json hero lists)
+in a process pool, validates every hero against hero_schema.json and writes
+assets/heroes.json atomically. Unchanged sources are skipped using content
+hashes stored in a small build cache, and the output is only rewritten when
+its contents actually change.
+
+Usage:
+    python roster_compiler.py [sources ...] [-o assets/heroes.json] [--jobs N] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from character_data import CharacterDataParser, HeroData
+
+# Bump when parsing or validation changes so cached fragments are rebuilt
+COMPILER_VERSION = "1"
+
+DEFAULT_SOURCES = [os.path.join("assets", "metahumans.txt")]
+DEFAULT_OUTPUT = os.path.join("assets", "heroes.json")
+DEFAULT_SCHEMA = "hero_schema.json"
+DEFAULT_CACHE = ".roster_cache.json"
+
+Validator = Callable[[Any, str, List[str]], None]
+
+_JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaCompiler:
+    """Compiles the subset of JSON Schema used by hero_schema.json into validator closures."""
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self._refs: Dict[str, Validator] = {}
+
+    def compile(self, node: Optional[Dict] = None) -> Validator:
+        """Compile a schema node (the root schema by default) into a validator."""
+        return self._compile(self.schema if node is None else node)
+
+    def compile_ref(self, ref: str) -> Validator:
+        """Compile a local reference such as '#/definitions/hero'."""
+        if ref not in self._refs:
+            # Placeholder allows recursive references to resolve lazily
+            self._refs[ref] = lambda value, path, errors: self._refs[ref](value, path, errors)
+            target = self.schema
+            for part in ref.lstrip("#/").split("/"):
+                target = target[part]
+            self._refs[ref] = self._compile(target)
+        return self._refs[ref]
+
+    def _compile(self, node: Dict) -> Validator:
+        if "$ref" in node:
+            return self.compile_ref(node["$ref"])
+
+        checks: List[Validator] = []
+
+        if "type" in node:
+            # A single type name or a list of allowed ones
+            type_names = node["type"] if isinstance(node["type"], list) else [node["type"]]
+            type_checks = tuple(_JSON_TYPES[name] for name in type_names)
+            type_name = " or ".join(type_names)
+
+            def check_type(value, path, errors, type_checks=type_checks, type_name=type_name):
+                if not any(type_check(value) for type_check in type_checks):
+                    errors.append(f"{path}: expected {type_name}, got {type(value).__name__}")
+            checks.append(check_type)
+
+        if "enum" in node:
+            allowed = tuple(node["enum"])
+
+            def check_enum(value, path, errors):
+                if value not in allowed:
+                    errors.append(f"{path}: {value!r} is not one of {list(allowed)}")
+            checks.append(check_enum)
+
+        if "minLength" in node or "maxLength" in node:
+            min_len = node.get("minLength", 0)
+            max_len = node.get("maxLength", sys.maxsize)
+
+            def check_length(value, path, errors):
+                if isinstance(value, str) and not min_len <= len(value) <= max_len:
+                    errors.append(f"{path}: length {len(value)} outside [{min_len}, {max_len}]")
+            checks.append(check_length)
+
+        if "minimum" in node or "maximum" in node:
+            minimum = node.get("minimum", float("-inf"))
+            maximum = node.get("maximum", float("inf"))
+
+            def check_range(value, path, errors):
+                if _JSON_TYPES["number"](value) and not minimum <= value <= maximum:
+                    errors.append(f"{path}: {value} outside [{minimum}, {maximum}]")
+            checks.append(check_range)
+
+        if "exclusiveMinimum" in node or "exclusiveMaximum" in node:
+            above = node.get("exclusiveMinimum", float("-inf"))
+            below = node.get("exclusiveMaximum", float("inf"))
+
+            def check_exclusive_range(value, path, errors):
+                if _JSON_TYPES["number"](value) and not above < value < below:
+                    errors.append(f"{path}: {value} outside ({above}, {below})")
+            checks.append(check_exclusive_range)
+
+        if "pattern" in node:
+            pattern = re.compile(node["pattern"])
+
+            def check_pattern(value, path, errors):
+                if isinstance(value, str) and not pattern.search(value):
+                    errors.append(f"{path}: {value!r} does not match {pattern.pattern!r}")
+            checks.append(check_pattern)
+
+        if "required" in node:
+            required = tuple(node["required"])
+
+            def check_required(value, path, errors):
+                if isinstance(value, dict):
+                    for key in required:
+                        if key not in value:
+                            errors.append(f"{path}: missing required property '{key}'")
+            checks.append(check_required)
+
+        if "properties" in node:
+            properties = [(key, self._compile(sub)) for key, sub in node["properties"].items()]
+
+            def check_properties(value, path, errors):
+                if isinstance(value, dict):
+                    for key, validator in properties:
+                        if key in value:
+                            validator(value[key], f"{path}.{key}", errors)
+            checks.append(check_properties)
+
+        if "additionalProperties" in node:
+            # False rejects properties not listed; a schema validates each of them
+            additional = node["additionalProperties"]
+            known = frozenset(node.get("properties", ()))
+            additional_validator = self._compile(additional) if isinstance(additional, dict) else None
+
+            def check_additional(value, path, errors):
+                if isinstance(value, dict):
+                    for key, item in value.items():
+                        if key in known:
+                            continue
+                        if additional_validator is not None:
+                            additional_validator(item, f"{path}.{key}", errors)
+                        elif additional is False:
+                            errors.append(f"{path}: unexpected property '{key}'")
+            checks.append(check_additional)
+
+        if "items" in node:
+            item_validator = self._compile(node["items"])
+
+            def check_items(value, path, errors):
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        item_validator(item, f"{path}[{index}]", errors)
+            checks.append(check_items)
+
+        checks = tuple(checks)
+
+        def validate(value, path, errors):
+            for check in checks:
+                check(value, path, errors)
+        return validate
+
+
+def load_schema_validators(schema_path: str) -> Tuple[Validator, Validator]:
+    """Load hero_schema.json and return (document validator, hero validator)."""
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    compiler = SchemaCompiler(schema)
+    return compiler.compile(), compiler.compile_ref("#/definitions/hero")
+
+
+def file_digest(path: str, salt: str = "") -> str:
+    """Hash a file's contents, salted with compiler and schema versions."""
+    digest = hashlib.sha256(salt.encode('utf-8'))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def atomic_write(path: str, data: bytes):
+    """Write data to path via a temporary file and rename, so readers never see partial output."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# Per-worker state, built once by the pool initializer
+_worker_hero_validator: Optional[Validator] = None
+_worker_parser: Optional[CharacterDataParser] = None
+
+
+def _init_worker(schema_path: str):
+    """Precompile the schema and parser once per worker process."""
+    global _worker_hero_validator, _worker_parser
+    _worker_hero_validator = load_schema_validators(schema_path)[1]
+    _worker_parser = CharacterDataParser()
+
+
+def parse_source(path: str, parser: CharacterDataParser) -> List[Dict]:
+    """Parse one roster source file into a list of hero dictionaries."""
+    if path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get("heroes", [])
+    return [hero.to_dict() for hero in parser.parse_metahumans_file(path)]
+
+
+def _compile_source(path: str) -> Tuple[str, List[Dict], List[str]]:
+    """Worker entry point: parse and validate a single source file."""
+    errors: List[str] = []
+    try:
+        heroes = parse_source(path, _worker_parser)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        return path, [], [f"{path}: {e}"]
+
+    for index, hero in enumerate(heroes):
+        _worker_hero_validator(hero, f"{path}:heroes[{index}]", errors)
+    if errors:
+        return path, [], errors
+    # Round-trip through HeroData so JSON sources are normalised like text sources
+    return path, [HeroData.from_dict(hero).to_dict() for hero in heroes], errors
+
+
+@dataclass
+class CompileResult:
+    """Outcome of a roster compilation run."""
+    heroes: List[Dict] = field(default_factory=list)
+    compiled: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    output_written: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class RosterCompiler:
+    """Incrementally compiles roster source files into the heroes.json document."""
+
+    def __init__(self, sources: List[str], output_path: str = DEFAULT_OUTPUT,
+                 schema_path: str = DEFAULT_SCHEMA, cache_path: str = DEFAULT_CACHE,
+                 jobs: Optional[int] = None):
+        self.sources = list(sources)
+        self.output_path = output_path
+        self.schema_path = schema_path
+        self.cache_path = cache_path
+        self.jobs = jobs
+        self.document_validator, self.hero_validator = load_schema_validators(schema_path)
+
+    def compile(self, force: bool = False) -> CompileResult:
+        """Compile all sources, reusing cached fragments for unchanged inputs."""
+        result = CompileResult()
+        cache = {} if force else self._load_cache()
+        salt = COMPILER_VERSION + file_digest(self.schema_path)
+
+        digests: Dict[str, str] = {}
+        stale: List[str] = []
+        for path in self.sources:
+            try:
+                digests[path] = file_digest(path, salt)
+            except OSError as e:
+                result.errors.append(f"{path}: {e}")
+                continue
+            entry = cache.get(path)
+            if entry and entry.get("digest") == digests[path]:
+                result.skipped.append(path)
+            else:
+                stale.append(path)
+
+        for path, heroes, errors in self._compile_stale(stale):
+            result.compiled.append(path)
+            if errors:
+                result.errors.extend(errors)
+                cache.pop(path, None)
+            else:
+                cache[path] = {"digest": digests[path], "heroes": heroes}
+
+        if result.errors:
+            self._save_cache(cache)
+            return result
+
+        # Merge fragments in source order and reject duplicate hero names
+        seen: Dict[str, str] = {}
+        for path in self.sources:
+            for hero in cache[path]["heroes"]:
+                if hero["name"] in seen:
+                    result.errors.append(
+                        f"{path}: duplicate hero '{hero['name']}' (first defined in {seen[hero['name']]})")
+                    continue
+                seen[hero["name"]] = path
+                result.heroes.append(hero)
+
+        document = self.build_document(result.heroes)
+        self.document_validator(document, "$", result.errors)
+        if not result.errors:
+            result.output_written = self._write_if_changed(document)
+        self._save_cache(cache)
+        return result
+
+    def build_document(self, heroes: List[Dict]) -> Dict:
+        """Wrap compiled heroes in the heroes.json document structure."""
+        source_names = ", ".join(os.path.basename(path) for path in self.sources)
+        return {
+            "heroes": heroes,
+            "metadata": {
+                "version": "1.0",
+                "total_heroes": len(heroes),
+                "description": f"Neon Knights Hero Data - Generated from {source_names}"
+            }
+        }
+
+    def _compile_stale(self, stale: List[str]) -> List[Tuple[str, List[Dict], List[str]]]:
+        if not stale:
+            return []
+        # A pool only pays off with several inputs; one file is parsed inline
+        if len(stale) == 1 or self.jobs == 1:
+            _init_worker(self.schema_path)
+            return [_compile_source(path) for path in stale]
+        # Imported lazily: the pool machinery is the heaviest part of startup
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                 initargs=(self.schema_path,)) as pool:
+            return list(pool.map(_compile_source, stale, chunksize=max(1, len(stale) // 32)))
+
+    def _write_if_changed(self, document: Dict) -> bool:
+        data = json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8')
+        if os.path.exists(self.output_path):
+            with open(self.output_path, 'rb') as f:
+                if f.read() == data:
+                    return False
+        atomic_write(self.output_path, data)
+        return True
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if cache.get("version") != COMPILER_VERSION:
+            return {}
+        return cache.get("sources", {})
+
+    def _save_cache(self, sources: Dict):
+        data = json.dumps({"version": COMPILER_VERSION, "sources": sources}, ensure_ascii=False)
+        try:
+            atomic_write(self.cache_path, data.encode('utf-8'))
+        except OSError as e:
+            print(f"Warning: could not write build cache {self.cache_path}: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    arg_parser = argparse.ArgumentParser(description="Compile Neon Knights roster sources into heroes.json")
+    arg_parser.add_argument("sources", nargs="*", default=DEFAULT_SOURCES,
+                            help="Roster source files (.txt or .json)")
+    arg_parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="Output heroes.json path")
+    arg_parser.add_argument("--schema", default=DEFAULT_SCHEMA, help="Hero schema path")
+    arg_parser.add_argument("--cache", default=DEFAULT_CACHE, help="Build cache path")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes")
+    arg_parser.add_argument("--force", action="store_true", help="Ignore the build cache")
+    args = arg_parser.parse_args(argv)
+
+    compiler = RosterCompiler(args.sources, args.output, args.schema, args.cache, args.jobs)
+    result = compiler.compile(force=args.force)
+
+    for error in result.errors:
+        print(f"Error: {error}")
+    print(f"Compiled {len(result.compiled)} source(s), skipped {len(result.skipped)} unchanged")
+    if result.ok:
+        state = "wrote" if result.output_written else "unchanged"
+        print(f"{len(result.heroes)} heroes -> {args.output} ({state})")
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from asset_manager import AssetManager, AssetRequest
+
+class Scene:
+    """One screen of the game (title, demo, menu, level).
+
+    Subclasses list their assets in assets(); the SceneManager loads them
+    into the scene's resource scope before enter() and releases the scope
+    after exit(), so a scene's memory goes away with it. preload() runs on
+    the loader thread for any other preparation that does not touch the
+    display (parsing data files, decoding replays).
+    """
+
+    name = "scene"
+    # Transparent scenes (pause menus, overlays) draw over the scene below them
+    transparent = False
+
+    def __init__(self):
+        self.manager: Optional['SceneManager'] = None
+        self.scope: Optional[str] = None
+
+    def assets(self) -> List[AssetRequest]:
+        return []
+
+    def preload(self):
+        """Loader thread: prepare anything that needs no display."""
+
+    def enter(self):
+        """Main thread: the scene's assets are loaded and it is now on the stack."""
+
+    def exit(self):
+        """The scene is leaving the stack; its scope is released afterwards."""
+
+    def pause(self):
+        """Another scene was pushed on top."""
+
+    def resume(self):
+        """The scene above was popped."""
+
+    def update(self, dt: float, actions):
+        """Advance one frame; `actions` is the frame's ActionState."""
+
+    def draw(self, screen: pygame.Surface):
+        pass
+
+class SceneManager:
+    """A stack of scenes with scoped assets and non-blocking transitions.
+
+    push() and switch() load the incoming scene's assets on a worker thread
+    while the current scene keeps running (under a fade, for a switch); the
+    change happens on the first frame after loading finishes, and only the
+    cheap main-thread steps (surface conversion, enter()) run inside a frame. pop() is immediate. Leaving scenes release
+    their asset scope, so memory stays bounded by the scenes on the stack.
+
+    Usage:
+        manager = SceneManager(assets)
+        manager.push(TitleScene())
+        while manager.running:
+            manager.update(dt, actions)
+            manager.draw(screen)
+    """
+
+    def __init__(self, assets: AssetManager, fade_seconds: float = 0.25):
+        self.assets = assets
+        self.fade_seconds = fade_seconds
+        self.stack: List[Scene] = []
+        self.running = True
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-loader")
+        self._prepared: Dict[int, Future] = {}
+        self._pending: Optional[Tuple[str, Scene]] = None
+        self._next_scope = 1
+        self._fade = 0.0          # 0 = clear, 1 = fully faded out
+        self._fade_surface: Optional[pygame.Surface] = None
+        self.last_load_ms = 0.0
+        self.last_switch_ms = 0.0
+
+    @property
+    def current(self) -> Optional[Scene]:
+        return self.stack[-1] if self.stack else None
+
+    @property
+    def transitioning(self) -> bool:
+        return self._pending is not None
+
+    # Transitions
+
+    def prepare(self, scene: Scene) -> Future:
+        """Start loading a scene's assets in the background ahead of push() or switch()."""
+        future = self._prepared.get(id(scene))
+        if future is None:
+            if scene.scope is None:
+                scene.scope = f"{scene.name}#{self._next_scope}"
+                self._next_scope += 1
+            scene.manager = self
+            future = self._executor.submit(self._load, scene)
+            self._prepared[id(scene)] = future
+        return future
+
+    def _load(self, scene: Scene):
+        start = time.perf_counter()
+        decoded = self.assets.decode_assets(scene.assets())
+        scene.preload()
+        return decoded, (time.perf_counter() - start) * 1000.0
+
+    def push(self, scene: Scene):
+        """Put a scene on top of the stack once its assets are loaded; the current one is paused."""
+        self._begin("push", scene)
+
+    def switch(self, scene: Scene):
+        """Replace the current scene once the new one's assets are loaded."""
+        self._begin("switch", scene)
+
+    def _begin(self, kind: str, scene: Scene):
+        if self._pending is not None:
+            print(f"Scene change to {scene.name} ignored: still changing to {self._pending[1].name}")
+            return
+        self.prepare(scene)
+        self._pending = (kind, scene)
+
+    def pop(self):
+        """Leave the top scene now and resume the one below it (or stop if none is left)."""
+        if self.stack:
+            self._leave(self.stack.pop())
+        if self.stack:
+            self.stack[-1].resume()
+        elif self._pending is None:
+            self.running = False
+
+    def quit(self):
+        self.running = False
+
+    def _leave(self, scene: Scene):
+        scene.exit()
+        self.assets.release_scope(scene.scope)
+        scene.manager = None
+
+    def _finish(self):
+        """Complete a pending transition whose loading is done (main thread)."""
+        kind, scene = self._pending
+        future = self._prepared.pop(id(scene))
+        self._pending = None
+        try:
+            decoded, self.last_load_ms = future.result()
+        except Exception as e:
+            print(f"Failed to load scene {scene.name}: {e}")
+            self.assets.release_scope(scene.scope)
+            if not self.stack:
+                self.running = False
+            return
+        start = time.perf_counter()
+        self.assets.install_assets(decoded, scene.scope)
+        if kind == "switch" and self.stack:
+            self._leave(self.stack.pop())
+        elif self.stack:
+            self.stack[-1].pause()
+        self.stack.append(scene)
+        scene.enter()
+        self.last_switch_ms = (time.perf_counter() - start) * 1000.0
+
+    # Frame
+
+    def update(self, dt: float, actions):
+        """Advance the top scene, and any transition in progress."""
+        if self._pending is not None:
+            kind, scene = self._pending
+            if kind == "switch" and self.stack and self._fade < 1.0:
+                # Fade the outgoing scene out while the next one loads
+                self._fade = min(1.0, self._fade + dt / self.fade_seconds)
+            elif self._prepared[id(scene)].done():
+                self._finish()
+        elif self._fade > 0.0:
+            self._fade = max(0.0, self._fade - dt / self.fade_seconds)
+        scene = self.current
+        if scene is not None:
+            scene.update(dt, actions)
+
+    def draw(self, screen: pygame.Surface):
+        """Draw the top scene over any transparent scenes it covers, then the transition fade."""
+        if not self.stack:
+            screen.fill((0, 0, 0))
+        bottom = len(self.stack) - 1
+        while bottom > 0 and self.stack[bottom].transparent:
+            bottom -= 1
+        for scene in self.stack[max(bottom, 0):]:
+            scene.draw(screen)
+        if self._fade > 0.0:
+            if self._fade_surface is None or self._fade_surface.get_size() != screen.get_size():
+                self._fade_surface = pygame.Surface(screen.get_size()).convert()
+                self._fade_surface.fill((0, 0, 0))
+            self._fade_surface.set_alpha(int(self._fade * 255))
+            screen.blit(self._fade_surface, (0, 0))
+
+    def shutdown(self):
+        """Exit every scene (top first), releasing their assets, and stop the loader thread."""
+        self._pending = None
+        while self.stack:
+            self._leave(self.stack.pop())
+        for future in self._prepared.values():
+            future.cancel()
+        self._prepared.clear()
+        self._executor.shutdown(wait=True)
+        self.running = False
@@ -0,0 +1,608 @@
+"""
+Snapshots of the full demo state: heroes and their swings in progress,
+roster, enemies, AI queue, RNGs, status effects and the particle and
+projectile pools.
+
+Taking a snapshot has two halves. capture() runs on the game thread and
+only copies: plain tuples for the heroes and enemies and array copies of
+the live slices of the pools, so the frame pays for a few memcpys. The
+captured Snapshot is immutable from then on, which lets encode_snapshot()
+and the file write run on a background thread while the game keeps
+mutating its own state. restore() applies a Snapshot in place.
+
+File format (little-endian): magic, version, flags, section count, then
+one zlib stream of tagged sections (4-byte tag, u32 length, payload).
+Numbers are packed with struct and the pools are raw array bytes, so
+decoding is a handful of unpack and frombuffer calls. Readers skip
+sections they do not know, so new sections do not need a version bump.
+"""
+
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from enemy.enemy import Enemy
+from roster_compiler import atomic_write
+
+SNAPSHOT_MAGIC = b'NKSN'
+# 2: swings in progress (SWNG); older snapshots would restore them without their strikes
+SNAPSHOT_VERSION = 2
+SNAPSHOT_EXTENSION = ".nksnap"
+FLAG_COMPRESSED = 1
+
+HEADER = struct.Struct('<4sHHI')
+SECTION = struct.Struct('<4sI')
+COUNT = struct.Struct('<I')
+SESSION = struct.Struct('<IIdQ')
+ROSTER_ENTRY = struct.Struct('<7I4i')
+HERO = struct.Struct('<I10dIId?d?')
+ENEMY = struct.Struct('<8d?iq')
+AI = struct.Struct('<III')
+PY_RANDOM = struct.Struct('<I625I?d')
+NP_RANDOM = struct.Struct('<I16s16s?I')
+PARTICLE_STYLE = struct.Struct('<3Bi')
+MOVE_INPUT = struct.Struct('<bbI')
+STATUS_CLOCK = struct.Struct('<dQI')
+STATUS_EFFECT = struct.Struct('<IIiQiQd')
+SWING = struct.Struct('<IIdI')
+
+class Snapshot(NamedTuple):
+    """Captured demo state. Treat as read-only once captured."""
+    frame: int
+    seed: int
+    selected_hero_index: int
+    animation_demo_timer: float
+    rng_state: Tuple
+    particle_rng_state: Dict
+    roster: Tuple                  # HeroData records, in roster order
+    heroes: Tuple                  # per hero: name, then the HERO struct fields
+    enemies: Tuple                 # per enemy: ENEMY struct fields
+    ai_frame: int
+    ai_next_bucket: int
+    ai_buckets: Tuple              # enemy indices per bucket
+    ai_pending: Tuple              # (enemy index, queued frame)
+    particles: Dict[str, np.ndarray]
+    particle_styles: Tuple         # (color, radius) per style index used
+    projectiles: Dict[str, np.ndarray]
+    projectile_sprites: Dict[int, int]  # sprite index -> default sprite radius
+    move_direction: Tuple[int, int] = (0, 0)  # held movement and the hero it drives
+    move_hero_index: int = 0
+    status_effects: Tuple = (0.0, 0, ())     # StatusEffects.capture() over heroes then enemies
+    swings: Tuple = ()             # (hero index, ability slot, damage, struck indices over heroes then enemies)
+
+_PARTICLE_FIELDS = (("pos", np.float32, 2), ("vel", np.float32, 2), ("life", np.float32, 1),
+                    ("max_life", np.float32, 1), ("style", np.int32, 1))
+_PROJECTILE_FIELDS = (("pos", np.float32, 2), ("vel", np.float32, 2), ("life", np.float32, 1),
+                      ("radius", np.float32, 1), ("damage", np.float32, 1), ("owner", np.int32, 1),
+                      ("sprite", np.int32, 1))
+
+def _number(value: float):
+    """Integral values come back as ints, as the game code created them."""
+    return int(value) if value.is_integer() else value
+
+def capture_swings(heroes, enemies) -> Tuple:
+    """Swings in progress, with struck targets as indices into heroes then enemies.
+
+    Struck targets that are gone (killed enemies) are left out.
+    """
+    target_index = {id(target): i for i, target in enumerate(list(heroes) + list(enemies))}
+    return tuple(
+        (i, hero._swing[0].slot, float(hero._swing[1]),
+         tuple(sorted(target_index[id(t)] for t in hero._swing[2] if id(t) in target_index)))
+        for i, hero in enumerate(heroes) if hero._swing is not None)
+
+# Capture and restore (game thread)
+
+def capture(session, roster: Optional[Dict] = None) -> Snapshot:
+    """Copy the session's state into a Snapshot; cheap enough to call every frame."""
+    heroes = session.heroes
+    hero_index = {id(hero): i for i, hero in enumerate(heroes)}
+    hero_rows = tuple(
+        (hero.name, float(hero.x), float(hero.y), float(hero.velocity_x), float(hero.velocity_y),
+         float(hero.current_hp), float(hero.max_hp), float(hero.current_energy), float(hero.max_energy),
+         float(hero.speed), float(hero.strength), hero.current_animation, hero.animation_frame,
+         float(hero.animation_timer), hero.is_attacking, float(hero.attack_cooldown), hero.facing_right)
+        for hero in heroes)
+
+    enemies = session.enemies.sprites()
+    enemy_index = {id(enemy): i for i, enemy in enumerate(enemies)}
+    enemy_rows = tuple(
+        (enemy.x, enemy.y, float(enemy.hp), float(enemy.max_hp), enemy.speed, enemy.sight_range,
+         enemy.goal[0] if enemy.goal else 0.0, enemy.goal[1] if enemy.goal else 0.0, enemy.goal is not None,
+         hero_index.get(id(enemy.target), -1), enemy.last_think_frame)
+        for enemy in enemies)
+
+    scheduler = session.ai_scheduler
+    buckets = tuple(tuple(enemy_index[id(e)] for e in bucket if id(e) in enemy_index)
+                    for bucket in scheduler.buckets)
+    pending = tuple((enemy_index[id(e)], queued) for e, queued in scheduler._pending if id(e) in enemy_index)
+
+    particles = session.particles
+    n = particles.count
+    particle_arrays = {name: getattr(particles, name)[:n].copy() for name, _, _ in _PARTICLE_FIELDS}
+    styles = {style: key for key, style in particles._styles.items()}
+    used_styles = tuple((int(s), styles[int(s)]) for s in np.unique(particle_arrays["style"]))
+
+    projectiles = session.projectiles
+    n = projectiles.count
+    projectile_arrays = {name: getattr(projectiles, name)[:n].copy() for name, _, _ in _PROJECTILE_FIELDS
+                         if name != "owner"}
+    # Owners are stored as hero indices; id() values mean nothing after a restore
+    projectile_arrays["owner"] = np.array([hero_index.get(int(o), -1) for o in projectiles.owner[:n]],
+                                          dtype=np.int32) if n else np.empty(0, dtype=np.int32)
+    default_sprites = {index: -key for key, index in projectiles._sprite_ids.items() if key < 0}
+
+    return Snapshot(
+        frame=session.frame,
+        seed=session.seed,
+        selected_hero_index=session.selected_hero_index,
+        animation_demo_timer=float(session.animation_demo_timer),
+        rng_state=session.rng.getstate(),
+        particle_rng_state=particles._rng.bit_generator.state,
+        roster=tuple(roster.values()) if roster else (),
+        heroes=hero_rows,
+        enemies=enemy_rows,
+        ai_frame=scheduler.frame,
+        ai_next_bucket=scheduler._next_bucket,
+        ai_buckets=buckets,
+        ai_pending=pending,
+        particles=particle_arrays,
+        particle_styles=used_styles,
+        projectiles=projectile_arrays,
+        projectile_sprites=default_sprites,
+        move_direction=session.move_direction,
+        move_hero_index=session.move_hero_index,
+        status_effects=session.status.capture(heroes + enemies),
+        swings=capture_swings(heroes, enemies),
+    )
+
+def restore(session, snapshot: Snapshot, roster: Optional[Dict] = None):
+    """Put the session back into a captured state.
+
+    Heroes are updated in place (they must be the same heroes, in the same
+    order); enemies are rebuilt. If `roster` is given and the snapshot has
+    one, the dict is refilled with the captured HeroData records by name.
+    Raises ValueError if the heroes differ.
+    """
+    heroes = session.heroes
+    if [hero.name for hero in heroes] != [row[0] for row in snapshot.heroes]:
+        raise ValueError("snapshot heroes do not match the running session")
+
+    if roster is not None and snapshot.roster:
+        roster.clear()
+        roster.update((data.name, data) for data in snapshot.roster)
+
+    session.frame = snapshot.frame
+    session.selected_hero_index = snapshot.selected_hero_index
+    session.animation_demo_timer = snapshot.animation_demo_timer
+    session.move_direction = snapshot.move_direction
+    session.move_hero_index = snapshot.move_hero_index
+    session.rng.setstate(snapshot.rng_state)
+
+    for hero, row in zip(heroes, snapshot.heroes):
+        (_, hero.x, hero.y, velocity_x, velocity_y, current_hp, max_hp, current_energy, max_energy,
+         speed, strength, hero.current_animation, hero.animation_frame, animation_timer,
+         hero.is_attacking, attack_cooldown, hero.facing_right) = row
+        hero.velocity_x = _number(velocity_x)
+        hero.velocity_y = _number(velocity_y)
+        hero.current_hp = _number(current_hp)
+        hero.max_hp = _number(max_hp)
+        hero.current_energy = _number(current_energy)
+        hero.max_energy = _number(max_energy)
+        hero.speed = _number(speed)
+        hero.strength = _number(strength)
+        hero.animation_timer = _number(animation_timer)
+        hero.attack_cooldown = _number(attack_cooldown)
+        hero._swing = None
+        hero.image = hero._get_current_sprite()
+        hero.rect = hero.image.get_rect()
+        hero.rect.x = int(hero.x)
+        hero.rect.y = int(hero.y)
+
+    # Enemies: rebuild in the captured order so update order is unchanged
+    for enemy in session.enemies.sprites():
+        enemy.kill()
+    pathfinder = getattr(session, "pathfinder", None)
+    enemies = []
+    for x, y, hp, max_hp, speed, sight_range, goal_x, goal_y, has_goal, target, think_frame in snapshot.enemies:
+        enemy = Enemy(x, y, hp=_number(max_hp), speed=speed, sight_range=sight_range, pathfinder=pathfinder)
+        enemy.hp = _number(hp)
+        enemy.goal = (goal_x, goal_y) if has_goal else None
+        enemy.target = heroes[target] if 0 <= target < len(heroes) else None
+        enemy.last_think_frame = think_frame
+        enemies.append(enemy)
+        session.enemies.add(enemy)
+        session.all_sprites.add(enemy)
+    # Status effects and swings refer to heroes, then enemies, by their captured order
+    targets = heroes + enemies
+    session.status.restore(snapshot.status_effects, targets)
+    for index, slot, damage, struck in snapshot.swings:
+        hero = heroes[index]
+        hero._swing = (hero.abilities[slot], _number(damage), {targets[i] for i in struck})
+
+    scheduler = session.ai_scheduler
+    scheduler.clear()
+    scheduler.frame = snapshot.ai_frame
+    scheduler._next_bucket = snapshot.ai_next_bucket % scheduler.bucket_count
+    for i, bucket in enumerate(snapshot.ai_buckets[:scheduler.bucket_count]):
+        scheduler.buckets[i].extend(enemies[index] for index in bucket)
+    for index, queued in snapshot.ai_pending:
+        scheduler._queued.add(id(enemies[index]))
+        scheduler._pending.append((enemies[index], queued))
+
+    particles = session.particles
+    particles._rng.bit_generator.state = snapshot.particle_rng_state
+    n = min(len(snapshot.particles["life"]), particles.capacity)
+    # Style indices are per pool; map them onto this pool's sprite table
+    remap = np.zeros(max((s for s, _ in snapshot.particle_styles), default=0) + 1, dtype=np.int32)
+    for style, (color, radius) in snapshot.particle_styles:
+        remap[style] = particles._style(color, radius)
+    for name, _, _ in _PARTICLE_FIELDS:
+        values = snapshot.particles[name][:n]
+        getattr(particles, name)[:n] = remap[values] if name == "style" else values
+    particles.count = n
+
+    projectiles = session.projectiles
+    n = min(len(snapshot.projectiles["life"]), projectiles.capacity)
+    for name, _, _ in _PROJECTILE_FIELDS:
+        if name not in ("owner", "sprite"):
+            getattr(projectiles, name)[:n] = snapshot.projectiles[name][:n]
+    projectiles.owner[:n] = [id(heroes[o]) if 0 <= o < len(heroes) else 0
+                             for o in snapshot.projectiles["owner"][:n].tolist()]
+    sprites = snapshot.projectiles["sprite"][:n].tolist()
+    radii = snapshot.projectiles["radius"][:n].tolist()
+    projectiles.sprite[:n] = [
+        projectiles._default_sprite_index(snapshot.projectile_sprites.get(s, int(r)))
+        if s in snapshot.projectile_sprites or s >= len(projectiles._sprites) else s
+        for s, r in zip(sprites, radii)]
+    projectiles.count = n
+
+# Binary encoding (safe on any thread)
+
+class _Strings:
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+def _pack_arrays(arrays: Dict[str, np.ndarray], fields) -> bytes:
+    count = len(arrays["life"])
+    parts = [COUNT.pack(count)]
+    for name, dtype, _ in fields:
+        parts.append(np.ascontiguousarray(arrays[name], dtype=np.dtype(dtype).newbyteorder('<')).tobytes())
+    return b''.join(parts)
+
+def _unpack_arrays(payload: bytes, fields) -> Dict[str, np.ndarray]:
+    count, = COUNT.unpack_from(payload, 0)
+    pos = COUNT.size
+    arrays = {}
+    for name, dtype, width in fields:
+        dtype = np.dtype(dtype).newbyteorder('<')
+        size = count * width
+        array = np.frombuffer(payload, dtype=dtype, count=size, offset=pos).astype(dtype.newbyteorder('='))
+        arrays[name] = array.reshape(count, width) if width > 1 else array
+        pos += size * dtype.itemsize
+    return arrays
+
+def encode_snapshot(snapshot: Snapshot, compress: bool = True) -> bytes:
+    """Serialize a Snapshot to the versioned binary format."""
+    strings = _Strings()
+    sections = []
+
+    rng_version, rng_words, gauss = snapshot.rng_state
+    np_state = snapshot.particle_rng_state
+    sections.append((b'SESS', SESSION.pack(snapshot.frame, snapshot.selected_hero_index,
+                                           snapshot.animation_demo_timer, snapshot.seed)
+                     + PY_RANDOM.pack(rng_version, *rng_words, gauss is not None, gauss or 0.0)
+                     + NP_RANDOM.pack(strings(np_state["bit_generator"]),
+                                      np_state["state"]["state"].to_bytes(16, 'little'),
+                                      np_state["state"]["inc"].to_bytes(16, 'little'),
+                                      bool(np_state["has_uint32"]), np_state["uinteger"])))
+
+    roster = bytearray(COUNT.pack(len(snapshot.roster)))
+    for data in snapshot.roster:
+        attacks, stats = data.attacks, data.stats
+        roster += ROSTER_ENTRY.pack(
+            strings(data.name), strings(data.backstory), strings(attacks.short_attack),
+            strings(attacks.long_attack), strings(attacks.special), strings(attacks.super_power),
+            strings(data.gender), stats.hp, stats.speed, stats.strength, stats.energy)
+        roster += COUNT.pack(strings(data.sprite_path))
+    sections.append((b'ROST', bytes(roster)))
+
+    heroes = bytearray(COUNT.pack(len(snapshot.heroes)))
+    for row in snapshot.heroes:
+        heroes += HERO.pack(strings(row[0]), *row[1:11], strings(row[11]), *row[12:])
+    sections.append((b'HERO', bytes(heroes)))
+
+    enemies = bytearray(COUNT.pack(len(snapshot.enemies)))
+    for row in snapshot.enemies:
+        enemies += ENEMY.pack(*row)
+    sections.append((b'ENMY', bytes(enemies)))
+
+    ai = bytearray(AI.pack(snapshot.ai_frame, snapshot.ai_next_bucket, len(snapshot.ai_buckets)))
+    for bucket in snapshot.ai_buckets:
+        ai += COUNT.pack(len(bucket)) + np.asarray(bucket, dtype='<u4').tobytes()
+    ai += COUNT.pack(len(snapshot.ai_pending)) + np.asarray(snapshot.ai_pending, dtype='<u4').tobytes()
+    sections.append((b'AISC', bytes(ai)))
+
+    styles = bytearray(COUNT.pack(len(snapshot.particle_styles)))
+    for style, (color, radius) in snapshot.particle_styles:
+        styles += COUNT.pack(style) + PARTICLE_STYLE.pack(*color, radius)
+    sections.append((b'PART', bytes(styles) + _pack_arrays(snapshot.particles, _PARTICLE_FIELDS)))
+
+    sprites = bytearray(COUNT.pack(len(snapshot.projectile_sprites)))
+    for index, radius in snapshot.projectile_sprites.items():
+        sprites += struct.pack('<Ii', index, radius)
+    sections.append((b'PROJ', bytes(sprites) + _pack_arrays(snapshot.projectiles, _PROJECTILE_FIELDS)))
+    sections.append((b'INPT', MOVE_INPUT.pack(*snapshot.move_direction, snapshot.move_hero_index)))
+    carry, seq, rows = snapshot.status_effects
+    status = bytearray(STATUS_CLOCK.pack(carry, seq, len(rows)))
+    for hero, name, *timers in rows:
+        status += STATUS_EFFECT.pack(hero, strings(name), *timers)
+    sections.append((b'STFX', bytes(status)))
+    swings = bytearray(COUNT.pack(len(snapshot.swings)))
+    for hero, slot, damage, struck in snapshot.swings:
+        swings += SWING.pack(hero, strings(slot), damage, len(struck)) + np.asarray(struck, dtype='<u4').tobytes()
+    sections.append((b'SWNG', bytes(swings)))
+
+    # The string table goes first so decoding can resolve indices in one pass
+    table = bytearray(COUNT.pack(len(strings.values)))
+    for value in strings.values:
+        encoded = value.encode('utf-8')
+        table += COUNT.pack(len(encoded)) + encoded
+    sections.insert(0, (b'STRS', bytes(table)))
+
+    body = b''.join(SECTION.pack(tag, len(payload)) + payload for tag, payload in sections)
+    flags = 0
+    if compress:
+        # Level 1: most of the saving for a fraction of the time
+        body = zlib.compress(body, 1)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, len(sections)) + body
+
+def decode_snapshot(raw: bytes) -> Snapshot:
+    """Parse the binary format back into a Snapshot; raises ValueError on bad input."""
+    if len(raw) < HEADER.size:
+        raise ValueError("data is too short to be a snapshot")
+    magic, version, flags, section_count = HEADER.unpack_from(raw, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("data is not a Neon Knights snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    body = raw[HEADER.size:]
+    if flags & FLAG_COMPRESSED:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise ValueError(f"corrupt snapshot: {e}")
+
+    sections: Dict[bytes, bytes] = {}
+    pos = 0
+    for _ in range(section_count):
+        tag, length = SECTION.unpack_from(body, pos)
+        pos += SECTION.size
+        sections[tag] = body[pos:pos + length]
+        pos += length
+    missing = {b'STRS', b'SESS', b'HERO', b'ENMY', b'AISC', b'PART', b'PROJ', b'SWNG'} - sections.keys()
+    if missing:
+        raise ValueError(f"snapshot is missing sections {sorted(tag.decode() for tag in missing)}")
+
+    payload = sections[b'STRS']
+    count, = COUNT.unpack_from(payload, 0)
+    pos = COUNT.size
+    strings = []
+    for _ in range(count):
+        length, = COUNT.unpack_from(payload, pos)
+        pos += COUNT.size
+        strings.append(payload[pos:pos + length].decode('utf-8'))
+        pos += length
+
+    payload = sections[b'SESS']
+    frame, selected, demo_timer, seed = SESSION.unpack_from(payload, 0)
+    rng = PY_RANDOM.unpack_from(payload, SESSION.size)
+    rng_state = (rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None)
+    name, state, inc, has_uint32, uinteger = NP_RANDOM.unpack_from(payload, SESSION.size + PY_RANDOM.size)
+    particle_rng_state = {
+        "bit_generator": strings[name],
+        "state": {"state": int.from_bytes(state, 'little'), "inc": int.from_bytes(inc, 'little')},
+        "has_uint32": int(has_uint32),
+        "uinteger": uinteger,
+    }
+
+    roster = ()
+    if b'ROST' in sections:
+        from character_data import HeroAttacks, HeroData, HeroStats
+        payload = sections[b'ROST']
+        count, = COUNT.unpack_from(payload, 0)
+        pos = COUNT.size
+        entries = []
+        for _ in range(count):
+            fields = ROSTER_ENTRY.unpack_from(payload, pos)
+            pos += ROSTER_ENTRY.size
+            sprite_path, = COUNT.unpack_from(payload, pos)
+            pos += COUNT.size
+            name, backstory, short, long_, special, super_power, gender = (strings[i] for i in fields[:7])
+            entries.append(HeroData(name, backstory, HeroAttacks(short, long_, special, super_power),
+                                    HeroStats(*fields[7:]), gender, strings[sprite_path]))
+        roster = tuple(entries)
+
+    payload = sections[b'HERO']
+    count, = COUNT.unpack_from(payload, 0)
+    heroes = []
+    for i in range(count):
+        row = HERO.unpack_from(payload, COUNT.size + i * HERO.size)
+        heroes.append((strings[row[0]],) + row[1:11] + (strings[row[11]],) + row[12:])
+
+    payload = sections[b'ENMY']
+    count, = COUNT.unpack_from(payload, 0)
+    enemies = tuple(ENEMY.unpack_from(payload, COUNT.size + i * ENEMY.size) for i in range(count))
+
+    payload = sections[b'AISC']
+    ai_frame, next_bucket, bucket_count = AI.unpack_from(payload, 0)
+    pos = AI.size
+    buckets = []
+    for _ in range(bucket_count):
+        count, = COUNT.unpack_from(payload, pos)
+        pos += COUNT.size
+        buckets.append(tuple(np.frombuffer(payload, dtype='<u4', count=count, offset=pos).tolist()))
+        pos += 4 * count
+    count, = COUNT.unpack_from(payload, pos)
+    pos += COUNT.size
+    pending = np.frombuffer(payload, dtype='<u4', count=2 * count, offset=pos).reshape(count, 2).tolist()
+
+    payload = sections[b'PART']
+    count, = COUNT.unpack_from(payload, 0)
+    pos = COUNT.size
+    styles = []
+    for _ in range(count):
+        style, = COUNT.unpack_from(payload, pos)
+        r, g, b, radius = PARTICLE_STYLE.unpack_from(payload, pos + COUNT.size)
+        styles.append((style, ((r, g, b), radius)))
+        pos += COUNT.size + PARTICLE_STYLE.size
+    particles = _unpack_arrays(payload[pos:], _PARTICLE_FIELDS)
+
+    payload = sections[b'PROJ']
+    count, = COUNT.unpack_from(payload, 0)
+    pos = COUNT.size
+    sprites = {}
+    for _ in range(count):
+        index, radius = struct.unpack_from('<Ii', payload, pos)
+        sprites[index] = radius
+        pos += 8
+    projectiles = _unpack_arrays(payload[pos:], _PROJECTILE_FIELDS)
+
+    # Optional: snapshots from before the input layer have no held movement
+    move_direction, move_hero_index = (0, 0), selected
+    if b'INPT' in sections:
+        dx, dy, move_hero_index = MOVE_INPUT.unpack_from(sections[b'INPT'], 0)
+        move_direction = (dx, dy)
+
+    # Optional: snapshots from before status effects have none
+    status_effects = (0.0, 0, ())
+    if b'STFX' in sections:
+        payload = sections[b'STFX']
+        carry, seq, count = STATUS_CLOCK.unpack_from(payload, 0)
+        rows = []
+        for i in range(count):
+            hero, name, *timers = STATUS_EFFECT.unpack_from(payload, STATUS_CLOCK.size + i * STATUS_EFFECT.size)
+            rows.append((hero, strings[name], *timers))
+        status_effects = (carry, seq, tuple(rows))
+
+    payload = sections[b'SWNG']
+    count, = COUNT.unpack_from(payload, 0)
+    pos = COUNT.size
+    swings = []
+    for _ in range(count):
+        hero, slot, damage, struck_count = SWING.unpack_from(payload, pos)
+        pos += SWING.size
+        struck = tuple(np.frombuffer(payload, dtype='<u4', count=struck_count, offset=pos).tolist())
+        pos += 4 * struck_count
+        swings.append((hero, strings[slot], damage, struck))
+
+    return Snapshot(frame, seed, selected, demo_timer, rng_state, particle_rng_state, roster,
+                    tuple(heroes), enemies, ai_frame, next_bucket, tuple(buckets),
+                    tuple(tuple(p) for p in pending), particles, tuple(styles), projectiles, sprites,
+                    move_direction, move_hero_index, status_effects, tuple(swings))
+
+def save_snapshot(snapshot: Snapshot, path: str):
+    """Encode and atomically write a snapshot file."""
+    atomic_write(path, encode_snapshot(snapshot))
+
+def load_snapshot(path: str) -> Snapshot:
+    with open(path, 'rb') as f:
+        return decode_snapshot(f.read())
+
+# Quick save/load and rollback
+
+class RollbackBuffer:
+    """Ring of recent in-memory snapshots for rewinding.
+
+    Snapshots are kept captured but not encoded, so rewinding is a restore
+    with no decoding.
+    """
+
+    def __init__(self, capacity: int = 10, interval: int = 30):
+        self.interval = max(1, interval)
+        self._snapshots: Deque[Snapshot] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def record(self, session) -> bool:
+        """Capture the session if its frame falls on the interval."""
+        if session.frame % self.interval:
+            return False
+        self._snapshots.append(capture(session))
+        return True
+
+    def rewind(self, session, frames: int) -> Optional[Snapshot]:
+        """Restore the newest snapshot at least `frames` frames old; returns it, or None."""
+        target = session.frame - frames
+        while self._snapshots:
+            snapshot = self._snapshots[-1]
+            if snapshot.frame <= target or len(self._snapshots) == 1:
+                restore(session, snapshot)
+                # Later snapshots are from the abandoned timeline
+                return snapshot
+            self._snapshots.pop()
+        return None
+
+    def clear(self):
+        self._snapshots.clear()
+
+class SnapshotManager:
+    """Quick save and load with encoding and disk writes off the game thread.
+
+    Usage:
+        manager = SnapshotManager()
+        manager.save(session, "quicksave.nksnap", loader.heroes_data)   # returns at once
+        manager.load(session, "quicksave.nksnap", loader.heroes_data)
+        manager.shutdown()
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot")
+        self._pending: Dict[str, Future] = {}
+
+    def save(self, session, path: str, roster: Optional[Dict] = None) -> Future:
+        """Capture now; encode and write on the worker thread."""
+        snapshot = capture(session, roster)
+        future = self._executor.submit(save_snapshot, snapshot, path)
+        self._pending[os.path.abspath(path)] = future
+        return future
+
+    def load(self, session, path: str, roster: Optional[Dict] = None) -> Optional[Snapshot]:
+        """Restore from a file (and `roster`, see restore()), waiting for a save to it still in flight.
+
+        Returns the snapshot, or None if it could not be loaded.
+        """
+        future = self._pending.pop(os.path.abspath(path), None)
+        try:
+            if future is not None:
+                future.result()
+            snapshot = load_snapshot(path)
+            restore(session, snapshot, roster)
+            return snapshot
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Failed to load snapshot {path}: {e}")
+            return None
+
+    def shutdown(self):
+        """Finish pending writes and stop the worker."""
+        self._executor.shutdown(wait=True)
+        for path, future in self._pending.items():
+            error = future.exception()
+            if error is not None:
+                print(f"Failed to save snapshot {path}: {error}")
+        self._pending.clear()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time report for Neon Knights modules.
+
+Each module is imported in a fresh interpreter with `-X importtime`, so the
+numbers include everything the module drags in (e.g. pygame). The report
+shows the cumulative import time per module, whether pygame was loaded, and
+the heaviest dependencies behind it.
+
+Usage:
+    python startup_profile.py [modules ...] [--runs 3] [--top 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+DEFAULT_MODULES = [
+    "character_data",
+    "character_loader",
+    "roster_compiler",
+    "convert_heroes_data",
+    "asset_manager",
+    "hero_entity",
+    "main",
+]
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a fresh interpreter; return [(name, depth, cumulative_us)] in log order."""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nesting is encoded as two spaces per level after the leading space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative_us)))
+    return entries
+
+def profile_module(module: str, runs: int) -> Tuple[int, bool, List[Tuple[str, int]]]:
+    """Return (best cumulative us, pygame loaded, direct dependencies by cost)."""
+    best = None
+    for _ in range(runs):
+        entries = import_times(module)
+        index = next(i for i, (name, depth, _) in enumerate(entries) if name == module and depth == 0)
+        if best is None or entries[index][2] < best[best_index][2]:
+            best, best_index = entries, index
+
+    # Children are logged before their parent, one level deeper
+    dependencies = []
+    for name, depth, cumulative in reversed(best[:best_index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            dependencies.append((name, cumulative))
+    dependencies.sort(key=lambda item: item[1], reverse=True)
+    uses_pygame = any(name == "pygame" for name, _, _ in best[:best_index + 1])
+    return best[best_index][2], uses_pygame, dependencies
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Report cold-start import times")
+    arg_parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    arg_parser.add_argument("--runs", type=int, default=3, help="Best-of runs per module")
+    arg_parser.add_argument("--top", type=int, default=3, help="Heaviest dependencies to list")
+    args = arg_parser.parse_args(argv)
+
+    print(f"{'Module':<22} {'Import (ms)':>12} {'pygame':>7}  Heaviest dependencies")
+    print("-" * 78)
+    failed = False
+    for module in args.modules:
+        try:
+            cumulative, uses_pygame, dependencies = profile_module(module, args.runs)
+        except RuntimeError as e:
+            print(f"{module:<22} {'error':>12}          {e}")
+            failed = True
+            continue
+        heaviest = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in dependencies[:args.top])
+        print(f"{module:<22} {cumulative / 1000:>12.1f} {'yes' if uses_pygame else 'no':>7}  {heaviest}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+class Widget:
+    """Retained-mode UI element with a cached surface.
+
+    refresh() pulls the widget's bound data once per frame and marks it
+    dirty only if that data changed; `surface` re-renders only when dirty.
+    A HUD whose data did not change therefore costs one blit per top-level
+    widget and no rendering at all.
+    """
+
+    def __init__(self, anchor: str = "topleft", offset: Tuple[int, int] = (0, 0)):
+        self.anchor = anchor
+        self.offset = offset
+        self.position = (0, 0)
+        self.visible = True
+        self.dirty = True
+        self._surface: Optional[pygame.Surface] = None
+
+    def refresh(self, data: Optional[Dict[str, Any]] = None) -> bool:
+        """Pull bound data; returns whether the widget needs re-rendering."""
+        return self.dirty
+
+    def render(self) -> pygame.Surface:
+        raise NotImplementedError
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self.dirty or self._surface is None:
+            self._surface = self.render()
+            self.dirty = False
+        return self._surface
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.surface.get_size()
+
+    def place(self, area: pygame.Rect):
+        """Position the widget at its anchor within `area` (the screen, for top-level widgets)."""
+        rect = pygame.Rect((0, 0), self.size)
+        setattr(rect, self.anchor, getattr(area, self.anchor))
+        self.position = (rect.x + self.offset[0], rect.y + self.offset[1])
+
+def _bound_value(bind: Optional[Callable[[], Any]], field: Optional[str], data: Optional[Dict[str, Any]]):
+    if bind is not None:
+        return bind()
+    if field is not None and data is not None:
+        return data.get(field)
+    return None
+
+class Label(Widget):
+    """One line of text, from a fixed string, a bound callable or a field of its panel's data."""
+
+    def __init__(self, font: pygame.font.Font, text: str = "", color: Color = (255, 255, 255),
+                 field: Optional[str] = None, fmt: str = "{}", bind: Optional[Callable[[], Any]] = None,
+                 **placement):
+        super().__init__(**placement)
+        self.font = font
+        self.color = color
+        self.field = field
+        self.fmt = fmt
+        self.bind = bind
+        self.text = text
+        self._value = object()
+
+    def refresh(self, data: Optional[Dict[str, Any]] = None) -> bool:
+        if self.bind is not None or self.field is not None:
+            value = _bound_value(self.bind, self.field, data)
+            if value != self._value:
+                self._value = value
+                text = self.fmt.format(*value) if isinstance(value, tuple) else self.fmt.format(value)
+                if text != self.text:
+                    self.text = text
+                    self.dirty = True
+        return self.dirty
+
+    def set_text(self, text: str):
+        if text != self.text:
+            self.text = text
+            self.dirty = True
+
+    def render(self) -> pygame.Surface:
+        return self.font.render(self.text, True, self.color)
+
+class Bar(Widget):
+    """Horizontal fill bar for a value out of a maximum; re-renders only when the filled width changes."""
+
+    def __init__(self, width: int, height: int, color: Color, back_color: Color = (40, 40, 40),
+                 field: Optional[str] = None, max_field: Optional[str] = None,
+                 bind: Optional[Callable[[], Tuple[float, float]]] = None, **placement):
+        super().__init__(**placement)
+        self.width = width
+        self.height = height
+        self.color = color
+        self.back_color = back_color
+        self.field = field
+        self.max_field = max_field
+        self.bind = bind
+        self._filled = -1
+
+    def refresh(self, data: Optional[Dict[str, Any]] = None) -> bool:
+        if self.bind is not None:
+            value, maximum = self.bind()
+        elif data is not None:
+            value, maximum = data.get(self.field, 0), data.get(self.max_field, 0)
+        else:
+            return self.dirty
+        filled = int(self.width * max(0.0, min(1.0, value / maximum))) if maximum else 0
+        if filled != self._filled:
+            self._filled = filled
+            self.dirty = True
+        return self.dirty
+
+    def render(self) -> pygame.Surface:
+        surface = pygame.Surface((self.width, self.height))
+        surface.fill(self.back_color)
+        if self._filled > 0:
+            surface.fill(self.color, (0, 0, self._filled, self.height))
+        return surface
+
+class TextList(Widget):
+    """Static lines of text with a per-line colour rule, rendered once."""
+
+    def __init__(self, font: pygame.font.Font, lines: Sequence[str], line_height: int,
+                 style: Callable[[str], Color] = lambda line: (200, 200, 200), **placement):
+        super().__init__(**placement)
+        self.font = font
+        self.lines = list(lines)
+        self.line_height = line_height
+        self.style = style
+
+    def set_lines(self, lines: Sequence[str]):
+        lines = list(lines)
+        if lines != self.lines:
+            self.lines = lines
+            self.dirty = True
+
+    def render(self) -> pygame.Surface:
+        rendered = [self.font.render(line, True, self.style(line)) if line else None for line in self.lines]
+        width = max((text.get_width() for text in rendered if text is not None), default=0)
+        surface = pygame.Surface((width, self.line_height * len(self.lines)), pygame.SRCALPHA)
+        for i, text in enumerate(rendered):
+            if text is not None:
+                surface.blit(text, (0, i * self.line_height))
+        return surface
+
+class Panel(Widget):
+    """Translucent box stacking child widgets vertically, composed into one cached surface.
+
+    `source` returns a dict of fields that child labels and bars bind to;
+    it is called once per refresh, so a panel over Hero.get_info() asks
+    for the info once a frame however many fields it shows. A source that
+    returns the same dict object as last time is taken to be unchanged and
+    the children are not consulted. The panel re-renders only when a child
+    did.
+    """
+
+    def __init__(self, children: List[Widget], source: Optional[Callable[[], Dict[str, Any]]] = None,
+                 width: Optional[int] = None, padding: int = 10, spacing: int = 5,
+                 background: Color = (0, 0, 0), alpha: int = 180, **placement):
+        super().__init__(**placement)
+        self.children = children
+        self.source = source
+        self.width = width
+        self.padding = padding
+        self.spacing = spacing
+        self.background = background
+        self.alpha = alpha
+        self._data = None
+
+    def refresh(self, data: Optional[Dict[str, Any]] = None) -> bool:
+        if self.source is not None:
+            data = self.source()
+        if data is not None:
+            if data is self._data:
+                return self.dirty
+            self._data = data
+        for child in self.children:
+            if child.refresh(data):
+                self.dirty = True
+        return self.dirty
+
+    def render(self) -> pygame.Surface:
+        surfaces = [child.surface for child in self.children if child.visible]
+        inner = max((s.get_width() for s in surfaces), default=0)
+        width = self.width if self.width is not None else inner + 2 * self.padding
+        height = (sum(s.get_height() for s in surfaces) + self.spacing * max(0, len(surfaces) - 1)
+                  + 2 * self.padding)
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((*self.background, self.alpha))
+        y = self.padding
+        for surface in surfaces:
+            panel.blit(surface, (self.padding, y))
+            y += surface.get_height() + self.spacing
+        return panel
+
+class UIRoot:
+    """Top-level widgets of a screen, placed by anchor.
+
+    Placement is worked out on resize(); afterwards a widget is only
+    re-placed if re-rendering changed its size. update() refreshes every
+    widget's bindings; draw() or submit() then costs one blit per visible
+    top-level widget.
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        self.area = pygame.Rect((0, 0), size)
+        self.widgets: List[Widget] = []
+        self._sizes: Dict[int, Tuple[int, int]] = {}
+        self.renders_last_update = 0
+
+    def add(self, widget: Widget) -> Widget:
+        self.widgets.append(widget)
+        widget.place(self.area)
+        self._sizes[id(widget)] = widget.size
+        return widget
+
+    def resize(self, size: Tuple[int, int]):
+        self.area = pygame.Rect((0, 0), size)
+        for widget in self.widgets:
+            widget.place(self.area)
+            self._sizes[id(widget)] = widget.size
+
+    def update(self):
+        renders = 0
+        for widget in self.widgets:
+            if widget.visible and widget.refresh():
+                renders += 1
+                size = widget.size
+                if size != self._sizes[id(widget)]:
+                    self._sizes[id(widget)] = size
+                    widget.place(self.area)
+        self.renders_last_update = renders
+
+    def blits(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        return [(widget.surface, widget.position) for widget in self.widgets if widget.visible]
+
+    def draw(self, target: pygame.Surface):
+        target.blits(self.blits(), doreturn=False)
+
+    def submit(self, render_queue, layer: int):
+        render_queue.submit_many(self.blits(), layer)